@@ -9,8 +9,8 @@ APP_NAME = "Maestro MPD Server"
 import os
 os.environ["EVENTLET_THREADING"] = "1"
 
-from flask import Flask, render_template, redirect, url_for, request, send_from_directory, Response, jsonify, flash, make_response
-from flask_socketio import SocketIO, emit
+from flask import Flask, render_template, redirect, url_for, request, send_from_directory, Response, jsonify, flash, make_response, session
+from flask_socketio import SocketIO, emit, join_room, leave_room
 from mpd import MPDClient, ConnectionError, CommandError
 from typing import Optional
 import socket
@@ -19,11 +19,17 @@ import os
 import json
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
+import threading
+import asyncio
+import atexit
+import signal
+import sys
 import time
 import requests
 import random
 import re
 import html
+import uuid
 
 # Import playlist export service
 try:
@@ -39,6 +45,29 @@ except ImportError as e:
     print(f"Warning: playlist_export service not available: {e}")
     PLAYLIST_EXPORT_AVAILABLE = False
 
+# Pooled MPD connections shared by every route and background task
+from services.mpd_service import MPDConnectionPool, add_uris_batched
+from services.mpd_idle import MPDIdleWatcher, MPDStateCache
+from services.status_snapshot import StatusSnapshot
+from services.queue_mirror import QueueMirror
+from services.status_delta import StatusDeltaEncoder
+from services.async_mpd_service import AsyncMPDService
+from services.library_index import LibraryIndex
+from services.library_catalog import LibraryCatalog
+from services.suggest_index import SuggestIndex
+from services.album_sampler import AlbumSampler
+from services.artist_albums import ArtistAlbumsCache
+from services.recent_albums import RecentAlbumsIndex
+from services.genre_sampler import GenreSampler
+from services.genre_matcher import GenreMatcher, load_aliases
+from services.track_genres import TrackGenres
+from services.lastfm_cache import LastfmCache
+from services.lastfm_fanout import LastfmFanout
+from services.track_matcher import TrackMatcher
+from services.candidate_pool import CandidatePool
+from services.auto_fill_trigger import AutoFillTrigger
+from services.similarity_graph import SimilarityGraph, read_playlist_artists
+
 # Import utility routes handlers
 from routes.utilities import (
     get_version_info_handler, get_settings_info_handler,
@@ -50,6 +79,10 @@ from routes.utilities import (
 # Settings and data files
 SETTINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.json')
 GENRE_STATIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'genre_stations.json')
+LIBRARY_CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'library_catalog.db')
+GENRE_ALIASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'genre_aliases.json')
+LASTFM_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lastfm_cache.db')
+SIMILARITY_GRAPH_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'similarity_graph.json')
 
 # Settings helpers
 def load_settings():
@@ -110,127 +143,8 @@ try:
 except ImportError:
     print("rudimentary_search not available. Search functionality will be limited.")
     SEARCH_AVAILABLE = False
-    def perform_search(client, search_tag, query):
-        """Smart search function - uses MPD's list() for albums when appropriate"""
-        try:
-            # For artist/album searches, use MPD's list() to get albums directly, then filter
-            if search_tag == 'artist':
-                # Get all unique albums and find ones with this artist
-                all_albums = client.list('album', 'artist', query)
-                
-                if isinstance(all_albums, list) and len(all_albums) > 0:
-                    # all_albums is a list of album names for this artist
-                    # Now get song info for each album to build result
-                    albums_dict = {}
-                    for album_name in all_albums:
-                        if isinstance(album_name, dict):
-                            album_name = album_name.get('album', '')
-                        if not album_name:
-                            continue
-                        
-                        # Get first song of this album to get metadata
-                        songs = client.find('artist', query, 'album', album_name)
-                        if songs:
-                            first_song = songs[0]
-                            song_file = first_song.get('file', '')
-                            genre = first_song.get('genre', 'Unknown Genre')
-                            album_dir = os.path.dirname(song_file) if song_file else ''
-                            album_key = f"{query}|||{album_name}|||{album_dir}"
-                            
-                            if album_key not in albums_dict:
-                                albums_dict[album_key] = {
-                                    'item_type': 'album',
-                                    'artist': query,
-                                    'album': album_name,
-                                    'genre': genre,
-                                    'track_count': len(songs),
-                                    'sample_file': song_file
-                                }
-                    
-                    return list(albums_dict.values()) if albums_dict else []
-            
-            # For album searches, search by album name and group results
-            if search_tag == 'album':
-                results = client.search('album', query)
-                albums_dict = {}
-                for song in results:
-                    album_name = song.get('album', 'Unknown Album')
-                    artist_name = song.get('artist', 'Unknown Artist')
-                    song_file = song.get('file', '')
-                    genre = song.get('genre', 'Unknown Genre')
-                    album_dir = os.path.dirname(song_file) if song_file else ''
-                    album_key = f"{artist_name}|||{album_name}|||{album_dir}"
-                    
-                    if album_key not in albums_dict:
-                        albums_dict[album_key] = {
-                            'item_type': 'album',
-                            'artist': artist_name,
-                            'album': album_name,
-                            'genre': genre,
-                            'track_count': 0,
-                            'sample_file': song_file
-                        }
-                    albums_dict[album_key]['track_count'] += 1
-                
-                return list(albums_dict.values())
-            
-            # For 'any' searches, try to be smart about grouping
-            if search_tag == 'any':
-                results = client.search('any', query)
-                print(f"[DEBUG] 'any' search for '{query}' returned {len(results)} results", flush=True)
-                
-                if not results:
-                    return []
-                
-                # For 'any' searches, ALWAYS try grouping by album first
-                # This is better than trying to guess if it's an artist search
-                albums_dict = {}
-                for song in results:
-                    album_name = song.get('album', 'Unknown Album')
-                    artist_name = song.get('artist', 'Unknown Artist')
-                    song_file = song.get('file', '')
-                    genre = song.get('genre', 'Unknown Genre')
-                    album_dir = os.path.dirname(song_file) if song_file else ''
-                    album_key = f"{artist_name}|||{album_name}|||{album_dir}"
-                    
-                    if album_key not in albums_dict:
-                        albums_dict[album_key] = {
-                            'item_type': 'album',
-                            'artist': artist_name,
-                            'album': album_name,
-                            'genre': genre,
-                            'track_count': 0,
-                            'sample_file': song_file
-                        }
-                    albums_dict[album_key]['track_count'] += 1
-                
-                if albums_dict:
-                    print(f"[DEBUG] Grouped into {len(albums_dict)} albums", flush=True)
-                    return list(albums_dict.values())
-            
-            # Default: return individual songs for title searches or when grouping fails
-            formatted_results = []
-            if search_tag == 'any':
-                results = client.search('any', query)
-            elif search_tag == 'title':
-                results = client.search('title', query)
-            else:
-                results = client.search(search_tag, query)
-            
-            for song in results:
-                formatted_results.append({
-                    'item_type': 'song',
-                    'artist': song.get('artist', 'Unknown Artist'),
-                    'title': song.get('title', 'Unknown Title'),
-                    'album': song.get('album', 'Unknown Album'),
-                    'genre': song.get('genre', 'Unknown Genre'),
-                    'file': song.get('file', ''),
-                    'time': song.get('time', '0'),
-                })
-            return formatted_results
-        except Exception as e:
-            print(f"Error in search: {e}")
-            return []
+    # Built-in search: album rows via single grouped queries
+    from services.search_service import perform_search
 
 # Load configuration from environment variables or use defaults
 # Determine template folder based on UI mode setting
@@ -248,9 +162,14 @@ if ENV_LOADED:
     MPD_HOST = os.environ.get('MPD_HOST', 'localhost')
     MPD_PORT = int(os.environ.get('MPD_PORT', '6600'))
     MPD_TIMEOUT = int(os.environ.get('MPD_TIMEOUT', '10'))
+    MPD_POOL_SIZE = int(os.environ.get('MPD_POOL_SIZE', '8'))
+    MPD_STATUS_MAX_STALENESS = float(os.environ.get('MPD_STATUS_MAX_STALENESS', '2'))
+    MPD_ASYNCIO = os.environ.get('MPD_ASYNCIO', 'true').lower() in ('true', '1', 'yes', 'on')
     MUSIC_DIRECTORY = os.environ.get('MUSIC_DIRECTORY', '/media/music')
     LASTFM_API_KEY = os.environ.get('LASTFM_API_KEY', '')
     LASTFM_SHARED_SECRET = os.environ.get('LASTFM_SHARED_SECRET', '')
+    LASTFM_FANOUT_WORKERS = int(os.environ.get('LASTFM_FANOUT_WORKERS', '8'))
+    LASTFM_FANOUT_DEADLINE = float(os.environ.get('LASTFM_FANOUT_DEADLINE', '15'))
     GENIUS_CLIENT_ID = os.environ.get('GENIUS_CLIENT_ID', '')
     GENIUS_CLIENT_SECRET = os.environ.get('GENIUS_CLIENT_SECRET', '')
     GENIUS_ACCESS_TOKEN = os.environ.get('GENIUS_ACCESS_TOKEN', '')
@@ -268,9 +187,14 @@ else:
     MPD_HOST = 'localhost'
     MPD_PORT = 6600
     MPD_TIMEOUT = 10
+    MPD_POOL_SIZE = 8
+    MPD_STATUS_MAX_STALENESS = 2
+    MPD_ASYNCIO = True  # Run background MPD tasks as coroutines on one event loop
     MUSIC_DIRECTORY = '/media/music'
     LASTFM_API_KEY = ''  # Set in config.env or settings page for Last.fm integration
     LASTFM_SHARED_SECRET = ''  # Set in config.env or settings page for Last.fm integration
+    LASTFM_FANOUT_WORKERS = 8  # Concurrent Last.fm lookups during auto-fill
+    LASTFM_FANOUT_DEADLINE = 15  # Seconds auto-fill waits for similar artists' top tracks
     GENIUS_CLIENT_ID = ''  # Optional: Genius client id for lyrics lookup
     GENIUS_CLIENT_SECRET = ''  # Optional: Genius client secret for lyrics lookup
     GENIUS_ACCESS_TOKEN = ''  # Optional: Genius access token for lyrics lookup
@@ -335,9 +259,6 @@ FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
 LASTFM_API_URL = 'https://ws.audioscrobbler.com/2.0/'
 LASTFM_AUTH_URL = 'https://www.last.fm/api/auth/'
 
-# Global variable to store the last known MPD status for comparison
-last_mpd_status = {}
-
 # Simple in-memory cache for Last.fm album art data
 album_art_cache = {}
 
@@ -382,6 +303,7 @@ auto_fill_num_tracks_max = 25
 auto_fill_genre_filter_enabled = False
 auto_fill_last_artist = "N/A"
 auto_fill_last_genre = "N/A"
+AUTO_FILL_STATUS_MAX_STALENESS = 5  # Seconds; auto-fill tolerates an older status snapshot
 
 # Genre station mode variables
 genre_station_mode = False
@@ -535,7 +457,9 @@ def get_auto_fill_status():
         'genre_filter_enabled': auto_fill_genre_filter_enabled,
         'genre_station_mode': genre_station_mode,
         'genre_station_name': genre_station_name,
-        'genre_station_genres': genre_station_genres
+        'genre_station_genres': genre_station_genres,
+        'candidate_pool': candidate_pool.stats(),
+        'trigger': auto_fill_trigger.stats()
     })
 # Simple in-memory cache for Last.fm album art data
 album_art_cache = {}
@@ -604,28 +528,226 @@ def parse_stream_metadata(title_field, name_field=None):
     # If no pattern matched, return None (will use original values)
     return None, None, station_name
 
+# Persistent MPD connections - handlers check one out instead of reconnecting per request
+mpd_pool = MPDConnectionPool(
+    host=MPD_HOST,
+    port=MPD_PORT,
+    timeout=30,  # Increased from 10 to 30 seconds for large queries
+    idletimeout=None,
+    max_size=MPD_POOL_SIZE
+)
+
 def connect_mpd_client():
-    """Helper function to connect to MPD and return the client object."""
-    client = MPDClient()
-    client.timeout = 30  # Increased from 10 to 30 seconds for large queries
-    client.idletimeout = None
+    """Helper function to check out a pooled MPD client.
+
+    The returned client behaves like an MPDClient; calling disconnect() hands the
+    connection back to the pool. Returns None if MPD is unreachable.
+    """
+    client = mpd_pool.acquire()
+    if client is None:
+        print(f"Could not connect to MPD at {MPD_HOST}:{MPD_PORT}")
+    return client
+
+# Cached player state kept current by the idle watcher (see start_mpd_idle_watcher)
+mpd_queue = QueueMirror()
+mpd_state_cache = MPDStateCache(queue=mpd_queue)
+mpd_state_changed = threading.Event()
+
+# In-memory copy of the music database for browse/search (reloaded on 'database' events)
+library_index = LibraryIndex()
+
+# On-disk full-text catalog next to settings.json, synced from the index by last-modified
+library_catalog = LibraryCatalog(LIBRARY_CATALOG_FILE)
+
+# Rows the ranked catalog search hands to perform_search for album grouping
+CATALOG_SEARCH_LIMIT = 1000
+
+# Prefix index behind /api/suggest, rebuilt from the library index after every reload
+suggest_index = SuggestIndex()
+
+# Random album shelves from the index's album table (no MPD queries)
+album_sampler = AlbumSampler(library_index)
+RANDOM_SHELF_SIZE = 25
+
+# Artist page album lists, memoized per (artist, genre, database version)
+artist_albums_cache = ArtistAlbumsCache()
+
+# Newest albums in the recent-albums directories, rebuilt when the index reloads
+recent_albums_index = RecentAlbumsIndex(library_index)
+
+# Genre station fills drawn from the index's genre -> tracks lists
+genre_sampler = GenreSampler(library_index)
+
+# Genre filter for auto-fill: normalization table rebuilt per library load, aliases from genre_aliases.json
+genre_matcher = GenreMatcher(load_aliases(GENRE_ALIASES_FILE))
+
+# Candidate genres: search/find tags, then the index, then cached readcomments() as a last resort
+track_genres = TrackGenres(library_index)
+
+# Last.fm similar-artist/top-track/top-album responses on disk (per-method TTLs, served stale while refreshing)
+lastfm_cache = LastfmCache(LASTFM_CACHE_FILE)
+
+# Similar artists' top tracks fetched concurrently, with partial results at the deadline
+lastfm_fanout = LastfmFanout(LASTFM_FANOUT_WORKERS, LASTFM_FANOUT_DEADLINE)
+
+# Last.fm (artist, title) suggestions resolved through a normalized hash map rebuilt per library load
+track_matcher = TrackMatcher(library_index)
+
+# Auto-fill candidates prefetched when a track starts, taken instantly when the queue runs low
+candidate_pool = CandidatePool(spawn=socketio.start_background_task)
+
+# Offline artist similarity (play history, playlists, queue, shared directories, Last.fm answers);
+# auto-fill asks it first and uses Last.fm to enrich it
+similarity_graph = SimilarityGraph(SIMILARITY_GRAPH_FILE)
+similarity_graph.load()
+# Play history is not persisted, so transitions learned since the last periodic save are written on exit
+atexit.register(similarity_graph.flush)
+
+# Graph neighbors needed before auto-fill skips the live Last.fm lookup
+SIMILARITY_GRAPH_MIN_ARTISTS = 10
+
+def recently_played_files():
+    """Files in the play history or the mirrored queue (kept out of station fills)."""
+    files = {item.get('file') for item in play_history}
+    files.update(song.get('file') for song in mpd_queue.playlist())
+    files.discard(None)
+    files.discard('')
+    return files
+
+def rebuild_suggest_index():
+    """Rebuild the autocomplete index from the library index (weights are track counts)."""
+    artists = library_index.tag_counts('albumartist')
+    for artist, count in library_index.tag_counts('artist').items():
+        artists[artist] = max(count, artists.get(artist, 0))
+    suggest_index.build({
+        'artist': artists,
+        'album': library_index.tag_counts('album'),
+        'title': library_index.tag_counts('title'),
+    })
+
+def known_artists(artists):
+    """First name of each artist tag, dropping empty and placeholder names."""
+    names = []
+    for artist in artists:
+        if isinstance(artist, list):
+            artist = artist[0] if artist else None
+        if artist and artist != 'Unknown Artist':
+            names.append(artist)
+    return names
+
+def rebuild_similarity_graph():
+    """Recompute the similarity graph from saved playlists, the queue, shared directories and cached Last.fm answers."""
+    playlists = []
+    if os.path.exists(PLAYLISTS_DIR):
+        for filename in sorted(os.listdir(PLAYLISTS_DIR)):
+            if filename.lower().endswith('.m3u'):
+                playlists.append(known_artists(
+                    read_playlist_artists(os.path.join(PLAYLISTS_DIR, filename), library_index)))
+    queue_artists = known_artists(song.get('artist') for song in mpd_queue.playlist())
+    similarity_graph.rebuild(library_index, playlists, queue_artists,
+                             lastfm_cache.entries('artist.getsimilar'))
+
+def refresh_library_index():
+    """Reload the library index through a pooled connection, then rebuild what derives from it.
+
+    The suggest index and catalog are only rebuilt when the index actually reloaded
+    (it skips the reload while MPD's db_update stamp is unchanged).
+    """
+    client = connect_mpd_client()
+    if not client:
+        return False
+    version = library_index.version
     try:
-        client.connect(MPD_HOST, MPD_PORT)
-        return client
-    except ConnectionError as e:
-        print(f"Could not connect to MPD: {e}")
-        return None
-    except Exception as e:
-        print(f"An unexpected error occurred while connecting to MPD: {e}")
-        return None
+        refreshed = library_index.refresh(client)
+    finally:
+        client.disconnect()
+    if refreshed and library_index.version != version:
+        try:
+            rebuild_suggest_index()
+        except Exception as e:
+            print(f"Error rebuilding suggest index: {e}")
+        try:
+            library_catalog.sync(library_index.listallinfo())
+        except Exception as e:
+            print(f"Error syncing library catalog: {e}")
+        try:
+            recent_albums_index.refresh(recent_album_directories())
+        except Exception as e:
+            print(f"Error rebuilding recent albums index: {e}")
+        try:
+            genre_matcher.build(library_index.tag_counts('genre'))
+        except Exception as e:
+            print(f"Error rebuilding genre matcher: {e}")
+        try:
+            track_matcher.refresh()
+        except Exception as e:
+            print(f"Error rebuilding track matcher: {e}")
+        try:
+            rebuild_similarity_graph()
+        except Exception as e:
+            print(f"Error rebuilding similarity graph: {e}")
+        candidate_pool.invalidate()
+    return refreshed
+
+def catalog_search(query, tag='any'):
+    """Ranked, prefix-aware search against the library catalog."""
+    return library_catalog.search(query, tag=tag, limit=CATALOG_SEARCH_LIMIT)
+
+def connect_library_client(ranked_search=False):
+    """Client for read-only library queries (find/search/list/listallinfo).
+
+    Answers from the in-memory library index once it is loaded, otherwise falls
+    back to a pooled MPD connection. With ranked_search, search() goes to the
+    SQLite catalog instead of a substring scan (unless a catalog sync is running).
+    Either way, call disconnect() when done.
+    """
+    if library_index.loaded:
+        return library_index.reader(searcher=catalog_search if ranked_search and library_catalog.ready else None)
+    return connect_mpd_client()
+
+def on_mpd_idle_change(client, subsystems):
+    """Idle watcher callback: refresh only the affected state and wake the status monitor."""
+    if subsystems and 'database' in subsystems:
+        # Tag edits keep queue song ids, so the mirror must re-read the queue
+        mpd_queue.invalidate()
+    if subsystems is None or 'database' in subsystems:
+        # (Re)load the library index after connecting and after every database change
+        socketio.start_background_task(target=refresh_library_index)
+    mpd_state_cache.refresh(client, subsystems)
+    mpd_state_changed.set()
+    async_mpd.signal('mpd_state')
+
+def on_mpd_idle_disconnect(error):
+    """Idle watcher lost MPD - wake the monitor so it falls back to polling."""
+    mpd_state_cache.invalidate()
+    mpd_state_changed.set()
+    async_mpd.signal('mpd_state')
+
+mpd_idle_watcher = MPDIdleWatcher(
+    host=MPD_HOST,
+    port=MPD_PORT,
+    on_change=on_mpd_idle_change,
+    on_disconnect=on_mpd_idle_disconnect
+)
 
-def get_mpd_status_for_display():
-    """Fetches and returns the current MPD status and song info, formatted for display."""
-    global last_mpd_status, auto_fill_last_artist, auto_fill_last_genre
+# Event loop for background MPD work (status monitor, auto-fill, genre station fill).
+# Started in __main__ when MPD_ASYNCIO is enabled; otherwise those run on threads.
+async_mpd = AsyncMPDService(host=MPD_HOST, port=MPD_PORT, timeout=MPD_TIMEOUT)
+
+def build_mpd_status_for_display():
+    """Builds the current MPD status and song info, formatted for display.
+
+    While the idle watcher is connected the state is read from mpd_state_cache with
+    elapsed time extrapolated locally, so no MPD round-trip is needed. Otherwise the
+    state is fetched through a pooled connection. Consumers should read the shared
+    snapshot via get_mpd_status_for_display() instead of calling this directly.
+    """
+    global auto_fill_last_artist, auto_fill_last_genre
 
     try:
-        client = connect_mpd_client()
-        if not client:
+        use_cache = mpd_idle_watcher.connected and mpd_state_cache.loaded
+        client = None if use_cache else connect_mpd_client()
+        if not use_cache and not client:
             status_info = {
                 'state': 'disconnected', 
                 'message': 'Could not connect to MPD.', 
@@ -636,14 +758,14 @@ def get_mpd_status_for_display():
                 'crossfade_enabled': False,
                 'crossfade_seconds': 0
             }
-            if status_info != last_mpd_status:
-                last_mpd_status = status_info
-                return status_info
-            return None
+            return status_info
         
-        status = client.status()
-        current_song = client.currentsong()
-        playlist_info = client.playlistinfo()
+        if client:
+            try:
+                mpd_state_cache.refresh(client)
+            finally:
+                client.disconnect()
+        status, current_song, next_song, _ = mpd_state_cache.snapshot()
 
         # Get consume mode status from MPD
         consume_mode_status = status.get('consume', '0') == '1'
@@ -682,20 +804,17 @@ def get_mpd_status_for_display():
         except Exception:
             file_format = None
 
-        client.disconnect()
-
-        # Determine next song (Up Next) from playlist based on current position
+        # Determine next song (Up Next) - the cache holds the entry after the current position
         next_song_title = 'End of queue'
         next_song_artist = '—'
+        if next_song:
+            next_song_title = next_song.get('title') or next_song.get('file', 'Unknown Title')
+            next_song_artist = next_song.get('artist', 'Unknown Artist')
+
         try:
-            current_index = int(status.get('song', -1))
-            if current_index >= 0 and (current_index + 1) < len(playlist_info):
-                next_song = playlist_info[current_index + 1]
-                next_song_title = next_song.get('title') or next_song.get('file', 'Unknown Title')
-                next_song_artist = next_song.get('artist', 'Unknown Artist')
+            queue_length = int(status.get('playlistlength', 0))
         except (ValueError, TypeError):
-            # Leave defaults if parsing fails
-            pass
+            queue_length = 0
         
         # Parse volume safely
         volume_str = status.get('volume', '0')
@@ -705,7 +824,7 @@ def get_mpd_status_for_display():
             volume = 0
 
         # Convert elapsed and total time to float first, then to int for formatting
-        elapsed_time_float = float(status.get('elapsed', '0.0'))
+        elapsed_time_float = mpd_state_cache.elapsed()
         total_time_float = float(current_song.get('time', '0.0'))
         
         elapsed_time_int = int(elapsed_time_float)
@@ -811,7 +930,7 @@ def get_mpd_status_for_display():
             'raw_total_time': total_time_float,
             'song_file': song_file_path,
             'file': song_file_path,
-            'queue_length': len(playlist_info),
+            'queue_length': queue_length,
             'consume_mode': consume_mode_status,
             'shuffle_mode': shuffle_mode_status,
             'crossfade_enabled': crossfade_enabled,
@@ -821,11 +940,7 @@ def get_mpd_status_for_display():
             'message': 'Connected to MPD successfully.'
         }
         
-        # Only return if status has changed to avoid unnecessary emissions
-        if current_status_info != last_mpd_status:
-            last_mpd_status = current_status_info
-            return current_status_info
-        return None
+        return current_status_info
 
     except socket.error as e:
         status_info = {
@@ -840,12 +955,9 @@ def get_mpd_status_for_display():
             'next_song_title': 'N/A',
             'next_song_artist': 'N/A'
         }
-        if status_info != last_mpd_status:
-            last_mpd_status = status_info
-            return status_info
-        return None
+        return status_info
     except Exception as e:
-        print(f"MPD error in get_mpd_status_for_display: {e}")
+        print(f"MPD error in build_mpd_status_for_display: {e}")
         status_info = {
             'state': 'error', 
             'message': f'MPD error: {e}', 
@@ -858,162 +970,431 @@ def get_mpd_status_for_display():
             'next_song_title': 'N/A',
             'next_song_artist': 'N/A'
         }
-        if status_info != last_mpd_status:
-            last_mpd_status = status_info
-            return status_info
-        return None
+        return status_info
+
+# Single authoritative status; version only moves when the display actually changes
+mpd_status_snapshot = StatusSnapshot(
+    refresher=build_mpd_status_for_display,
+    default={
+        'state': 'unknown',
+        'message': 'Loading...',
+        'volume': 0,
+        'queue_length': 0,
+        'consume_mode': False,
+        'shuffle_mode': False,
+        'crossfade_enabled': False,
+        'crossfade_seconds': 0
+    }
+)
+
+def get_mpd_status_for_display(max_staleness=MPD_STATUS_MAX_STALENESS):
+    """Returns a copy of the shared MPD status snapshot.
+
+    Args:
+        max_staleness: Oldest acceptable snapshot age in seconds; older snapshots are
+            rebuilt before returning. Pass 0 to force a rebuild, None to accept any age.
+    """
+    return mpd_status_snapshot.get(max_staleness=max_staleness)
+
+def refresh_mpd_status():
+    """Rebuilds the snapshot; subscribers (socket broadcast) fire only if it changed."""
+    return mpd_status_snapshot.refresh()
+
+# Socket rooms: legacy clients get the full dict on every change (including the
+# per-second elapsed tick); clients that subscribed to deltas get only changed keys
+MPD_STATUS_FULL_ROOM = 'mpd_status_full'
+MPD_STATUS_DELTA_ROOM = 'mpd_status_delta'
+mpd_status_encoder = StatusDeltaEncoder()
+
+def broadcast_mpd_status(status, version):
+    """Snapshot subscriber: push changed status to connected clients."""
+    socketio.emit('mpd_status', status, to=MPD_STATUS_FULL_ROOM)
+    delta = mpd_status_encoder.encode(status, mpd_status_snapshot.updated_at)
+    if delta:
+        socketio.emit('mpd_status_delta', delta, to=MPD_STATUS_DELTA_ROOM)
+
+mpd_status_snapshot.subscribe(broadcast_mpd_status)
+
+# Auto-fill wakes on play state, queue length and song changes (not on the elapsed tick);
+# the job token keeps overlapping triggers from starting two fills
+auto_fill_trigger = AutoFillTrigger(on_change=lambda: async_mpd.signal('auto_fill'))
+mpd_status_snapshot.subscribe(auto_fill_trigger.on_status)
+
+def track_status_change(status):
+    """Record play history and handle Last.fm scrobbling for a changed status."""
+    global last_tracked_song_id, play_history
+    # Add to play history when a new song starts playing
+    current_song_id = status.get('song_id')
+    if status.get('state') == 'play' and current_song_id and current_song_id != last_tracked_song_id:
+        last_tracked_song_id = current_song_id
+        history_item = {
+            'timestamp': time.time(),
+            'artist': status.get('artist', 'Unknown Artist'),
+            'title': status.get('song_title', 'Unknown Title'),
+            'album': status.get('album', 'Unknown Album'),
+            'file': status.get('song_file', ''),
+            'album_artist': status.get('album_artist', '')
+        }
+        # Add to beginning of list (most recent first)
+        play_history.insert(0, history_item)
+        # Consecutive plays link their artists in the similarity graph
+        if len(play_history) > 1:
+            pair = known_artists([play_history[1].get('artist'), history_item['artist']])
+            if len(pair) == 2:
+                similarity_graph.learn_transition(*pair)
+        # Keep only MAX_HISTORY_ITEMS
+        if len(play_history) > MAX_HISTORY_ITEMS:
+            play_history = play_history[:MAX_HISTORY_ITEMS]
+        # Refill the auto-fill pool for the new seed while the track plays
+        try:
+            prefetch_auto_fill_candidates(status)
+        except Exception as e:
+            print(f"Error starting auto-fill prefetch: {e}")
+
+    # Scrobbling integration on track changes
+    try:
+        if scrobbling_enabled and status.get('state') == 'play':
+            global current_track_identity, current_track_start_ts, last_scrobbled_identity
+            identity = (
+                status.get('artist') or '',
+                status.get('song_title') or '',
+                status.get('album') or '',
+                status.get('song_file') or ''
+            )
+            # If identity changed, handle previous track scrobble and start new now playing
+            if current_track_identity != identity:
+                now_ts = int(time.time())
+                # Scrobble previous track if eligible
+                if current_track_identity and current_track_start_ts:
+                    prev_artist, prev_title, prev_album, _ = current_track_identity
+                    # Determine duration/elapsed
+                    prev_elapsed = max(0, now_ts - int(current_track_start_ts))
+                    prev_total = int(current_track_total_secs or 0)
+                    # Scrobble rule: >= 50% or >= 240s
+                    if prev_title and (prev_elapsed >= 240 or (prev_total and prev_elapsed >= prev_total/2)):
+                        if last_scrobbled_identity != current_track_identity:
+                            lastfm_scrobble(prev_artist, prev_title, prev_album, int(current_track_start_ts), duration=prev_total or None)
+                            last_scrobbled_identity = current_track_identity
+                # Start tracking new track
+                current_track_identity = identity
+                current_track_start_ts = int(time.time())
+                # Send now playing (use total time from status)
+                total_seconds = int(status.get('raw_total_time') or 0)
+                current_track_total_secs = total_seconds
+                lastfm_update_now_playing(identity[0], identity[1], album=identity[2], duration=total_seconds or None)
+        # If stopped/paused: attempt scrobble of current track if it just ended
+        elif scrobbling_enabled and status.get('state') in ['stop', 'pause']:
+            if current_track_identity and current_track_start_ts:
+                now_ts = int(time.time())
+                prev_artist, prev_title, prev_album, _ = current_track_identity
+                prev_elapsed = max(0, now_ts - int(current_track_start_ts))
+                prev_total = int(current_track_total_secs or 0)
+                if prev_title and (prev_elapsed >= 240 or (prev_total and prev_elapsed >= prev_total/2)):
+                    if last_scrobbled_identity != current_track_identity:
+                        lastfm_scrobble(prev_artist, prev_title, prev_album, int(current_track_start_ts), duration=prev_total or None)
+                        last_scrobbled_identity = current_track_identity
+                current_track_identity = None
+                current_track_start_ts = None
+                current_track_total_secs = None
+    except Exception as e:
+        print(f"[Last.fm] Error in scrobble monitor: {e}")
 
 def mpd_status_monitor():
-    """Background task to poll MPD status and emit updates via SocketIO."""
+    """Background task that keeps the status snapshot current.
+
+    Wakes on idle-watcher change events, or once a second so the extrapolated
+    elapsed time keeps ticking while playing (served from memory, no MPD round-trip).
+    Snapshot subscribers broadcast changes; play history and scrobbling run here.
+    """
+    last_seen_version = 0
     while True:
-        status = get_mpd_status_for_display()
-        if status:
-            socketio.emit('mpd_status', status)
-            
-            # Add to play history when a new song starts playing
-            global last_tracked_song_id, play_history
-            current_song_id = status.get('song_id')
-            if status.get('state') == 'play' and current_song_id and current_song_id != last_tracked_song_id:
-                last_tracked_song_id = current_song_id
-                history_item = {
-                    'timestamp': time.time(),
-                    'artist': status.get('artist', 'Unknown Artist'),
-                    'title': status.get('song_title', 'Unknown Title'),
-                    'album': status.get('album', 'Unknown Album'),
-                    'file': status.get('song_file', ''),
-                    'album_artist': status.get('album_artist', '')
-                }
-                # Add to beginning of list (most recent first)
-                play_history.insert(0, history_item)
-                # Keep only MAX_HISTORY_ITEMS
-                if len(play_history) > MAX_HISTORY_ITEMS:
-                    play_history = play_history[:MAX_HISTORY_ITEMS]
-            
-            # Scrobbling integration on track changes
-            try:
-                if scrobbling_enabled and status.get('state') == 'play':
-                    global current_track_identity, current_track_start_ts, last_scrobbled_identity
-                    identity = (
-                        status.get('artist') or '',
-                        status.get('song_title') or '',
-                        status.get('album') or '',
-                        status.get('song_file') or ''
-                    )
-                    # If identity changed, handle previous track scrobble and start new now playing
-                    if current_track_identity != identity:
-                        now_ts = int(time.time())
-                        # Scrobble previous track if eligible
-                        if current_track_identity and current_track_start_ts:
-                            prev_artist, prev_title, prev_album, _ = current_track_identity
-                            # Determine duration/elapsed
-                            prev_elapsed = max(0, now_ts - int(current_track_start_ts))
-                            prev_total = int(current_track_total_secs or 0)
-                            # Scrobble rule: >= 50% or >= 240s
-                            if prev_title and (prev_elapsed >= 240 or (prev_total and prev_elapsed >= prev_total/2)):
-                                if last_scrobbled_identity != current_track_identity:
-                                    lastfm_scrobble(prev_artist, prev_title, prev_album, int(current_track_start_ts), duration=prev_total or None)
-                                    last_scrobbled_identity = current_track_identity
-                        # Start tracking new track
-                        current_track_identity = identity
-                        current_track_start_ts = int(time.time())
-                        # Send now playing (use total time from status)
-                        total_seconds = int(status.get('raw_total_time') or 0)
-                        current_track_total_secs = total_seconds
-                        lastfm_update_now_playing(identity[0], identity[1], album=identity[2], duration=total_seconds or None)
-                # If stopped/paused: attempt scrobble of current track if it just ended
-                elif scrobbling_enabled and status.get('state') in ['stop', 'pause']:
-                    if current_track_identity and current_track_start_ts:
-                        now_ts = int(time.time())
-                        prev_artist, prev_title, prev_album, _ = current_track_identity
-                        prev_elapsed = max(0, now_ts - int(current_track_start_ts))
-                        prev_total = int(current_track_total_secs or 0)
-                        if prev_title and (prev_elapsed >= 240 or (prev_total and prev_elapsed >= prev_total/2)):
-                            if last_scrobbled_identity != current_track_identity:
-                                lastfm_scrobble(prev_artist, prev_title, prev_album, int(current_track_start_ts), duration=prev_total or None)
-                                last_scrobbled_identity = current_track_identity
-                        current_track_identity = None
-                        current_track_start_ts = None
-                        current_track_total_secs = None
-            except Exception as e:
-                print(f"[Last.fm] Error in scrobble monitor: {e}")
-        time.sleep(1)  # Improved from 0.5 to 1 second for better performance
+        mpd_state_changed.clear()
+        refresh_mpd_status()
+        if mpd_status_snapshot.version != last_seen_version:
+            last_seen_version = mpd_status_snapshot.version
+            track_status_change(get_mpd_status_for_display(max_staleness=None))
+        mpd_state_changed.wait(1)
+
+async def mpd_status_monitor_async():
+    """Coroutine version of mpd_status_monitor, run on the async MPD service loop.
+
+    Status built from the idle cache is pure in-memory work and runs on the loop;
+    only the polling fallback and the Last.fm calls go to the blocking executor,
+    and those only when the track or play state actually changed.
+    """
+    last_seen_version = 0
+    last_track_key = None
+    while True:
+        try:
+            if mpd_idle_watcher.connected and mpd_state_cache.loaded:
+                refresh_mpd_status()
+            else:
+                await async_mpd.run_blocking(refresh_mpd_status)
+            if mpd_status_snapshot.version != last_seen_version:
+                last_seen_version = mpd_status_snapshot.version
+                status = get_mpd_status_for_display(max_staleness=None)
+                track_key = (status.get('state'), status.get('song_id'), status.get('artist'),
+                             status.get('song_title'), status.get('album'), status.get('song_file'))
+                if track_key != last_track_key:
+                    last_track_key = track_key
+                    await async_mpd.run_blocking(track_status_change, status)
+        except Exception as e:
+            print(f"Error in async status monitor: {e}")
+        await async_mpd.wait_signal('mpd_state', timeout=1)
 
-def auto_fill_monitor():
-    """Background task to monitor playlist length and trigger auto-fill."""
+# Minimum seconds between two auto-fill runs
+AUTO_FILL_COOLDOWN = 30
+
+# Longest auto-fill sleep without a status change (re-checks in case an event was missed)
+AUTO_FILL_RECHECK_INTERVAL = 60
+
+def genre_station_pool_candidates(genres):
+    """Candidate files for a genre station, enough to fill the candidate pool."""
+    if library_index.loaded:
+        return genre_sampler.sample(genres, candidate_pool.max_size, exclude=recently_played_files())
+    return collect_genre_station_candidates(genres, candidate_pool.max_size // 5)
+
+def auto_fill_seed(status_info):
+    """Candidate pool key and producer for the current auto-fill seed.
+
+    The seed is the genre station when one is active, otherwise the playing (or
+    last known) artist plus the genre filter. Returns (None, None) without a seed.
+    """
+    if genre_station_mode and genre_station_genres:
+        genres = tuple(genre_station_genres)
+        return ('genres', genres), lambda: genre_station_pool_candidates(genres)
+
+    seed_artist = status_info.get('artist')
+    seed_genre = status_info.get('genre')
+    if seed_genre == 'N/A' and auto_fill_last_genre != 'N/A':
+        seed_genre = auto_fill_last_genre
+    if seed_artist == 'N/A' and auto_fill_last_artist != 'N/A':
+        seed_artist = auto_fill_last_artist
+    if not seed_artist or seed_artist == 'N/A':
+        return None, None
+    filter_genre = seed_genre if auto_fill_genre_filter_enabled else None
+
+    def produce():
+        client = connect_mpd_client()
+        if not client:
+            return []
+        try:
+            candidate_uris, _ = collect_similar_artist_candidates(
+                client, seed_artist, auto_fill_num_tracks_max, bool(filter_genre), filter_genre, notify=False)
+        finally:
+            client.disconnect()
+        return candidate_uris
+
+    return ('artist', seed_artist, filter_genre), produce
+
+def prefetch_auto_fill_candidates(status_info):
+    """Start refilling the candidate pool in the background for the current seed."""
+    if not auto_fill_active or status_info.get('state') != 'play':
+        return
+    key, producer = auto_fill_seed(status_info)
+    if key is not None and candidate_pool.prefetch(key, producer):
+        print(f"[AUTO-FILL] Prefetching candidates for {key}", flush=True)
+
+def add_pooled_auto_fill_tracks(uris):
+    """Add tracks taken from the candidate pool to the queue."""
+    try:
+        client = connect_mpd_client()
+        if not client:
+            socketio.emit('server_message', {'type': 'error', 'text': 'Could not connect to MPD to add tracks.'})
+            return
+        try:
+            result = add_uris_batched(client, uris)
+        finally:
+            client.disconnect()
+        for track_uri, error in result['failed']:
+            print(f"MPD CommandError adding {track_uri} to queue: {error}")
+        socketio.emit('server_message', {'type': 'info', 'text': f'Added {result["added"]} prefetched tracks to playlist.'})
+        refresh_mpd_status()
+    except Exception as e:
+        print(f"Error adding prefetched auto-fill tracks: {e}")
+        socketio.emit('server_message', {'type': 'error', 'text': f'Error adding tracks to MPD: {e}'})
+
+def check_auto_fill(status_info, last_auto_fill_time):
+    """Trigger an auto-fill job if the queue is running low.
+
+    Jobs run as coroutines on the async MPD service when it is running, otherwise
+    on background threads. Returns the (possibly updated) time of the last trigger.
+    """
     global auto_fill_active, auto_fill_min_queue_length, auto_fill_num_tracks_min, auto_fill_num_tracks_max, auto_fill_genre_filter_enabled, auto_fill_last_artist, auto_fill_last_genre, genre_station_mode, genre_station_name, genre_station_genres
 
+    if status_info['state'] != 'play':
+        print("Auto-fill active but MPD is not playing. Skipping check.")
+        return last_auto_fill_time
+
+    current_queue_length = status_info.get('queue_length', 0)
+    current_time = time.time()
+    
+    # Only trigger auto-fill if below threshold AND cooldown period has passed
+    if (current_queue_length < auto_fill_min_queue_length and 
+        current_time - last_auto_fill_time > AUTO_FILL_COOLDOWN):
+        
+        job_token = auto_fill_trigger.begin()
+        if job_token is None:
+            print(f"Auto-fill job already running. Queue length: {current_queue_length}")
+            return last_auto_fill_time
+        print(f"Auto-fill triggered: Queue length ({current_queue_length}) below min ({auto_fill_min_queue_length}).")
+        num_tracks_to_add = random.randint(auto_fill_num_tracks_min, auto_fill_num_tracks_max)
+        last_auto_fill_time = current_time  # Update the last trigger time
+        
+        # Determine seed artist/genre for auto-fill
+        seed_artist = status_info.get('artist')
+        seed_genre = status_info.get('genre')
+
+        # Tracks prefetched for this seed are added at once; otherwise fill live
+        pool_key, pool_producer = auto_fill_seed(status_info)
+        pooled = candidate_pool.take(pool_key, num_tracks_to_add, exclude=recently_played_files()) if pool_key else []
+        if pool_key:
+            candidate_pool.prefetch(pool_key, pool_producer)
+
+        if pooled:
+            socketio.emit('server_message', {
+                'type': 'info',
+                'text': f'Auto-filling {len(pooled)} prefetched tracks...'
+            })
+            start_auto_fill_job(job_token, add_pooled_auto_fill_tracks, uris=pooled)
+        # Check if we're in genre station mode
+        elif genre_station_mode and genre_station_genres:
+            socketio.emit('server_message', {
+                'type': 'info', 
+                'text': f'🎵 Genre Station Auto-fill: Adding {num_tracks_to_add} tracks from station "{genre_station_name}"...'
+            })
+            # Use genre station auto-fill function
+            start_auto_fill_job(job_token, perform_genre_station_auto_fill,
+                                async_target=perform_genre_station_auto_fill_async,
+                                genres=genre_station_genres, num_tracks=num_tracks_to_add)
+        else:
+            # Regular auto-fill mode using similar artists
+            # Fallback to last known if current is N/A
+            if seed_genre == 'N/A' and auto_fill_last_genre != 'N/A':
+                seed_genre = auto_fill_last_genre
+
+            # Always check for artist fallback
+            if seed_artist == 'N/A' and auto_fill_last_artist != 'N/A':
+                seed_artist = auto_fill_last_artist
+
+            if seed_artist == 'N/A':
+                auto_fill_trigger.finish(job_token)
+                socketio.emit('server_message', {
+                    'type': 'warning', 
+                    'text': 'Auto-fill: No current or last known artist to base suggestions on. Skipping auto-fill.'
+                })
+            else:
+                socketio.emit('server_message', {
+                    'type': 'info', 
+                    'text': f'Auto-filling {num_tracks_to_add} tracks (based on "{seed_artist}")...'
+                })
+                fill_args = {
+                    'artist_name_input': seed_artist,
+                    'num_tracks': num_tracks_to_add,
+                    'clear_playlist': False,
+                    'filter_by_genre': auto_fill_genre_filter_enabled,
+                    'seed_genre': seed_genre
+                }
+                # Similar-artist fill is dominated by blocking Last.fm requests, so it
+                # runs on the async service's bounded executor rather than a new thread
+                start_auto_fill_job(job_token, perform_add_random_tracks_logic, **fill_args)
+    elif current_queue_length < auto_fill_min_queue_length:
+        # Still below threshold but in cooldown period
+        cooldown_remaining = int(AUTO_FILL_COOLDOWN - (current_time - last_auto_fill_time))
+        print(f"Auto-fill cooldown active. Queue length: {current_queue_length}, cooldown remaining: {cooldown_remaining}s")
+    return last_auto_fill_time
+
+def start_auto_fill_job(job_token, target, async_target=None, **kwargs):
+    """Run one auto-fill job in the background and release its token when it ends.
+
+    With the async MPD service running, async_target (a coroutine function) runs on
+    its loop, or target on its blocking executor; otherwise target gets a thread.
+    """
+    def run_job():
+        try:
+            target(**kwargs)
+        finally:
+            auto_fill_trigger.finish(job_token)
+            auto_fill_trigger.poke()
+
+    async def run_job_async():
+        try:
+            if async_target:
+                await async_target(**kwargs)
+            else:
+                await async_mpd.run_blocking(target, **kwargs)
+        finally:
+            auto_fill_trigger.finish(job_token)
+            auto_fill_trigger.poke()
+
+    if async_mpd.running:
+        async_mpd.spawn(run_job_async())
+    else:
+        socketio.start_background_task(target=run_job)
+
+def auto_fill_recheck_delay(status_info, last_auto_fill_time):
+    """Seconds the auto-fill monitor may sleep without a status change.
+
+    While the queue is low but the cooldown is running, wake when it ends;
+    otherwise only queue/song changes (or the periodic re-check) wake it.
+    """
+    if (auto_fill_active and status_info.get('state') == 'play'
+            and status_info.get('queue_length', 0) < auto_fill_min_queue_length):
+        remaining = AUTO_FILL_COOLDOWN - (time.time() - last_auto_fill_time)
+        if remaining > 0:
+            return min(remaining + 0.5, AUTO_FILL_RECHECK_INTERVAL)
+    return AUTO_FILL_RECHECK_INTERVAL
+
+def auto_fill_monitor():
+    """Background task that evaluates auto-fill when the queue length or current song changes."""
     last_auto_fill_time = 0  # Track when we last triggered auto-fill
-    auto_fill_cooldown = 30  # Cooldown period in seconds
+    delay = AUTO_FILL_RECHECK_INTERVAL
     
     while True:
-        if auto_fill_active:
-            status_info = get_mpd_status_for_display()
-            if status_info and status_info['state'] == 'play':
-                current_queue_length = status_info.get('queue_length', 0)
-                current_time = time.time()
-                
-                # Only trigger auto-fill if below threshold AND cooldown period has passed
-                if (current_queue_length < auto_fill_min_queue_length and 
-                    current_time - last_auto_fill_time > auto_fill_cooldown):
-                    
-                    print(f"Auto-fill triggered: Queue length ({current_queue_length}) below min ({auto_fill_min_queue_length}).")
-                    num_tracks_to_add = random.randint(auto_fill_num_tracks_min, auto_fill_num_tracks_max)
-                    last_auto_fill_time = current_time  # Update the last trigger time
-                    
-                    # Determine seed artist/genre for auto-fill
-                    seed_artist = status_info.get('artist')
-                    seed_genre = status_info.get('genre')
-
-                    # Check if we're in genre station mode
-                    if genre_station_mode and genre_station_genres:
-                        socketio.emit('server_message', {
-                            'type': 'info', 
-                            'text': f'🎵 Genre Station Auto-fill: Adding {num_tracks_to_add} tracks from station "{genre_station_name}"...'
-                        })
-                        # Use genre station auto-fill function
-                        socketio.start_background_task(
-                            target=perform_genre_station_auto_fill,
-                            genres=genre_station_genres,
-                            num_tracks=num_tracks_to_add
-                        )
-                    else:
-                        # Regular auto-fill mode using similar artists
-                        # Fallback to last known if current is N/A
-                        if seed_genre == 'N/A' and auto_fill_last_genre != 'N/A':
-                            seed_genre = auto_fill_last_genre
-
-                        # Always check for artist fallback
-                        if seed_artist == 'N/A' and auto_fill_last_artist != 'N/A':
-                            seed_artist = auto_fill_last_artist
-
-                        if seed_artist == 'N/A':
-                            socketio.emit('server_message', {
-                                'type': 'warning', 
-                                'text': 'Auto-fill: No current or last known artist to base suggestions on. Skipping auto-fill.'
-                            })
-                        else:
-                            socketio.emit('server_message', {
-                                'type': 'info', 
-                                'text': f'Auto-filling {num_tracks_to_add} tracks (based on "{seed_artist}")...'
-                            })
-                            # Run the add tracks logic in a non-blocking way
-                            socketio.start_background_task(
-                                target=perform_add_random_tracks_logic,
-                                artist_name_input=seed_artist,
-                                num_tracks=num_tracks_to_add,
-                                clear_playlist=False,
-                                filter_by_genre=auto_fill_genre_filter_enabled,
-                                seed_genre=seed_genre
-                            )
-                elif current_queue_length < auto_fill_min_queue_length:
-                    # Still below threshold but in cooldown period
-                    cooldown_remaining = int(auto_fill_cooldown - (current_time - last_auto_fill_time))
-                    print(f"Auto-fill cooldown active. Queue length: {current_queue_length}, cooldown remaining: {cooldown_remaining}s")
-                    
-            elif status_info and status_info['state'] != 'play':
-                print("Auto-fill active but MPD is not playing. Skipping check.")
-        
-        time.sleep(5)
+        auto_fill_trigger.wait(delay)
+        try:
+            if auto_fill_active:
+                status_info = get_mpd_status_for_display(max_staleness=AUTO_FILL_STATUS_MAX_STALENESS)
+                last_auto_fill_time = check_auto_fill(status_info, last_auto_fill_time)
+                delay = auto_fill_recheck_delay(status_info, last_auto_fill_time)
+            else:
+                delay = AUTO_FILL_RECHECK_INTERVAL
+        except Exception as e:
+            print(f"Error in auto-fill monitor: {e}")
+
+async def auto_fill_monitor_async():
+    """Coroutine version of auto_fill_monitor, run on the async MPD service loop."""
+    last_auto_fill_time = 0
+    delay = AUTO_FILL_RECHECK_INTERVAL
+    
+    while True:
+        await async_mpd.wait_signal('auto_fill', timeout=delay)
+        auto_fill_trigger.consume()
+        try:
+            if auto_fill_active:
+                if mpd_status_snapshot.age() > AUTO_FILL_STATUS_MAX_STALENESS:
+                    status_info = await async_mpd.run_blocking(
+                        get_mpd_status_for_display, max_staleness=AUTO_FILL_STATUS_MAX_STALENESS)
+                else:
+                    status_info = get_mpd_status_for_display(max_staleness=None)
+                last_auto_fill_time = check_auto_fill(status_info, last_auto_fill_time)
+                delay = auto_fill_recheck_delay(status_info, last_auto_fill_time)
+            else:
+                delay = AUTO_FILL_RECHECK_INTERVAL
+        except Exception as e:
+            print(f"Error in async auto-fill monitor: {e}")
+
+def lastfm_response_json(response):
+    """Parsed JSON of a Last.fm GET response; raises on HTTP errors and on API error payloads.
+
+    Last.fm reports unknown artists and rate limiting as a 200 response with an
+    'error' object, which must not be cached as data.
+    """
+    response.raise_for_status()
+    data = response.json()
+    if 'error' in data:
+        raise RuntimeError(f"Last.fm API error {data.get('error', 0)}: {data.get('message', 'Unknown error')}")
+    return data
 
 def get_similar_artists_from_lastfm(artist_name, limit=10):
     """Fetches similar artists from Last.fm for a given artist."""
@@ -1028,20 +1409,39 @@ def get_similar_artists_from_lastfm(artist_name, limit=10):
         'format': 'json',
         'limit': limit
     }
+    
+    def fetch():
+        return lastfm_response_json(requests.get(LASTFM_API_URL, params=params, timeout=5, headers=DEFAULT_HTTP_HEADERS))
+    
     try:
-        response = requests.get(LASTFM_API_URL, params=params, timeout=5, headers=DEFAULT_HTTP_HEADERS)
-        response.raise_for_status()
-        data = response.json()
+        data = lastfm_cache.get('artist.getsimilar', {'artist': artist_name, 'limit': limit}, fetch)
+        similarity_graph.learn_lastfm_response({'artist': artist_name}, data)
         
         similar_artists = []
         if 'similarartists' in data and 'artist' in data['similarartists']:
             for artist_data in data['similarartists']['artist']:
                 similar_artists.append(artist_data.get('name'))
         return [a for a in similar_artists if a]
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, RuntimeError) as e:
         print(f"Error fetching similar artists from Last.fm: {e}")
         return []
 
+def similar_artists_for_auto_fill(artist_name, limit=30):
+    """Similar artists from the local similarity graph, asking Last.fm only when it knows too few.
+
+    A well-connected artist is answered from the graph immediately; if Last.fm has not
+    been asked about it yet, that lookup runs in the background to enrich the graph.
+    Otherwise Last.fm is asked now and the graph's neighbors fill up its answer
+    (or replace it when Last.fm is unavailable).
+    """
+    local = similarity_graph.similar(artist_name, limit=limit)
+    if len(local) >= SIMILARITY_GRAPH_MIN_ARTISTS:
+        if LASTFM_API_KEY and not similarity_graph.knows_lastfm(artist_name):
+            socketio.start_background_task(get_similar_artists_from_lastfm, artist_name, limit)
+        return local
+    remote = get_similar_artists_from_lastfm(artist_name, limit=limit)
+    return list(dict.fromkeys(remote + local))[:limit]
+
 def get_top_tracks_from_lastfm(artist_name, limit=5):
     """Fetches top tracks from Last.fm for a given artist."""
     if not LASTFM_API_KEY:
@@ -1055,10 +1455,12 @@ def get_top_tracks_from_lastfm(artist_name, limit=5):
         'format': 'json',
         'limit': limit
     }
+    
+    def fetch():
+        return lastfm_response_json(requests.get(LASTFM_API_URL, params=params, timeout=5))
+    
     try:
-        response = requests.get(LASTFM_API_URL, params=params, timeout=5)
-        response.raise_for_status()
-        data = response.json()
+        data = lastfm_cache.get('artist.gettoptracks', {'artist': artist_name, 'limit': limit}, fetch)
         
         tracks = []
         if 'toptracks' in data and 'track' in data['toptracks']:
@@ -1068,7 +1470,7 @@ def get_top_tracks_from_lastfm(artist_name, limit=5):
                 if track_name and artist_name_from_api:
                     tracks.append({'artist': artist_name_from_api, 'title': track_name})
         return tracks
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, RuntimeError) as e:
         print(f"Error fetching top tracks from Last.fm: {e}")
         return []
 
@@ -1085,10 +1487,12 @@ def get_top_albums_from_lastfm(artist_name, limit=3):
         'format': 'json',
         'limit': limit
     }
+    
+    def fetch():
+        return lastfm_response_json(requests.get(LASTFM_API_URL, params=params, timeout=5, headers=DEFAULT_HTTP_HEADERS))
+    
     try:
-        response = requests.get(LASTFM_API_URL, params=params, timeout=5, headers=DEFAULT_HTTP_HEADERS)
-        response.raise_for_status()
-        data = response.json()
+        data = lastfm_cache.get('artist.gettopalbums', {'artist': artist_name, 'limit': limit}, fetch)
 
         albums = []
         if 'topalbums' in data and 'album' in data['topalbums']:
@@ -1098,7 +1502,7 @@ def get_top_albums_from_lastfm(artist_name, limit=3):
                 if name and name.lower() not in ['(null)', 'null', 'unknown']:
                     albums.append({'artist': artist_name, 'album': name})
         return albums
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, RuntimeError) as e:
         print(f"Error fetching top albums from Last.fm: {e}")
         return []
 
@@ -1161,16 +1565,10 @@ def _add_album_songs_to_playlist_with_client(client, artist: str, album: str) ->
             except Exception as e:
                 print(f"[DEBUG] Fuzzy album search failed: {e}")
 
-        for song in songs:
-            file_path = song.get('file')
-            if file_path:
-                try:
-                    client.add(file_path)
-                    added_count += 1
-                except CommandError as e:
-                    print(f"MPD CommandError adding {file_path}: {e}")
-                except Exception as e:
-                    print(f"Error adding {file_path}: {e}")
+        result = add_uris_batched(client, [song.get('file') for song in songs])
+        added_count = result['added']
+        for file_path, error in result['failed']:
+            print(f"MPD CommandError adding {file_path}: {error}")
     except Exception as e:
         print(f"Error while adding album '{album}' by '{artist}': {e}")
     return added_count
@@ -1704,81 +2102,90 @@ def api_charts(chart_type):
 
 def is_genre_match(target_genre, candidate_genre):
     """
-    Compares two genre strings for a flexible match, considering sub-genres and base genres.
-    Returns True if they are considered a match, False otherwise.
+    Compares two genre strings for a flexible match, considering sub-genres, base genres
+    and alias rules. Returns True if they are considered a match, False otherwise.
+    Candidate may be a multi-value genre list; matching is a set lookup in genre_matcher.
     """
-    if not target_genre or not candidate_genre:
-        return False
-    
-    target_genre_lower = target_genre.lower()
-    candidate_genre_lower = candidate_genre.lower()
+    return genre_matcher.matches(target_genre, candidate_genre)
 
-    # Case 1: Exact match
-    if target_genre_lower == candidate_genre_lower:
-        return True
-
-    # Case 2: One genre string contains the other
-    if target_genre_lower in candidate_genre_lower or candidate_genre_lower in target_genre_lower:
-        return True
-
-    # Case 3: Extract base genre and compare
-    def get_base_genre(genre_str):
-        if '(' in genre_str and ')' in genre_str:
-            return genre_str.split('(')[0].strip().lower()
-        return genre_str.lower()
-
-    base_target = get_base_genre(target_genre)
-    base_candidate = get_base_genre(candidate_genre)
+def collect_similar_artist_candidates(client, artist_name_input, num_tracks, filter_by_genre, seed_genre=None, notify=True):
+    """Collect local files for an artist's Last.fm top tracks and its similar artists.
 
-    if base_target and base_candidate and base_target == base_candidate:
-        return True
-
-    return False
-
-def perform_add_random_tracks_logic(artist_name_input, num_tracks, clear_playlist, filter_by_genre, seed_genre=None):
+    Returns (candidate_uris, match_totals). With notify=False nothing is emitted
+    to the browser (background prefetch for the auto-fill candidate pool).
     """
-    Centralized logic for adding random tracks, reusable by both manual and auto-fill.
-    """
-    print(f"Performing add random tracks logic: artist={artist_name_input}, num_tracks={num_tracks}, clear_playlist={clear_playlist}, filter_by_genre={filter_by_genre}, seed_genre={seed_genre}")
-
-    if not artist_name_input:
-        socketio.emit('server_message', {'type': 'error', 'text': 'Artist name is required for track addition logic.'})
-        print("[DEBUG] Entered /api/album_tracks", flush=True)
-        return
-
-    try:
-        client = connect_mpd_client()
-        if not client:
-            socketio.emit('server_message', {'type': 'error', 'text': 'Could not connect to MPD to add tracks.'})
-            return
-
-        current_genre_for_filter = seed_genre
-
-        if filter_by_genre and (current_genre_for_filter == 'N/A' or not current_genre_for_filter):
-            socketio.emit('server_message', {'type': 'warning', 'text': 'Genre filter requested, but no genre found for current song. Adding all genres.'})
-
-        candidate_uris = []
-        processed_lastfm_tracks = set()
+    current_genre_for_filter = seed_genre
+
+    if notify and filter_by_genre and (current_genre_for_filter == 'N/A' or not current_genre_for_filter):
+        socketio.emit('server_message', {'type': 'warning', 'text': 'Genre filter requested, but no genre found for current song. Adding all genres.'})
+
+    candidate_uris = []
+    processed_lastfm_tracks = set()
+    match_totals = {'suggestions': 0, 'matched': 0, 'seconds': 0.0}
+
+    def match_lastfm_tracks(lastfm_tracks):
+        """Resolve a batch of Last.fm suggestions against the library in one pass."""
+        started = time.monotonic()
+        pairs = [(t['artist'], t['title']) for t in lastfm_tracks
+                 if (t['artist'], t['title']) not in processed_lastfm_tracks]
+        matches = track_matcher.match(pairs, client=client)
+        match_totals['seconds'] += time.monotonic() - started
+        match_totals['suggestions'] += len(matches)
+        match_totals['matched'] += sum(1 for songs in matches.values() if songs)
+        return matches
+
+    # Get top tracks for the initial artist from Last.fm
+    top_tracks_initial_artist = get_top_tracks_from_lastfm(artist_name_input, limit=num_tracks)
+    local_matches = match_lastfm_tracks(top_tracks_initial_artist)
+    for track_info in top_tracks_initial_artist:
+        track_key = (track_info['artist'], track_info['title'])
+        if track_key not in processed_lastfm_tracks:
+            processed_lastfm_tracks.add(track_key)
+            # Local library matches for this track
+            mpd_search_results = local_matches.get(track_key)
+            if mpd_search_results:
+                for mpd_track in mpd_search_results:
+                    file_path = mpd_track.get('file')
+                    if file_path and file_path not in candidate_uris:
+                        # Check genre if filtering is enabled
+                        if filter_by_genre and current_genre_for_filter:
+                            try:
+                                # Tags from the search/find result or the index; reads the file only as a last resort
+                                mpd_track_genre = track_genres.genre(client, mpd_track)
+                                if is_genre_match(current_genre_for_filter, mpd_track_genre):
+                                    candidate_uris.append(file_path)
+                                else:
+                                    print(f"Skipped (genre mismatch): {track_info['artist']} - {track_info['title']} (MPD Genre: {mpd_track_genre}, Target: {current_genre_for_filter})")
+                            except Exception as e:
+                                print(f"Error reading genre for {file_path}: {e}. Skipping genre check.")
+                        else:
+                            candidate_uris.append(file_path)
+            else:
+                print(f"Last.fm suggested '{track_info['artist']} - {track_info['title']}', but not found in local MPD.")
 
-        # Get top tracks for the initial artist from Last.fm
-        top_tracks_initial_artist = get_top_tracks_from_lastfm(artist_name_input, limit=num_tracks)
-        for track_info in top_tracks_initial_artist:
+    # Get similar artists and their top tracks
+    similar_artists = similar_artists_for_auto_fill(artist_name_input, limit=30)
+    print(f"[AUTO-FILL DEBUG] Got {len(similar_artists)} similar artists for {artist_name_input}", flush=True)
+    if notify:
+        socketio.emit('server_message', {'type': 'info', 'text': f'Checking {len(similar_artists)} similar artists...'})
+    # Top tracks are fetched concurrently and matched locally as each response lands;
+    # artists still pending at the deadline only get the broader local search
+    for sim_artist, top_tracks_sim_artist in lastfm_fanout.map(
+            lambda a: get_top_tracks_from_lastfm(a, limit=5), similar_artists, default=[]):
+        local_matches = match_lastfm_tracks(top_tracks_sim_artist)
+        for track_info in top_tracks_sim_artist:
             track_key = (track_info['artist'], track_info['title'])
             if track_key not in processed_lastfm_tracks:
                 processed_lastfm_tracks.add(track_key)
-                # Search local MPD for this track
-                mpd_search_results = client.search('artist', track_info['artist'], 'title', track_info['title'])
+                mpd_search_results = local_matches.get(track_key)
                 if mpd_search_results:
                     for mpd_track in mpd_search_results:
                         file_path = mpd_track.get('file')
                         if file_path and file_path not in candidate_uris:
-                            # Check genre if filtering is enabled
                             if filter_by_genre and current_genre_for_filter:
                                 try:
-                                    mpd_track_details = client.readcomments(file_path)
-                                    mpd_track_genre = mpd_track_details.get('genre')
-                                    if isinstance(mpd_track_genre, list):
-                                        mpd_track_genre = mpd_track_genre[0] if mpd_track_genre else 'N/A'
+                                    # Tags from the search/find result or the index; reads the file only as a last resort
+                                    mpd_track_genre = track_genres.genre(client, mpd_track)
                                     if is_genre_match(current_genre_for_filter, mpd_track_genre):
                                         candidate_uris.append(file_path)
                                     else:
@@ -1788,104 +2195,163 @@ def perform_add_random_tracks_logic(artist_name_input, num_tracks, clear_playlis
                             else:
                                 candidate_uris.append(file_path)
                 else:
-                    print(f"Last.fm suggested '{track_info['artist']} - {track_info['title']}', but not found in local MPD.")
+                    print(f"Last.fm suggested '{track_info['artist']} - {track_info['title']}' from similar artist, but not found in local MPD.")
 
-        # Get similar artists and their top tracks
-        similar_artists = get_similar_artists_from_lastfm(artist_name_input, limit=30)
-        print(f"[AUTO-FILL DEBUG] Got {len(similar_artists)} similar artists from Last.fm for {artist_name_input}", flush=True)
-        socketio.emit('server_message', {'type': 'info', 'text': f'Checking {len(similar_artists)} similar artists...'})
-        for sim_artist in similar_artists:
-            top_tracks_sim_artist = get_top_tracks_from_lastfm(sim_artist, limit=5)
-            for track_info in top_tracks_sim_artist:
-                track_key = (track_info['artist'], track_info['title'])
-                if track_key not in processed_lastfm_tracks:
-                    processed_lastfm_tracks.add(track_key)
-                    mpd_search_results = client.search('artist', track_info['artist'], 'title', track_info['title'])
-                    if mpd_search_results:
-                        for mpd_track in mpd_search_results:
-                            file_path = mpd_track.get('file')
-                            if file_path and file_path not in candidate_uris:
-                                if filter_by_genre and current_genre_for_filter:
-                                    try:
-                                        mpd_track_details = client.readcomments(file_path)
-                                        mpd_track_genre = mpd_track_details.get('genre')
-                                        if isinstance(mpd_track_genre, list):
-                                            mpd_track_genre = mpd_track_genre[0] if mpd_track_genre else 'N/A'
-                                        if is_genre_match(current_genre_for_filter, mpd_track_genre):
-                                            candidate_uris.append(file_path)
-                                        else:
-                                            print(f"Skipped (genre mismatch): {track_info['artist']} - {track_info['title']} (MPD Genre: {mpd_track_genre}, Target: {current_genre_for_filter})")
-                                    except Exception as e:
-                                        print(f"Error reading genre for {file_path}: {e}. Skipping genre check.")
-                                else:
-                                    candidate_uris.append(file_path)
-                    else:
-                        print(f"Last.fm suggested '{track_info['artist']} - {track_info['title']}' from similar artist, but not found in local MPD.")
+        # Fallback to broader local search for similar artist - collect 2-3 tracks from each
+        if sim_artist:
+            try:
+                mpd_all_artist_tracks = client.find('artist', sim_artist)
+                if mpd_all_artist_tracks:
+                    print(f"[AUTO-FILL DEBUG] Found {len(mpd_all_artist_tracks)} tracks by {sim_artist}, adding up to 3...", flush=True)
+                    random.shuffle(mpd_all_artist_tracks)
+                    tracks_added_from_this_artist = 0
+                    # Limit to 2-3 tracks per artist to ensure variety
+                    max_tracks_per_artist = 3
+                    for mpd_track in mpd_all_artist_tracks:
+                        if tracks_added_from_this_artist >= max_tracks_per_artist:
+                            break
+                        file_path = mpd_track.get('file')
+                        if file_path and file_path not in candidate_uris:
+                            if filter_by_genre and current_genre_for_filter:
+                                try:
+                                    # Tags from the search/find result or the index; reads the file only as a last resort
+                                    mpd_track_genre = track_genres.genre(client, mpd_track)
+                                    if is_genre_match(current_genre_for_filter, mpd_track_genre):
+                                        candidate_uris.append(file_path)
+                                        tracks_added_from_this_artist += 1
+                                except Exception as e:
+                                    print(f"Error reading genre for {file_path} in broader search: {e}. Skipping genre check.")
+                            else:
+                                candidate_uris.append(file_path)
+                                tracks_added_from_this_artist += 1
+            except CommandError as e:
+                print(f"MPD CommandError during broader search for artist {sim_artist}: {e}")
+            except Exception as e:
+                print(f"Error during broader search for artist {sim_artist}: {e}")
 
-            # Fallback to broader local search for similar artist - collect 2-3 tracks from each
-            if sim_artist:
-                try:
-                    mpd_all_artist_tracks = client.find('artist', sim_artist)
-                    if mpd_all_artist_tracks:
-                        print(f"[AUTO-FILL DEBUG] Found {len(mpd_all_artist_tracks)} tracks by {sim_artist}, adding up to 3...", flush=True)
-                        random.shuffle(mpd_all_artist_tracks)
-                        tracks_added_from_this_artist = 0
-                        # Limit to 2-3 tracks per artist to ensure variety
-                        max_tracks_per_artist = 3
-                        for mpd_track in mpd_all_artist_tracks:
-                            if tracks_added_from_this_artist >= max_tracks_per_artist:
-                                break
-                            file_path = mpd_track.get('file')
-                            if file_path and file_path not in candidate_uris:
-                                if filter_by_genre and current_genre_for_filter:
-                                    try:
-                                        mpd_track_details = client.readcomments(file_path)
-                                        mpd_track_genre = mpd_track_details.get('genre')
-                                        if isinstance(mpd_track_genre, list):
-                                            mpd_track_genre = mpd_track_genre[0] if mpd_track_genre else 'N/A'
-                                        if is_genre_match(current_genre_for_filter, mpd_track_genre):
-                                            candidate_uris.append(file_path)
-                                            tracks_added_from_this_artist += 1
-                                    except Exception as e:
-                                        print(f"Error reading genre for {file_path} in broader search: {e}. Skipping genre check.")
-                                else:
-                                    candidate_uris.append(file_path)
-                                    tracks_added_from_this_artist += 1
-                except CommandError as e:
-                    print(f"MPD CommandError during broader search for artist {sim_artist}: {e}")
-                except Exception as e:
-                    print(f"Error during broader search for artist {sim_artist}: {e}")
+    return candidate_uris, match_totals
+
+def perform_add_random_tracks_logic(artist_name_input, num_tracks, clear_playlist, filter_by_genre, seed_genre=None):
+    """
+    Centralized logic for adding random tracks, reusable by both manual and auto-fill.
+    """
+    print(f"Performing add random tracks logic: artist={artist_name_input}, num_tracks={num_tracks}, clear_playlist={clear_playlist}, filter_by_genre={filter_by_genre}, seed_genre={seed_genre}")
+
+    if not artist_name_input:
+        socketio.emit('server_message', {'type': 'error', 'text': 'Artist name is required for track addition logic.'})
+        print("[DEBUG] Entered /api/album_tracks", flush=True)
+        return
+
+    try:
+        client = connect_mpd_client()
+        if not client:
+            socketio.emit('server_message', {'type': 'error', 'text': 'Could not connect to MPD to add tracks.'})
+            return
+
+        candidate_uris, match_totals = collect_similar_artist_candidates(
+            client, artist_name_input, num_tracks, filter_by_genre, seed_genre)
 
         if not candidate_uris:
             socketio.emit('server_message', {'type': 'error', 'text': f'No local MPD tracks found matching Last.fm suggestions for "{artist_name_input}" or similar artists, with current filters.'})
             return
 
-        print(f"[AUTO-FILL DEBUG] Collected {len(candidate_uris)} total candidate tracks from all similar artists", flush=True)
-        socketio.emit('server_message', {'type': 'info', 'text': f'Collected {len(candidate_uris)} tracks, adding {num_tracks}...'})
+        match_summary = (f"{match_totals['matched']}/{match_totals['suggestions']} Last.fm suggestions found locally "
+                         f"in {match_totals['seconds'] * 1000:.0f} ms")
+        print(f"[AUTO-FILL DEBUG] Collected {len(candidate_uris)} total candidate tracks from all similar artists ({match_summary})", flush=True)
+        socketio.emit('server_message', {'type': 'info', 'text': f'Collected {len(candidate_uris)} tracks ({match_summary}), adding {num_tracks}...'})
         
         # Shuffle all collected and filtered tracks
         random.shuffle(candidate_uris)
 
+        # Add in command lists; refill from the remaining candidates if some fail
         added_count = 0
-        for mpd_uri in candidate_uris:
-            if added_count >= num_tracks:
+        remaining = candidate_uris
+        while remaining and added_count < num_tracks:
+            needed = num_tracks - added_count
+            batch, remaining = remaining[:needed], remaining[needed:]
+            result = add_uris_batched(client, batch)
+            added_count += result['added']
+            for mpd_uri, error in result['failed']:
+                print(f"MPD CommandError adding {mpd_uri} to queue: {error}")
+
+        client.disconnect()
+        socketio.emit('server_message', {'type': 'info', 'text': f'Added {added_count} relevant tracks to playlist.'})
+        # Trigger a status update after adding tracks
+        socketio.start_background_task(target=refresh_mpd_status)
+
+    except Exception as e:
+        print(f"Error during track addition logic: {e}")
+        socketio.emit('server_message', {'type': 'error', 'text': f'Error adding tracks to MPD: {e}'})
+
+def collect_genre_station_candidates(genres, num_tracks):
+    """
+    Collect candidate files for a genre station from MPD (used while the library
+    index is not loaded). Genres are visited in random order so the early stop
+    does not always favour the first genres of the station.
+    """
+    genres = random.sample(list(genres), len(genres))
+    candidate_uris = []
+    seen_uris = set()
+    batch_size = 15  # Process genres in batches to prevent timeouts
+    target_candidates = num_tracks * 5  # Early stopping when we have 5x needed tracks
+    
+    # Process genres in batches
+    for batch_start in range(0, len(genres), batch_size):
+        batch_end = min(batch_start + batch_size, len(genres))
+        batch_genres = genres[batch_start:batch_end]
+        
+        print(f"Processing genre batch {batch_start//batch_size + 1}: genres {batch_start+1}-{batch_end}")
+        
+        # Fresh MPD connection for each batch
+        client = connect_mpd_client()
+        if not client:
+            socketio.emit('server_message', {
+                'type': 'error', 
+                'text': f'Could not connect to MPD for batch {batch_start//batch_size + 1}'
+            })
+            continue
+        
+        try:
+            # Get songs from current batch of genres
+            for genre in batch_genres:
+                try:
+                    genre_songs = client.find('genre', genre)
+                    print(f"  Genre '{genre}': {len(genre_songs)} songs")
+                    
+                    # Add all songs from this genre to candidates
+                    for song in genre_songs:
+                        file_path = song.get('file')
+                        if file_path and file_path not in seen_uris:
+                            seen_uris.add(file_path)
+                            candidate_uris.append(file_path)
+                            
+                            # Early stopping if we have enough candidates
+                            if len(candidate_uris) >= target_candidates:
+                                print(f"  Early stop: {len(candidate_uris)} candidates found")
+                                break
+                    
+                    # Break out of genre loop if we have enough
+                    if len(candidate_uris) >= target_candidates:
+                        break
+                
+                except Exception as e:
+                    print(f"  Error fetching songs for genre '{genre}': {e}")
+                    continue
+            
+            client.disconnect()
+            
+            # Early exit if we have enough candidates
+            if len(candidate_uris) >= target_candidates:
+                print(f"Early stopping: {len(candidate_uris)} candidates sufficient")
                 break
-            try:
-                client.add(mpd_uri)
-                added_count += 1
-            except CommandError as e:
-                print(f"MPD CommandError adding {mpd_uri} to queue: {e}")
-            except Exception as e:
-                print(f"Error adding {mpd_uri} to queue: {e}")
-
-        client.disconnect()
-        socketio.emit('server_message', {'type': 'info', 'text': f'Added {added_count} relevant tracks to playlist.'})
-        # Trigger a status update after adding tracks
-        socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
-
-    except Exception as e:
-        print(f"Error during track addition logic: {e}")
-        socketio.emit('server_message', {'type': 'error', 'text': f'Error adding tracks to MPD: {e}'})
+        
+        except Exception as e:
+            print(f"Error processing batch: {e}")
+            client.disconnect()
+            continue
+    
+    print(f"Radio station auto-fill: {len(candidate_uris)} total candidates collected")
+    return candidate_uris
 
 def perform_genre_station_auto_fill(genres, num_tracks):
     """
@@ -1895,77 +2361,23 @@ def perform_genre_station_auto_fill(genres, num_tracks):
     print(f"Performing genre station auto-fill v3: {len(genres)} genres, {num_tracks} tracks needed")
     
     try:
-        candidate_uris = []
-        batch_size = 15  # Process genres in batches to prevent timeouts
-        target_candidates = num_tracks * 5  # Early stopping when we have 5x needed tracks
-        
-        # Process genres in batches
-        for batch_start in range(0, len(genres), batch_size):
-            batch_end = min(batch_start + batch_size, len(genres))
-            batch_genres = genres[batch_start:batch_end]
-            
-            print(f"Processing genre batch {batch_start//batch_size + 1}: genres {batch_start+1}-{batch_end}")
-            
-            # Fresh MPD connection for each batch
-            client = connect_mpd_client()
-            if not client:
-                socketio.emit('server_message', {
-                    'type': 'error', 
-                    'text': f'Could not connect to MPD for batch {batch_start//batch_size + 1}'
-                })
-                continue
-            
-            try:
-                # Get songs from current batch of genres
-                for genre in batch_genres:
-                    try:
-                        genre_songs = client.find('genre', genre)
-                        print(f"  Genre '{genre}': {len(genre_songs)} songs")
-                        
-                        # Add all songs from this genre to candidates
-                        for song in genre_songs:
-                            file_path = song.get('file')
-                            if file_path and file_path not in candidate_uris:
-                                candidate_uris.append(file_path)
-                                
-                                # Early stopping if we have enough candidates
-                                if len(candidate_uris) >= target_candidates:
-                                    print(f"  Early stop: {len(candidate_uris)} candidates found")
-                                    break
-                        
-                        # Break out of genre loop if we have enough
-                        if len(candidate_uris) >= target_candidates:
-                            break
-                            
-                    except Exception as e:
-                        print(f"  Error fetching songs for genre '{genre}': {e}")
-                        continue
-                
-                client.disconnect()
-                
-                # Early exit if we have enough candidates
-                if len(candidate_uris) >= target_candidates:
-                    print(f"Early stopping: {len(candidate_uris)} candidates sufficient")
-                    break
-                    
-            except Exception as e:
-                print(f"Error processing batch: {e}")
-                client.disconnect()
-                continue
+        if library_index.loaded:
+            # Weighted draw over the index's genre -> tracks lists, skipping recently played files
+            tracks_to_add = genre_sampler.sample(genres, num_tracks, exclude=recently_played_files())
+            print(f"Radio station auto-fill: drew {len(tracks_to_add)} tracks from the library index")
+        else:
+            candidate_uris = collect_genre_station_candidates(genres, num_tracks)
+            # Randomly select tracks from candidates
+            random.shuffle(candidate_uris)
+            tracks_to_add = candidate_uris[:num_tracks]
         
-        if not candidate_uris:
+        if not tracks_to_add:
             socketio.emit('server_message', {
                 'type': 'warning', 
                 'text': f'No songs found for genre station genres (processed {len(genres)} genres)'
             })
             return
         
-        print(f"Radio station auto-fill: {len(candidate_uris)} total candidates collected")
-        
-        # Randomly select tracks from candidates
-        random.shuffle(candidate_uris)
-        tracks_to_add = candidate_uris[:num_tracks]
-        
         # Add selected tracks to playlist with fresh connection
         client = connect_mpd_client()
         if not client:
@@ -1975,13 +2387,10 @@ def perform_genre_station_auto_fill(genres, num_tracks):
             })
             return
         
-        added_count = 0
-        for track_uri in tracks_to_add:
-            try:
-                client.add(track_uri)
-                added_count += 1
-            except Exception as e:
-                print(f"Error adding genre station track {track_uri}: {e}")
+        result = add_uris_batched(client, tracks_to_add)
+        added_count = result['added']
+        for track_uri, error in result['failed']:
+            print(f"Error adding genre station track {track_uri}: {error}")
         
         client.disconnect()
         
@@ -1992,7 +2401,7 @@ def perform_genre_station_auto_fill(genres, num_tracks):
         })
         
         # Trigger status update
-        socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+        socketio.start_background_task(target=refresh_mpd_status)
         
     except Exception as e:
         print(f"Error during genre station auto-fill v3: {e}")
@@ -2001,22 +2410,86 @@ def perform_genre_station_auto_fill(genres, num_tracks):
             'text': f'Radio station auto-fill error: {e}'
         })
 
+async def perform_genre_station_auto_fill_async(genres, num_tracks):
+    """
+    Coroutine version of perform_genre_station_auto_fill for the async MPD service.
+    Each batch of genre lookups is issued concurrently on the shared asyncio
+    connection instead of a fresh pooled connection per batch on a worker thread.
+    """
+    print(f"Performing async genre station auto-fill: {len(genres)} genres, {num_tracks} tracks needed")
+    
+    try:
+        if library_index.loaded:
+            # Weighted draw over the index's genre -> tracks lists, skipping recently played files
+            tracks_to_add = genre_sampler.sample(genres, num_tracks, exclude=recently_played_files())
+            print(f"Radio station auto-fill: drew {len(tracks_to_add)} tracks from the library index")
+        else:
+            candidate_uris = []
+            seen_uris = set()
+            batch_size = 15
+            # Random genre order so the early stop does not always favour the first genres
+            genres = random.sample(list(genres), len(genres))
+            target_candidates = num_tracks * 5  # Early stopping when we have 5x needed tracks
+            
+            for batch_start in range(0, len(genres), batch_size):
+                batch_genres = genres[batch_start:batch_start + batch_size]
+                results = await asyncio.gather(
+                    *(async_mpd.execute('find', 'genre', genre) for genre in batch_genres),
+                    return_exceptions=True
+                )
+                for genre, genre_songs in zip(batch_genres, results):
+                    if isinstance(genre_songs, Exception):
+                        print(f"  Error fetching songs for genre '{genre}': {genre_songs}")
+                        continue
+                    print(f"  Genre '{genre}': {len(genre_songs)} songs")
+                    for song in genre_songs:
+                        file_path = song.get('file')
+                        if file_path and file_path not in seen_uris:
+                            seen_uris.add(file_path)
+                            candidate_uris.append(file_path)
+                            if len(candidate_uris) >= target_candidates:
+                                break
+                    if len(candidate_uris) >= target_candidates:
+                        break
+                
+                if len(candidate_uris) >= target_candidates:
+                    print(f"Early stopping: {len(candidate_uris)} candidates sufficient")
+                    break
+            
+            print(f"Radio station auto-fill: {len(candidate_uris)} total candidates collected")
+            random.shuffle(candidate_uris)
+            tracks_to_add = candidate_uris[:num_tracks]
+        
+        if not tracks_to_add:
+            socketio.emit('server_message', {
+                'type': 'warning', 
+                'text': f'No songs found for genre station genres (processed {len(genres)} genres)'
+            })
+            return
+        
+        result = await async_mpd.add_many(tracks_to_add, connect_mpd_client)
+        for track_uri, error in result['failed']:
+            print(f"Error adding genre station track {track_uri}: {error}")
+        
+        socketio.emit('server_message', {
+            'type': 'success', 
+            'text': f'🎵 Genre Station Auto-fill: Added {result["added"]} tracks from {len(genres)} genres'
+        })
+        
+        await async_mpd.run_blocking(refresh_mpd_status)
+        
+    except Exception as e:
+        print(f"Error during async genre station auto-fill: {e}")
+        socketio.emit('server_message', {
+            'type': 'error', 
+            'text': f'Radio station auto-fill error: {e}'
+        })
+
 # --- Web Routes ---
 
 @app.route('/')
 def index():
     mpd_info = get_mpd_status_for_display()
-    if mpd_info is None:
-        mpd_info = last_mpd_status if last_mpd_status else {
-            'state': 'unknown', 
-            'message': 'Loading...', 
-            'volume': 0, 
-            'queue_length': 0, 
-            'consume_mode': False,
-            'shuffle_mode': False,
-            'crossfade_enabled': False,
-            'crossfade_seconds': 0
-        }
 
     album_art_url = url_for('get_album_art', 
                             song_file=mpd_info.get('song_file', ''),
@@ -2032,13 +2505,6 @@ def index():
 def album_art_view():
     """Full-screen album art view page."""
     mpd_info = get_mpd_status_for_display()
-    if mpd_info is None:
-        mpd_info = last_mpd_status if last_mpd_status else {
-            'state': 'unknown',
-            'artist': 'Unknown Artist',
-            'album': 'Unknown Album',
-            'song_file': ''
-        }
     
     album_art_url = url_for('get_album_art', 
                             song_file=mpd_info.get('song_file', ''),
@@ -2064,7 +2530,7 @@ def get_artist_images():
         albums = []
         
         # First, search local MPD database for albums by this artist
-        client = connect_mpd_client()
+        client = connect_library_client()
         if client:
             try:
                 # Search for albums containing the artist name (catches collaborations)
@@ -2111,7 +2577,7 @@ def get_artist_images():
             similar_artists = get_similar_artists_from_lastfm(artist, limit=20)
             
             if similar_artists:
-                client = connect_mpd_client()
+                client = connect_library_client()
                 if client:
                     try:
                         for sim_artist in similar_artists:
@@ -2162,9 +2628,12 @@ def get_artist_images():
 
 @app.route('/api/search/autocomplete')
 def search_autocomplete_data():
-    """Return all artists, albums, and titles for client-side autocomplete."""
+    """Return all artists, albums, and titles for client-side autocomplete.
+
+    Kept for older clients; the bundled pages query /api/suggest per keystroke.
+    """
     try:
-        client = connect_mpd_client()
+        client = connect_library_client()
         if not client:
             return jsonify({'status': 'error', 'message': 'Could not connect to MPD'}), 500
         
@@ -2223,7 +2692,7 @@ def search():
         try:
             print(f"Received search request for tag: {search_tag} with query: {query}")
 
-            client = connect_mpd_client()
+            client = connect_library_client(ranked_search=True)
             if not client:
                 return render_template('search.html', error="Could not connect to MPD")
 
@@ -2249,12 +2718,87 @@ def search():
     # No query provided, just show the search page
     return render_template('search.html')
 
+@app.route('/api/search', methods=['GET'])
+def api_search():
+    """Ranked, prefix-aware song search as JSON (for search-as-you-type)."""
+    query = request.args.get('q', '').strip()
+    search_tag = request.args.get('type', 'any')
+    try:
+        limit = max(1, min(int(request.args.get('limit', 50)), 500))
+    except ValueError:
+        limit = 50
+    
+    if not query:
+        return jsonify({'status': 'success', 'results': [], 'count': 0})
+    
+    try:
+        if library_catalog.ready:
+            results = library_catalog.search(query, tag=search_tag, limit=limit)
+            source = 'catalog'
+        else:
+            # Catalog not built yet - fall back to a substring search
+            client = connect_library_client()
+            if not client:
+                return jsonify({'status': 'error', 'message': 'Could not connect to MPD'}), 500
+            try:
+                results = client.search(search_tag, query)[:limit]
+            finally:
+                client.disconnect()
+            source = 'mpd'
+        
+        return jsonify({'status': 'success', 'results': results, 'count': len(results), 'source': source})
+    except Exception as e:
+        print(f"Error in /api/search: {e}")
+        return jsonify({'status': 'error', 'message': f'Search failed: {str(e)}'}), 500
+
+@app.route('/api/suggest', methods=['GET'])
+def api_suggest():
+    """Top-k autocomplete suggestions for a typed prefix (case and accent insensitive)."""
+    query = request.args.get('q', '').strip()
+    suggest_type = request.args.get('type', 'any')
+    try:
+        limit = max(1, min(int(request.args.get('limit', 20)), 100))
+    except ValueError:
+        limit = 20
+    
+    if not query:
+        return jsonify({'status': 'success', 'suggestions': [], 'ready': suggest_index.ready})
+    
+    try:
+        suggestions = suggest_index.suggest(query, limit=limit, kind=suggest_type)
+        return jsonify({'status': 'success', 'suggestions': suggestions, 'ready': suggest_index.ready})
+    except Exception as e:
+        print(f"Error in /api/suggest: {e}")
+        return jsonify({'status': 'error', 'message': f'Suggest failed: {str(e)}'}), 500
+
 @app.route('/random_albums', methods=['GET'])
 def random_albums():
-    """Return 25 random albums from the library."""
+    """Return 25 random albums from the library.
+
+    Optional ?genre= and ?decade= (e.g. 1990) filters apply once the library
+    index has loaded; albums shown recently in this browser session are skipped.
+    """
     mpd_info = get_mpd_status_for_display()
+    if library_index.loaded:
+        try:
+            decade = int(request.args['decade']) if request.args.get('decade') else None
+        except ValueError:
+            decade = None
+        genre = request.args.get('genre') or None
+        if 'shelf_id' not in session:
+            session['shelf_id'] = uuid.uuid4().hex
+        albums_list = [dict(album, item_type='album') for album in
+                       album_sampler.sample(RANDOM_SHELF_SIZE, genre=genre, decade=decade,
+                                            session_id=session['shelf_id'])]
+        print(f"[DEBUG] Returning {len(albums_list)} random albums from the album table", flush=True)
+        return render_template('search_results.html',
+                               results=albums_list,
+                               query='Random Selection',
+                               search_tag='album',
+                               mpd_info=mpd_info)
+    
     try:
-        client = connect_mpd_client()
+        client = connect_library_client()
         if not client:
             return render_template('search.html', error="Could not connect to MPD")
         
@@ -2470,8 +3014,6 @@ def seek_position():
 def history():
     """Display play history page"""
     mpd_status = get_mpd_status_for_display()
-    if mpd_status is None:
-        mpd_status = last_mpd_status if last_mpd_status else {'state': 'unknown'}
     app_theme = app.config.get('THEME', 'dark')
     return render_template('history.html', 
                           history=play_history,
@@ -2536,9 +3078,7 @@ def set_volume():
             def broadcast_volume_update():
                 import time
                 time.sleep(0.1)
-                status = get_mpd_status_for_display()
-                if status:
-                    socketio.emit('mpd_status', status, to=None, skip_sid=None)
+                refresh_mpd_status()
             socketio.start_background_task(broadcast_volume_update)
             return 'OK', 200
         else:
@@ -2561,7 +3101,7 @@ def restart_mpd():
         
         # Emit success message and trigger status update
         socketio.emit('server_message', {'type': 'success', 'text': 'MPD service restarted successfully'})
-        socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+        socketio.start_background_task(target=refresh_mpd_status)
         
         return redirect(url_for('index'))
         
@@ -2598,7 +3138,7 @@ def update_mpd_db():
             socketio.emit('server_message', {'type': 'success', 'text': 'MPD database update started successfully'})
             
             # Wait a moment and then trigger status update
-            socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+            socketio.start_background_task(target=refresh_mpd_status)
             
             return redirect(url_for('index'))
         else:
@@ -2643,12 +3183,38 @@ def db_update_status():
             'message': str(e)
         }), 500
 
+@app.route('/api/mpd_pool_status')
+def mpd_pool_status():
+    """Expose MPD connection counters (pool checkouts, idle wakeups, state refreshes)."""
+    return jsonify({
+        'status': 'success',
+        'pool': mpd_pool.stats(),
+        'idle_watcher': mpd_idle_watcher.stats(),
+        'state_cache': mpd_state_cache.stats(),
+        'queue_mirror': mpd_queue.stats(),
+        'status_deltas': mpd_status_encoder.stats(),
+        'async_mpd': async_mpd.stats(),
+        'library_index': library_index.stats(),
+        'library_catalog': library_catalog.stats(),
+        'suggest_index': suggest_index.stats(),
+        'album_sampler': album_sampler.stats(),
+        'artist_albums_cache': artist_albums_cache.stats(),
+        'recent_albums_index': recent_albums_index.stats(),
+        'genre_sampler': genre_sampler.stats(),
+        'genre_matcher': genre_matcher.stats(),
+        'track_genres': track_genres.stats(),
+        'lastfm_cache': lastfm_cache.stats(),
+        'lastfm_fanout': lastfm_fanout.stats(),
+        'track_matcher': track_matcher.stats(),
+        'similarity_graph': similarity_graph.stats()
+    })
+
 @app.route('/add_music')
 def add_music_page():
     """Add music page."""
     mpd_info = get_mpd_status_for_display()
-    current_artist = mpd_info.get('artist', '') if mpd_info else ''
-    current_genre = mpd_info.get('genre', '') if mpd_info else ''
+    current_artist = mpd_info.get('artist', '')
+    current_genre = mpd_info.get('genre', '')
     return render_template('add_music.html', mpd_info=mpd_info, current_artist=current_artist, current_genre=current_genre)
 
 @app.route('/add_random_tracks', methods=['POST'])
@@ -2669,7 +3235,7 @@ def add_random_tracks_manual():
 
     # Use current playing genre as seed for manual add
     mpd_status = get_mpd_status_for_display()
-    seed_genre = mpd_status.get('genre') if mpd_status else 'N/A'
+    seed_genre = mpd_status.get('genre', 'N/A')
 
     socketio.emit('server_message', {'type': 'info', 'text': f'Manually searching Last.fm for similar artists and tracks for {artist_name_input}...'})
     
@@ -2712,9 +3278,12 @@ def get_genres():
 
 @app.route('/api/autocomplete/artists', methods=['GET'])
 def autocomplete_artists():
-    """Return all artists for autocomplete in artist-based music addition."""
+    """Return all artists for autocomplete in artist-based music addition.
+
+    Kept for older clients; the bundled pages query /api/suggest?type=artist.
+    """
     try:
-        client = connect_mpd_client()
+        client = connect_library_client()
         if not client:
             return jsonify({'status': 'error', 'message': 'Could not connect to MPD'}), 500
         
@@ -2841,16 +3410,10 @@ def add_from_artists():
         print(f"[DEBUG] Selected {play_count} random songs from {len(all_songs)} total for {len(artist_names)} artists", flush=True)
         
         # Add selected songs to queue
-        total_added = 0
-        for song in selected_songs:
-            file_path = song.get('file')
-            if file_path:
-                try:
-                    client.add(file_path)
-                    total_added += 1
-                except Exception as e:
-                    print(f"[DEBUG] Error adding song to queue: {e}", flush=True)
-                    continue
+        result = add_uris_batched(client, [song.get('file') for song in selected_songs])
+        total_added = result['added']
+        for file_path, error in result['failed']:
+            print(f"[DEBUG] Error adding song to queue: {error}", flush=True)
         
         # Disconnect
         if client:
@@ -3096,7 +3659,7 @@ def test_streaming_radio():
             })
             
             # Trigger status update
-            socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+            socketio.start_background_task(target=refresh_mpd_status)
             
             return jsonify({'status': 'success', 'message': 'Stream started'})
             
@@ -3516,7 +4079,7 @@ def play_radio_station():
             })
             
             # Update status
-            socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+            socketio.start_background_task(target=refresh_mpd_status)
             
             return jsonify({'status': 'success', 'message': f'Playing {name}'})
             
@@ -3643,7 +4206,7 @@ def add_top_albums_by_artist():
 
         msg = f"Added {total_added} songs from {len(albums_processed)} top album(s) by {artist}."
         socketio.emit('server_message', {'type': 'success', 'text': msg})
-        socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+        socketio.start_background_task(target=refresh_mpd_status)
         return jsonify({'status': 'success', 'message': msg, 'details': albums_processed})
 
     except Exception as e:
@@ -3684,6 +4247,7 @@ def add_top_tracks_by_artist():
 
         added_count = 0
         try:
+            matched_files = []
             for t in tracks:
                 title = t.get('title') or t.get('name')
                 if not title:
@@ -3694,16 +4258,14 @@ def add_top_tracks_by_artist():
                     print(f"MPD search error for {artist} - {title}: {se}")
                     results = []
                 if results:
-                    # Add the first match
-                    file_path = results[0].get('file')
-                    if file_path:
-                        try:
-                            client.add(file_path)
-                            added_count += 1
-                        except CommandError as e:
-                            print(f"MPD add error for {file_path}: {e}")
+                    # Queue the first match
+                    matched_files.append(results[0].get('file'))
                 else:
                     print(f"Top track not found locally: {artist} - {title}")
+            result = add_uris_batched(client, matched_files)
+            added_count = result['added']
+            for file_path, error in result['failed']:
+                print(f"MPD add error for {file_path}: {error}")
         finally:
             try:
                 client.disconnect()
@@ -3717,7 +4279,7 @@ def add_top_tracks_by_artist():
 
         msg = f"Added {added_count} top track(s) by {artist}."
         socketio.emit('server_message', {'type': 'success', 'text': msg})
-        socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+        socketio.start_background_task(target=refresh_mpd_status)
         return jsonify({'status': 'success', 'message': msg, 'tracks_added': added_count})
 
     except Exception as e:
@@ -3777,24 +4339,21 @@ def add_random_by_genre():
             random.shuffle(songs_list)
             selected_songs = songs_list[:num_tracks]
             
-            # Add songs to playlist
-            for song in selected_songs:
-                client.add(song['file'])
-            
-            # Small delay to ensure MPD processes the additions
-            import time
-            time.sleep(0.2)
+            # Add songs to playlist (MPD acknowledges each command in the list)
+            result = add_uris_batched(client, [song['file'] for song in selected_songs])
+            for file_path, error in result['failed']:
+                print(f"Error adding {file_path}: {error}")
             
             client.disconnect()
             
             genre_list = ', '.join(genres[:3]) + ('...' if len(genres) > 3 else '')
-            success_msg = f'Added {len(selected_songs)} random songs from genres: {genre_list} (using Auto-Fill settings: {auto_fill_num_tracks_min}-{auto_fill_num_tracks_max})'
+            success_msg = f'Added {result["added"]} random songs from genres: {genre_list} (using Auto-Fill settings: {auto_fill_num_tracks_min}-{auto_fill_num_tracks_max})'
             socketio.emit('server_message', {'type': 'success', 'text': success_msg})
             
             return jsonify({
                 'status': 'success', 
                 'message': success_msg,
-                'songs_added': len(selected_songs)
+                'songs_added': result['added']
             })
             
         except Exception as e:
@@ -3968,22 +4527,29 @@ def add_album_to_playlist():
             print(f"[DEBUG] Searching for album: artist='{artist}', album='{album}'" + 
                   (f", disc={disc_number}" if disc_number else "") +
                   (f", dir='{album_dir}'" if album_dir else ""), flush=True)
-            # Find all songs from this album - try AlbumArtist first, then Artist
+            # Resolve from the library index when loaded: one lookup, already in disc/track order.
+            # A miss still runs the MPD searches below.
             songs = []
-            try:
-                songs = client.find('albumartist', artist, 'album', album)
-                if songs:
-                    print(f"[DEBUG] Found {len(songs)} songs using AlbumArtist", flush=True)
-                    # Filter by directory if provided (to handle multiple albums with same name)
-                    if album_dir:
-                        original_count = len(songs)
-                        songs = [s for s in songs if s.get('file', '').startswith(album_dir + '/')]
-                        print(f"[DEBUG] Filtered by directory '{album_dir}': {original_count} -> {len(songs)} songs", flush=True)
-            except Exception as e:
-                print(f"[DEBUG] AlbumArtist search failed: {e}", flush=True)
+            if library_index.loaded:
+                songs = library_index.resolve_album(artist, album, album_dir)
+                print(f"[DEBUG] Album resolver matched {len(songs)} songs", flush=True)
+            resolved = bool(songs)
+            if not resolved:
+                # Find all songs from this album - try AlbumArtist first, then Artist
+                try:
+                    songs = client.find('albumartist', artist, 'album', album)
+                    if songs:
+                        print(f"[DEBUG] Found {len(songs)} songs using AlbumArtist", flush=True)
+                        # Filter by directory if provided (to handle multiple albums with same name)
+                        if album_dir:
+                            original_count = len(songs)
+                            songs = [s for s in songs if s.get('file', '').startswith(album_dir + '/')]
+                            print(f"[DEBUG] Filtered by directory '{album_dir}': {original_count} -> {len(songs)} songs", flush=True)
+                except Exception as e:
+                    print(f"[DEBUG] AlbumArtist search failed: {e}", flush=True)
                     
             # If no songs found by AlbumArtist, try by Artist
-            if not songs:
+            if not songs and not resolved:
                 songs = client.find('artist', artist, 'album', album)
                 if songs:
                     print(f"[DEBUG] Found {len(songs)} songs using Artist", flush=True)
@@ -3996,7 +4562,7 @@ def add_album_to_playlist():
                     print(f"[DEBUG] No songs found with Artist search either", flush=True)
 
             # Fallback 1: Use MPD 'search' (partial match) by album, then filter by artist
-            if not songs:
+            if not songs and not resolved:
                 try:
                     candidates = client.search('album', album) or []
                     print(f"[DEBUG] Fallback search('album', '{album}') returned {len(candidates)} tracks", flush=True)
@@ -4024,7 +4590,7 @@ def add_album_to_playlist():
                     print(f"[DEBUG] Fallback search error: {e}", flush=True)
 
             # Fallback 2: Inspect artist's album list and re-query with closest match
-            if not songs and artist:
+            if not songs and artist and not resolved:
                 try:
                     artist_albums = client.list('album', 'artist', artist) or []
                     # mpd may return list of dicts {'album': 'Name'} or list of strings; normalize
@@ -4105,15 +4671,10 @@ def add_album_to_playlist():
                     print(f"[DISC] Single-disc album (or no disc metadata) - all tracks on one disc", flush=True)
                 
             # Add selected songs to playlist
-            added_count = 0
-            for song in songs:
-                file_path = song.get('file')
-                if file_path:
-                    try:
-                        client.add(file_path)
-                        added_count += 1
-                    except CommandError as e:
-                        print(f"Error adding {file_path}: {e}")
+            result = add_uris_batched(client, [song.get('file') for song in songs])
+            added_count = result['added']
+            for file_path, error in result['failed']:
+                print(f"Error adding {file_path}: {error}")
             
             # Check if MPD is playing, if not auto-play
             status = client.status()
@@ -4136,7 +4697,7 @@ def add_album_to_playlist():
                     success_message = f'Added {added_count} songs from "{album}" by {artist} to playlist.'
                 socketio.emit('server_message', {'type': 'success', 'text': success_message})
                 # Trigger a status update
-                socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+                socketio.start_background_task(target=refresh_mpd_status)
                 
                 if request.is_json:
                     return jsonify({'status': 'success', 'message': success_message})
@@ -4237,15 +4798,10 @@ def clear_and_add_album():
                     return redirect(url_for('index'))
             
             # Add all songs to playlist
-            added_count = 0
-            for song in songs:
-                file_path = song.get('file')
-                if file_path:
-                    try:
-                        client.add(file_path)
-                        added_count += 1
-                    except CommandError as e:
-                        print(f"Error adding {file_path}: {e}")
+            result = add_uris_batched(client, [song.get('file') for song in songs])
+            added_count = result['added']
+            for file_path, error in result['failed']:
+                print(f"Error adding {file_path}: {error}")
             
             # Start playing the first song if songs were added
             if added_count > 0:
@@ -4261,7 +4817,7 @@ def clear_and_add_album():
                 disc_text = f" (Disc {disc_number})" if disc_number else ""
                 socketio.emit('server_message', {'type': 'success', 'text': f'Playlist cleared and added {added_count} songs from "{album}"{disc_text} by {artist}. Now playing!'})
                 # Trigger a status update
-                socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+                socketio.start_background_task(target=refresh_mpd_status)
                 
                 if request.is_json:
                     return jsonify({'status': 'success', 'message': f'Playlist replaced with {added_count} songs from album and started playing', 'tracks_cleared': tracks_cleared})
@@ -4395,7 +4951,7 @@ def add_song_to_playlist():
             print(f"[DEBUG] Successfully added song to playlist: {file_path}")
             socketio.emit('server_message', {'type': 'info', 'text': 'Song added to playlist.'})
             # Trigger a status update
-            socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+            socketio.start_background_task(target=refresh_mpd_status)
             
             if request.is_json or request.headers.get('Content-Type') == 'application/x-www-form-urlencoded':
                 return jsonify({'status': 'success', 'message': 'Song added to playlist'}), 200
@@ -4421,20 +4977,19 @@ def add_song_to_playlist():
         return redirect(url_for('index'))
 
 def get_mpd_playlist():
-    """Fetches the current MPD playlist."""
+    """Fetches the current MPD playlist from the queue mirror (synced incrementally)."""
     client = connect_mpd_client()
     if not client:
         return []
     try:
-        playlist = client.playlistinfo()
-        client.disconnect()
-        # Add a 'pos' (position) to each song for easier removal and playing
-        for i, song in enumerate(playlist):
-            song['pos'] = i
-        return playlist
+        mpd_queue.sync(client)
+        # Each song carries its 'pos' (position) for easier removal and playing
+        return mpd_queue.playlist()
     except Exception as e:
         print(f"Error fetching playlist: {e}")
         return []
+    finally:
+        client.disconnect()
 
 @app.route('/playlist')
 def playlist_page():
@@ -4879,6 +5434,8 @@ def toggle_auto_fill():
     
     if isinstance(new_state, bool):
         auto_fill_active = new_state
+        if auto_fill_active:
+            auto_fill_trigger.poke()
         status_text = "enabled" if auto_fill_active else "disabled"
         socketio.emit('server_message', {'type': 'info', 'text': f'Auto-fill has been {status_text}.'})
         # Emit updated auto-fill status to all clients
@@ -4902,6 +5459,8 @@ def set_auto_fill_settings():
         auto_fill_num_tracks_min = int(data.get('num_tracks_min', auto_fill_num_tracks_min))
         auto_fill_num_tracks_max = int(data.get('num_tracks_max', auto_fill_num_tracks_max))
         auto_fill_genre_filter_enabled = bool(data.get('genre_filter_enabled', auto_fill_genre_filter_enabled))
+        # The queue may already be below a raised threshold
+        auto_fill_trigger.poke()
 
         socketio.emit('server_message', {'type': 'info', 'text': 'Auto-fill settings updated.'})
         # Emit updated auto-fill status to all clients
@@ -4959,9 +5518,8 @@ def move_track():
         return jsonify({'status': 'error', 'message': 'Could not connect to MPD'}), 500
     
     try:
-        # Get playlist length to validate boundaries
-        playlist = client.playlistinfo()
-        playlist_length = len(playlist)
+        # Get playlist length to validate boundaries (status is enough, no need for the whole queue)
+        playlist_length = int(client.status().get('playlistlength', 0))
         
         # Check if moving to specific position (drag-and-drop) or by direction (up/down buttons)
         if 'to' in data:
@@ -5069,8 +5627,9 @@ def save_playlist():
         return jsonify({'status': 'error', 'message': 'Could not connect to MPD'}), 500
     
     try:
-        playlist_songs = client.playlistinfo()
+        mpd_queue.sync(client)
         client.disconnect()
+        playlist_songs = mpd_queue.playlist()
         
         if not playlist_songs:
             return jsonify({'status': 'error', 'message': 'Current playlist is empty'}), 400
@@ -5154,23 +5713,17 @@ def load_playlist():
         # Clear current playlist
         client.clear()
         
-        # Read M3U file and add songs
-        songs_added = 0
-        songs_failed = 0
+        # Read M3U file (skipping comments and empty lines)
         with open(playlist_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                # Skip comments and empty lines
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Add song to MPD playlist
-                try:
-                    client.add(line)
-                    songs_added += 1
-                except CommandError as e:
-                    print(f"Failed to add song '{line}': {e}")
-                    songs_failed += 1
+            entries = [line.strip() for line in f]
+        entries = [line for line in entries if line and not line.startswith('#')]
+        
+        # Add songs to MPD playlist in command lists
+        result = add_uris_batched(client, entries)
+        songs_added = result['added']
+        songs_failed = len(result['failed'])
+        for line, error in result['failed']:
+            print(f"Failed to add song '{line}': {error}")
         
         client.disconnect()
         
@@ -5233,7 +5786,7 @@ def play_song_at_pos():
         client.disconnect()
         socketio.emit('server_message', {'type': 'info', 'text': f'Playing song at position {pos+1}.'})
         # Trigger a status update on the main page after playing a song
-        socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+        socketio.start_background_task(target=refresh_mpd_status)
         return jsonify({'status': 'success', 'message': 'Playing song'})
     except CommandError as e:
         print(f"MPD CommandError playing song at {pos}: {e}")
@@ -5260,7 +5813,7 @@ def toggle_consume_mode():
         status_text = "enabled" if new_state else "disabled"
         socketio.emit('server_message', {'type': 'info', 'text': f'MPD consume mode has been {status_text}.'})
         # Immediately send updated status to reflect the change
-        socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+        socketio.start_background_task(target=refresh_mpd_status)
         return jsonify({'status': 'success', 'message': f'Consume mode {status_text}'})
     except CommandError as e:
         print(f"MPD CommandError toggling consume mode: {e}")
@@ -5287,7 +5840,7 @@ def toggle_shuffle_mode():
         status_text = "enabled" if new_state else "disabled"
         socketio.emit('server_message', {'type': 'info', 'text': f'MPD shuffle mode has been {status_text}.'})
         # Immediately send updated status to reflect the change
-        socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+        socketio.start_background_task(target=refresh_mpd_status)
         return jsonify({'status': 'success', 'message': f'Shuffle mode {status_text}'})
     except CommandError as e:
         print(f"MPD CommandError toggling shuffle mode: {e}")
@@ -5316,7 +5869,7 @@ def toggle_crossfade():
         status_text = f"enabled ({crossfade_seconds}s)" if new_state else "disabled"
         socketio.emit('server_message', {'type': 'info', 'text': f'MPD crossfade has been {status_text}.'})
         # Immediately send updated status to reflect the change
-        socketio.start_background_task(target=lambda: socketio.emit('mpd_status', get_mpd_status_for_display()))
+        socketio.start_background_task(target=refresh_mpd_status)
         return jsonify({'status': 'success', 'message': f'Crossfade {status_text}'})
     except CommandError as e:
         print(f"MPD CommandError toggling crossfade: {e}")
@@ -5328,25 +5881,14 @@ def toggle_crossfade():
 @app.route('/get_mpd_status')
 def get_mpd_status():
     """API endpoint to get current MPD status."""
-    status = get_mpd_status_for_display()
+    # Clients poll this right after issuing commands, so always rebuild
+    status = get_mpd_status_for_display(max_staleness=0)
     response = make_response(jsonify(status))
     # Disable caching to ensure fresh playlist data
     response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
     response.headers['Pragma'] = 'no-cache'
     response.headers['Expires'] = '0'
-    
-    if status:
-        return response
-    return make_response(jsonify(last_mpd_status if last_mpd_status else {
-        'state': 'unknown', 
-        'message': 'No status available', 
-        'volume': 0, 
-        'queue_length': 0, 
-        'consume_mode': False,
-        'shuffle_mode': False,
-        'crossfade_enabled': False,
-        'crossfade_seconds': 0
-    }))
+    return response
 
 @app.route('/recent_albums')
 def recent_albums():
@@ -5385,22 +5927,42 @@ def list_music_directories():
     app_ctx = {}
     return list_music_directories_handler(app_ctx)
 
-def get_recent_albums_from_mpd(limit=50, force_refresh=False):
+_mpd_music_dir = None
+_recent_dirs_cache = (None, ())
+
+def mpd_music_directory():
+    """MPD's music_directory from /etc/mpd.conf (read once), default /media/music."""
+    global _mpd_music_dir
+    if _mpd_music_dir is None:
+        _mpd_music_dir = '/media/music'
+        try:
+            with open('/etc/mpd.conf', 'r') as f:
+                for line in f:
+                    if line.strip().startswith('music_directory') and not line.strip().startswith('#'):
+                        _mpd_music_dir = line.split('"')[1]
+                        break
+        except Exception:
+            pass
+    return _mpd_music_dir
+
+def recent_album_directories():
     """
-    Get recently added albums from configured directories in settings.json.
-    This is much faster and more accurate than scanning the entire database.
-    Uses smart caching to avoid rescanning when directories haven't changed.
+    Recent-albums directories from settings.json as MPD-relative paths.
+    Re-parsed only when settings.json changes.
     """
-    import time
-    global recent_albums_cache, recent_albums_cache_mod_times
+    global _recent_dirs_cache
+    try:
+        stamp = os.path.getmtime(SETTINGS_FILE)
+    except OSError:
+        stamp = None
+    if stamp is not None and _recent_dirs_cache[0] == stamp:
+        return _recent_dirs_cache[1]
     
-    # Get directories from settings
-    settings = load_settings()
-    recent_dirs = settings.get('recent_albums_dir', 'ripped')
+    recent_dirs = load_settings().get('recent_albums_dir', 'ripped')
     
     # Parse comma-separated directories and convert to MPD relative paths
     if isinstance(recent_dirs, str):
-        directories_to_check = []
+        directories = []
         for d in recent_dirs.split(','):
             d = d.strip()
             if not d:
@@ -5408,18 +5970,7 @@ def get_recent_albums_from_mpd(limit=50, force_refresh=False):
             
             # If absolute path, convert to relative (MPD-compatible)
             if d.startswith('/'):
-                # Try to get MPD's music directory
-                mpd_music_dir = '/media/music'  # default
-                try:
-                    with open('/etc/mpd.conf', 'r') as f:
-                        for line in f:
-                            if line.strip().startswith('music_directory') and not line.strip().startswith('#'):
-                                mpd_music_dir = line.split('"')[1]
-                                break
-                except:
-                    pass
-                
-                # Convert absolute to relative
+                mpd_music_dir = mpd_music_directory()
                 if d.startswith(mpd_music_dir + '/'):
                     d = d[len(mpd_music_dir)+1:]  # Remove music_dir prefix
                 elif d.startswith(mpd_music_dir):
@@ -5427,12 +5978,29 @@ def get_recent_albums_from_mpd(limit=50, force_refresh=False):
                 # else: keep as-is, maybe it's already relative or a different mount
             
             if d:
-                directories_to_check.append(d)
+                directories.append(d)
     else:
-        directories_to_check = ['ripped']  # fallback default
+        directories = []
+    
+    directories = tuple(directories) or ('ripped',)  # ensure we have at least one directory
+    _recent_dirs_cache = (stamp, directories)
+    return directories
+
+def get_recent_albums_from_mpd(limit=50, force_refresh=False):
+    """
+    Get recently added albums from configured directories in settings.json.
+    Served from the recent albums index (compact summaries ordered by last-modified)
+    while the library index is loaded; otherwise the directories are scanned.
+    """
+    import time
+    global recent_albums_cache, recent_albums_cache_mod_times
+    
+    directories_to_check = list(recent_album_directories())
     
-    if not directories_to_check:
-        directories_to_check = ['ripped']  # ensure we have at least one directory
+    if library_index.loaded:
+        if force_refresh:
+            recent_albums_index.invalidate()
+        return recent_albums_index.recent(limit, directories_to_check)
     
     print(f"Checking recent albums from directories: {directories_to_check}")
     
@@ -5623,7 +6191,6 @@ def get_recent_albums_from_mpd(limit=50, force_refresh=False):
                 'duration': total_duration,
                 'duration_formatted': duration_formatted,
                 'sample_file': album_data['sample_file'],
-                'songs': album_data['songs'],  # All songs for the album
                 'disc_structure': disc_structure if disc_structure else None,  # Disc organization
                 'is_multi_disc': bool(disc_structure and len(disc_structure) > 1)  # Flag for multi-disc
             }
@@ -5663,9 +6230,7 @@ def get_recent_albums_from_mpd(limit=50, force_refresh=False):
 def test_connect():
     print('Client connected')
     # When a client connects, send them the current MPD status immediately
-    status = get_mpd_status_for_display()
-    if status:
-        emit('mpd_status', status)
+    emit('mpd_status', get_mpd_status_for_display())
     # Also send auto-fill status to new connections
     emit('auto_fill_status', {
         'active': auto_fill_active,
@@ -5707,9 +6272,20 @@ def bandcamp_page():
 # --- Browse Database API Endpoints ---
 @app.route('/api/browse/genres', methods=['GET'])
 def api_browse_genres():
-    """Return all genres - simple fast version without counting."""
+    """Return all genres with artist/album/track counts and playtime.
+
+    Counts come precomputed from the library index; before it has loaded the
+    genres are listed from MPD without counts.
+    """
     print("[DEBUG] /api/browse/genres called", flush=True)
     
+    if library_index.loaded:
+        genre_stats = library_index.genre_stats()
+        genre_data = [dict(genre_stats.get(genre, {}), name=genre)
+                      for genre in library_index.genres() if genre.strip()]
+        return jsonify({'status': 'success', 'genres': genre_data, 'count': len(genre_data),
+                        'db_update': library_index.db_update})
+    
     client = connect_mpd_client()
     if not client:
         print("[DEBUG] Could not connect to MPD")
@@ -5971,16 +6547,16 @@ def api_browse_artists():
     if not genre:
         return jsonify({'status': 'error', 'message': 'Missing genre parameter'}), 400
 
-    client = connect_mpd_client()
-    if not client:
+    client = None if library_index.loaded else connect_mpd_client()
+    if not library_index.loaded and not client:
         return jsonify({'status': 'error', 'message': 'Could not connect to MPD'}), 500
 
     try:
-        # Get all songs for this genre first
-        all_songs = client.find('genre', genre)
+        # Served from the library index tree when loaded (no MPD round-trip)
+        all_songs = [] if client is None else client.find('genre', genre)
         print(f"[DEBUG] Found {len(all_songs)} songs for genre '{genre}'", flush=True)
         
-        artist_albums = {}  # artist_name -> set of albums
+        artist_albums = library_index.artists(genre) if client is None else {}  # artist_name -> set of albums
         
         for song in all_songs:
             # Prefer AlbumArtist over Artist for each song
@@ -6038,13 +6614,15 @@ def api_browse_artists():
             
         artist_data.sort(key=sort_key_ignore_the)
         
-        client.disconnect()
+        if client:
+            client.disconnect()
         print(f"[DEBUG] Returning {len(artist_data)} artists", flush=True)
         return jsonify({'status': 'success', 'artists': artist_data, 'count': len(artist_data)})
         
     except Exception as e:
         try:
-            client.disconnect()
+            if client:
+                client.disconnect()
         except Exception:
             pass
         print(f"[DEBUG] Exception in /api/browse/artists: {e}", flush=True)
@@ -6060,105 +6638,21 @@ def api_browse_albums():
     if not artist:
         return jsonify({'status': 'error', 'message': 'Missing artist parameter'}), 400
 
-    client = connect_mpd_client()
+    client = connect_library_client()
     if not client:
         return jsonify({'status': 'error', 'message': 'Could not connect to MPD'}), 500
 
     try:
-        # If genre is specified, filter by it
-        if genre:
-            # Get albums by AlbumArtist AND genre
-            try:
-                albums_by_albumartist = client.list('album', 'albumartist', artist, 'genre', genre)
-                print(f"[DEBUG] Found {len(albums_by_albumartist)} albums by AlbumArtist for '{artist}' in genre '{genre}'", flush=True)
-            except:
-                albums_by_albumartist = []
-            
-            # Get albums by Artist AND genre
-            albums_by_artist = client.list('album', 'artist', artist, 'genre', genre)
-            print(f"[DEBUG] Found {len(albums_by_artist)} albums by Artist for '{artist}' in genre '{genre}'", flush=True)
+        # Two finds (AlbumArtist, Artist) grouped into (album, directory) rows, memoized
+        # until the database changes; the index version avoids asking MPD for db_update
+        if library_index.loaded:
+            version = ('index', library_index.version)
         else:
-            # No genre filter - get all albums for this artist
-            try:
-                albums_by_albumartist = client.list('album', 'albumartist', artist)
-                print(f"[DEBUG] Found {len(albums_by_albumartist)} albums by AlbumArtist for '{artist}'", flush=True)
-            except:
-                albums_by_albumartist = []
-            
-            # Get albums by regular artist tag
-            albums_by_artist = client.list('album', 'artist', artist)
-            print(f"[DEBUG] Found {len(albums_by_artist)} albums by Artist for '{artist}'", flush=True)
-        
-        # Combine and deduplicate albums
-        all_albums_raw = albums_by_albumartist + albums_by_artist
-        all_albums = []
-        seen_albums = set()
-        
-        for album_item in all_albums_raw:
-            # Handle both string and dict responses from MPD
-            if isinstance(album_item, dict):
-                album_name = album_item.get('album', '')
-            else:
-                album_name = album_item
-            
-            # Only add if we haven't seen this album name before
-            if album_name and album_name.lower() not in seen_albums:
-                all_albums.append(album_name)
-                seen_albums.add(album_name.lower())
-                
-        print(f"[DEBUG] Total unique albums: {len(all_albums)}", flush=True)
-        
-        # Group albums by directory to show each physical copy separately (like search does)
-        album_data = []
-        for album in all_albums:
-            if not album or str(album).strip() == '':
-                continue
-                
-            try:
-                # For each album, check if it should use AlbumArtist or Artist
-                # First try to find songs by AlbumArtist
-                songs_by_albumartist = []
-                try:
-                    songs_by_albumartist = client.find('albumartist', artist, 'album', album)
-                except:
-                    pass
-                    
-                # If no songs found by AlbumArtist, try by Artist
-                if not songs_by_albumartist:
-                    songs = client.find('artist', artist, 'album', album)
-                else:
-                    songs = songs_by_albumartist
-                
-                # Group songs by directory to handle multiple physical copies
-                albums_by_dir = {}
-                for song in songs:
-                    song_file = song.get('file', '')
-                    album_dir = os.path.dirname(song_file) if song_file else ''
-                    
-                    if album_dir not in albums_by_dir:
-                        albums_by_dir[album_dir] = {
-                            'songs': [],
-                            'date': song.get('date', ''),
-                            'sample_file': song_file
-                        }
-                    albums_by_dir[album_dir]['songs'].append(song)
-                
-                # Add an entry for each directory (each physical copy)
-                for album_dir, dir_data in albums_by_dir.items():
-                    album_data.append({
-                        'album': str(album),
-                        'artist': str(artist),
-                        'track_count': len(dir_data['songs']),
-                        'date': str(dir_data['date']),
-                        'sample_file': str(dir_data['sample_file'])
-                    })
-                    
-            except Exception as e:
-                print(f"[DEBUG] Error getting info for album '{album}': {e}")
-                continue
-        
-        # Sort by album name
-        album_data.sort(key=lambda x: x['album'].lower())
+            db_update = client.stats().get('db_update')
+            version = ('mpd', db_update) if db_update else None
+        album_data = artist_albums_cache.get(client, artist, genre, version)
+        print(f"[DEBUG] {len(album_data)} album entries for '{artist}'" +
+              (f" in genre '{genre}'" if genre else ""), flush=True)
         
         client.disconnect()
         return jsonify({'status': 'success', 'albums': album_data, 'count': len(album_data)})
@@ -6191,16 +6685,21 @@ def api_album_tracks():
         print("[DEBUG] Missing album parameter")
         return jsonify({'status': 'error', 'message': 'Missing album parameter'}), 400
 
-    client = connect_mpd_client()
+    client = connect_library_client()
     if not client:
         print("[DEBUG] Could not connect to MPD")
         return jsonify({'status': 'error', 'message': 'Could not connect to MPD'}), 500
 
     try:
         tracks = []
-        
-        # If artist specified, use multi-strategy fallback (like Add Album does)
-        if artist:
+        if library_index.loaded:
+            # Normalized album keys in the library index, already in disc/track order
+            tracks = library_index.resolve_album(artist, album)
+            print(f"[DEBUG] Album resolver matched {len(tracks)} tracks", flush=True)
+        resolved = bool(tracks)
+        
+        # On a resolver miss with an artist, use multi-strategy fallback (like Add Album does)
+        if not resolved and artist:
             # Strategy 1: Try albumartist first (catches VA albums!)
             try:
                 tracks = client.find('albumartist', artist, 'album', album)
@@ -6242,7 +6741,7 @@ def api_album_tracks():
                                 print(f"[DEBUG] Fuzzy search matched {len(tracks)} tracks (partial)", flush=True)
                 except Exception as e:
                     print(f"[DEBUG] Fuzzy fallback error: {e}", flush=True)
-        else:
+        elif not resolved:
             # No artist specified, search by album only
             try:
                 tracks = client.find('album', album)
@@ -6278,7 +6777,8 @@ def api_album_tracks():
             except (ValueError, AttributeError):
                 return 0
         
-        tracks.sort(key=get_track_number)
+        if not resolved:
+            tracks.sort(key=get_track_number)
         
         # Only return relevant fields
         track_list = []
@@ -6332,10 +6832,21 @@ def api_album_tracks():
 def on_connect():
     """Handle client connection."""
     print(f"Client connected: {request.sid}")
+    # Until the client asks for deltas it receives the full status on every change
+    join_room(MPD_STATUS_FULL_ROOM)
     # Send current status immediately upon connection
-    status = get_mpd_status_for_display()
-    if status:
-        emit('mpd_status', status)
+    emit('mpd_status', get_mpd_status_for_display())
+
+@socketio.on('status_subscribe')
+def on_status_subscribe(data):
+    """Switch a client to delta-encoded status updates (also used to resync)."""
+    if not (data or {}).get('delta'):
+        return
+    leave_room(MPD_STATUS_FULL_ROOM)
+    join_room(MPD_STATUS_DELTA_ROOM)
+    message = mpd_status_encoder.full(get_mpd_status_for_display(), mpd_status_snapshot.updated_at)
+    if message:
+        emit('mpd_status_delta', message)
 
 @socketio.on('disconnect')
 def on_disconnect():
@@ -6707,8 +7218,9 @@ def api_export_queue():
             return jsonify({'status': 'error', 'message': 'Could not connect to MPD'}), 500
         
         try:
-            queue = client.playlistinfo()
+            mpd_queue.sync(client)
             client.disconnect()
+            queue = mpd_queue.playlist()
         except Exception as e:
             return jsonify({'status': 'error', 'message': f'Error getting playlist: {str(e)}'}), 500
         
@@ -6928,9 +7440,18 @@ if __name__ == '__main__':
         except Exception as e:
             print(f"[WARN] Export cleanup failed: {e}")
     
-    # Start background monitoring threads
-    socketio.start_background_task(target=mpd_status_monitor)
-    socketio.start_background_task(target=auto_fill_monitor)
+    # Exit normally on SIGTERM (systemd stop) so atexit handlers save state
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    # Start background monitoring (coroutines on one event loop when available)
+    mpd_idle_watcher.start()
+    if MPD_ASYNCIO and async_mpd.start():
+        print("[INFO] Background MPD tasks running on the asyncio event loop")
+        async_mpd.spawn(mpd_status_monitor_async())
+        async_mpd.spawn(auto_fill_monitor_async())
+    else:
+        socketio.start_background_task(target=mpd_status_monitor)
+        socketio.start_background_task(target=auto_fill_monitor)
     
     # Start background export cleanup thread (runs every 6 hours)
     def export_cleanup_monitor():
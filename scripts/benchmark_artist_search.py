@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark the artist branch of the built-in search: the old list() + find()
+per album against the single grouped find() in services/search_service.py.
+
+Against a real server:
+    python scripts/benchmark_artist_search.py --host localhost --artist "Miles Davis"
+
+Without MPD, a synthetic library with a simulated round-trip time is used:
+    python scripts/benchmark_artist_search.py --albums 80 --latency 2
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.library_index import LibraryIndex  # noqa: E402
+from services.search_service import artist_albums  # noqa: E402
+
+
+class CountingClient:
+    """Wrap a client, counting queries and adding a fixed delay to each."""
+    
+    def __init__(self, client, latency=0.0):
+        self._client = client
+        self._latency = latency
+        self.queries = 0
+    
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+        
+        def call(*args):
+            self.queries += 1
+            if self._latency:
+                time.sleep(self._latency)
+            return method(*args)
+        return call
+
+
+def legacy_artist_albums(client, artist):
+    """The previous implementation: one list() plus one find() per album."""
+    albums = {}
+    for album_name in client.list('album', 'artist', artist):
+        if isinstance(album_name, dict):
+            album_name = album_name.get('album', '')
+        if not album_name:
+            continue
+        songs = client.find('artist', artist, 'album', album_name)
+        if songs:
+            song_file = songs[0].get('file', '')
+            album_dir = os.path.dirname(song_file) if song_file else ''
+            albums.setdefault(f"{artist}|||{album_name}|||{album_dir}", {
+                'item_type': 'album',
+                'artist': artist,
+                'album': album_name,
+                'genre': songs[0].get('genre', 'Unknown Genre'),
+                'track_count': len(songs),
+                'sample_file': song_file,
+            })
+    return list(albums.values())
+
+
+def synthetic_client(albums, tracks):
+    """A LibraryReader over a generated library with one artist."""
+    songs = [{'file': f'Artist/Album {a:03d}/{t:02d}.flac', 'artist': 'Artist',
+              'album': f'Album {a:03d}', 'title': f'Track {t}', 'genre': 'Jazz'}
+             for a in range(albums) for t in range(1, tracks + 1)]
+    index = LibraryIndex()
+    index.load(songs)
+    return index.reader()
+
+
+def measure(label, search, client, artist, runs):
+    """Run one implementation and print queries per search and mean latency."""
+    started = time.perf_counter()
+    for _ in range(runs):
+        rows = search(client, artist)
+    elapsed = (time.perf_counter() - started) / runs
+    print(f"{label:>8}: {len(rows)} albums, {client.queries // runs} queries, {elapsed * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', help='MPD host (omit for the synthetic library)')
+    parser.add_argument('--port', type=int, default=6600)
+    parser.add_argument('--artist', default='Artist')
+    parser.add_argument('--albums', type=int, default=80, help='synthetic library: albums by the artist')
+    parser.add_argument('--tracks', type=int, default=10, help='synthetic library: tracks per album')
+    parser.add_argument('--latency', type=float, default=1.0, help='synthetic library: ms per query')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    
+    if args.host:
+        from mpd import MPDClient
+        raw = MPDClient()
+        raw.connect(args.host, args.port)
+        latency = 0.0
+    else:
+        raw = synthetic_client(args.albums, args.tracks)
+        latency = args.latency / 1000
+    
+    for label, search in (('before', legacy_artist_albums), ('after', artist_albums)):
+        measure(label, search, CountingClient(raw, latency), args.artist, args.runs)
+    
+    if args.host:
+        raw.disconnect()
+
+
+if __name__ == '__main__':
+    main()
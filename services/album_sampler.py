@@ -0,0 +1,147 @@
+"""
+AlbumSampler - random album shelves straight from the library index
+
+Picks random albums from LibraryIndex.album_table() without any MPD queries:
+- Albums are identified by (albumartist, album, directory), so same-named
+  albums by different artists are never merged
+- Optional genre and decade filters use buckets built once per index version
+- A per-session no-repeat window keeps consecutive shelves fresh
+"""
+
+import logging
+import random
+import threading
+from collections import OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+# Albums remembered per session and kept off the next shelves
+NO_REPEAT_WINDOW = 200
+
+# Sessions whose recent picks are tracked (least recently used are dropped)
+MAX_SESSIONS = 256
+
+
+class AlbumSampler:
+    """Thread-safe random album picker over a LibraryIndex."""
+    
+    def __init__(self, index, window=NO_REPEAT_WINDOW, max_sessions=MAX_SESSIONS, rng=None):
+        """
+        Initialize the sampler.
+        
+        Args:
+            index (LibraryIndex): Loaded library index to sample from
+            window (int): Albums per session excluded from later picks. Default: 200
+            max_sessions (int): Sessions remembered at once. Default: 256
+            rng (random.Random): Random source (for tests). Default: module random
+        """
+        self._index = index
+        self.window = window
+        self.max_sessions = max_sessions
+        self._random = rng or random
+        self._lock = threading.Lock()
+        self._version = None
+        self._albums = ()
+        self._by_genre = {}
+        self._by_decade = {}
+        self._recent = OrderedDict()
+        self._stats = {'samples': 0, 'rebuilds': 0}
+    
+    def _refresh(self):
+        """Rebuild the filter buckets when the index has been reloaded (lock held)."""
+        version = self._index.version
+        if version == self._version:
+            return
+        albums = self._index.album_table()
+        by_genre = {}
+        by_decade = {}
+        for position, album in enumerate(albums):
+            for genre in album.genres:
+                by_genre.setdefault(genre.lower(), []).append(position)
+            if album.year is not None:
+                by_decade.setdefault(album.year // 10 * 10, []).append(position)
+        self._albums = albums
+        self._by_genre = by_genre
+        self._by_decade = by_decade
+        self._version = version
+        # Positions refer to the old table
+        self._recent.clear()
+        self._stats['rebuilds'] += 1
+    
+    def _candidates(self, genre, decade):
+        """Album positions matching the filters (lock held)."""
+        pools = []
+        if genre:
+            pools.append(self._by_genre.get(genre.lower(), []))
+        if decade is not None:
+            pools.append(self._by_decade.get(decade // 10 * 10, []))
+        if not pools:
+            return range(len(self._albums))
+        if len(pools) == 1:
+            return pools[0]
+        smallest, other = sorted(pools, key=len)
+        other = set(other)
+        return [position for position in smallest if position in other]
+    
+    def sample(self, count=25, genre=None, decade=None, session_id=None):
+        """
+        Pick random albums.
+        
+        Args:
+            count (int): Albums wanted. Default: 25
+            genre (str): Only albums with this genre (case-insensitive)
+            decade (int): Only albums from this decade, e.g. 1990 (any year in it works)
+            session_id (str): Session whose recent picks are avoided and extended
+        
+        Returns:
+            list: Album dicts (see LibraryAlbum.as_dict), at most count
+        """
+        with self._lock:
+            self._refresh()
+            candidates = self._candidates(genre, decade)
+            if not candidates or count <= 0:
+                return []
+            recent = self._session(session_id) if session_id else None
+            
+            # Over-draw by the window so excluded albums can be skipped without a scan
+            extra = len(recent) if recent is not None else 0
+            drawn = self._random.sample(candidates, min(len(candidates), count + extra))
+            if recent is not None:
+                seen = set(recent)
+                fresh = [position for position in drawn if position not in seen]
+                # Small pools: fall back to repeats rather than a short shelf
+                picks = (fresh + [position for position in drawn if position in seen])[:count]
+                recent.extend(picks)
+            else:
+                picks = drawn[:count]
+            self._stats['samples'] += 1
+            return [self._albums[position].as_dict() for position in picks]
+    
+    def _session(self, session_id):
+        """Get (creating) a session's recent-picks deque, evicting the oldest session (lock held)."""
+        recent = self._recent.get(session_id)
+        if recent is None:
+            recent = self._recent[session_id] = deque(maxlen=self.window)
+            while len(self._recent) > self.max_sessions:
+                self._recent.popitem(last=False)
+        else:
+            self._recent.move_to_end(session_id)
+        return recent
+    
+    def decades(self):
+        """Get the decades present in the library (sorted)."""
+        with self._lock:
+            self._refresh()
+            return sorted(self._by_decade)
+    
+    def stats(self):
+        """Get sampling counters plus table sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'albums': len(self._albums),
+                'genres': len(self._by_genre),
+                'decades': len(self._by_decade),
+                'sessions': len(self._recent),
+            })
+            return stats
@@ -0,0 +1,171 @@
+"""
+Artist Albums - the album list behind artist pages, from two queries
+
+/api/browse/albums used to list an artist's album names and then run one or
+two find() calls per album to group its songs by directory. Here the artist's
+songs are fetched once by AlbumArtist and once by Artist and bucketed into
+(album, directory) rows in memory. Results are memoized per
+(artist, genre, database version), so repeat visits cost no MPD queries.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Artist pages remembered at once (least recently used are dropped)
+MAX_CACHED_ARTISTS = 256
+
+
+def _values(value):
+    """Individual values of a possibly multi-valued tag."""
+    if isinstance(value, list):
+        return value
+    return [value] if value else []
+
+
+def _by_album(songs):
+    """Bucket songs by album name, keeping first-seen album order."""
+    albums = {}
+    for song in songs:
+        for album in _values(song.get('album')):
+            albums.setdefault(album, []).append(song)
+    return albums
+
+
+def group_artist_albums(artist, albumartist_songs, artist_songs, genre=None):
+    """
+    Build album rows, one per (album, directory).
+    
+    Each album uses its AlbumArtist songs when there are any, otherwise its
+    Artist songs. With a genre, only albums having a song in that genre are
+    kept, but their track counts still cover the whole album.
+    
+    Args:
+        artist (str): Artist the page is for
+        albumartist_songs (list): Songs from find('albumartist', artist)
+        artist_songs (list): Songs from find('artist', artist)
+        genre (str): Optional exact genre filter
+    
+    Returns:
+        list: Rows {'album', 'artist', 'track_count', 'date', 'sample_file'}
+            sorted by album name (case-insensitive)
+    """
+    by_albumartist = _by_album(albumartist_songs)
+    by_artist = _by_album(artist_songs)
+    
+    album_data = []
+    for album in list(by_albumartist) + [name for name in by_artist if name not in by_albumartist]:
+        if not str(album).strip():
+            continue
+        if genre:
+            candidates = by_albumartist.get(album, []) + by_artist.get(album, [])
+            if not any(genre in _values(song.get('genre')) for song in candidates):
+                continue
+        songs = by_albumartist.get(album) or by_artist[album]
+        
+        # One row per directory so each physical copy shows separately
+        albums_by_dir = {}
+        for song in songs:
+            song_file = song.get('file', '')
+            album_dir = os.path.dirname(song_file) if song_file else ''
+            if album_dir not in albums_by_dir:
+                albums_by_dir[album_dir] = {'count': 0, 'date': song.get('date', ''), 'sample_file': song_file}
+            albums_by_dir[album_dir]['count'] += 1
+        
+        for dir_data in albums_by_dir.values():
+            album_data.append({
+                'album': str(album),
+                'artist': str(artist),
+                'track_count': dir_data['count'],
+                'date': str(dir_data['date']),
+                'sample_file': str(dir_data['sample_file'])
+            })
+    
+    album_data.sort(key=lambda x: x['album'].lower())
+    return album_data
+
+
+def fetch_artist_albums(client, artist, genre=None):
+    """
+    Query an artist's songs (two finds) and group them into album rows.
+    
+    Args:
+        client: MPD client or LibraryReader
+        artist (str): Exact artist name
+        genre (str): Optional exact genre filter
+    
+    Returns:
+        list: Rows as returned by group_artist_albums()
+    """
+    try:
+        albumartist_songs = client.find('albumartist', artist)
+    except Exception as e:
+        logger.debug(f"AlbumArtist find failed for '{artist}': {e}")
+        albumartist_songs = []
+    artist_songs = client.find('artist', artist)
+    return group_artist_albums(artist, albumartist_songs, artist_songs, genre)
+
+
+class ArtistAlbumsCache:
+    """Thread-safe LRU memo of fetch_artist_albums() per database version."""
+    
+    def __init__(self, max_entries=MAX_CACHED_ARTISTS):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries (int): Artist/genre pages kept. Default: 256
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0}
+    
+    def get(self, client, artist, genre, version):
+        """
+        Get an artist's album rows, querying only on a miss.
+        
+        Args:
+            client: MPD client or LibraryReader used on a miss
+            artist (str): Exact artist name
+            genre (str): Optional genre filter ('' or None for all)
+            version: Database version (library index version or MPD db_update);
+                entries from other versions are never returned. None bypasses the cache.
+        
+        Returns:
+            list: Album rows (shared between callers, treat as read-only)
+        """
+        if version is None:
+            return fetch_artist_albums(client, artist, genre or None)
+        key = (artist, genre or '', version)
+        with self._lock:
+            rows = self._entries.get(key)
+            if rows is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return rows
+            self._stats['misses'] += 1
+        
+        rows = fetch_artist_albums(client, artist, genre or None)
+        
+        with self._lock:
+            self._entries[key] = rows
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return rows
+    
+    def clear(self):
+        """Drop every cached page."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        """Get hit/miss counters and the number of cached pages."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            return stats
@@ -0,0 +1,419 @@
+"""
+AsyncMPDService - asyncio MPD client for background work
+
+Runs python-mpd2's asyncio client on a single event-loop thread so long-running
+background jobs (status monitor, auto-fill, genre station fill) can run as
+coroutines instead of holding one OS thread each. Provides:
+- execute(): MPD commands as coroutines over one shared connection,
+  reconnecting transparently when it drops (queue-changing commands are
+  not resent, since MPD may already have applied them)
+- add_many(): bulk queue additions as command lists on a pooled synchronous
+  client (mpd.asyncio has no command-list support)
+- spawn()/submit(): schedule coroutines from any thread
+- run_blocking(): push unavoidable blocking calls (HTTP, sync helpers) onto a
+  small bounded executor
+- signal()/wait_signal(): thread-safe wakeups for coroutines
+- facade(): synchronous client-like object for Flask handlers
+
+mpd.asyncio ships with python-mpd2 >= 1.0; when it is missing `ASYNCIO_AVAILABLE`
+is False and callers should keep using their thread-based paths.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from mpd import ConnectionError
+
+from services.mpd_service import add_uris_batched
+
+try:
+    from mpd.asyncio import MPDClient as AsyncMPDClient
+    ASYNCIO_AVAILABLE = True
+except ImportError:
+    AsyncMPDClient = None
+    ASYNCIO_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the shared connection is dropped and re-established
+_RECONNECT_ERRORS = (ConnectionError, ConnectionResetError, BrokenPipeError, OSError, EOFError)
+
+# Commands that change the queue or stored playlists: a lost reply does not mean
+# MPD did not apply them, so they are never resent after a reconnect
+_NO_RETRY_COMMANDS = frozenset({
+    'add', 'addid', 'clear', 'delete', 'deleteid', 'move', 'moveid', 'swap', 'swapid',
+    'shuffle', 'load', 'save', 'rm', 'rename', 'playlistadd', 'playlistclear',
+    'playlistdelete', 'playlistmove', 'findadd', 'searchadd', 'searchaddpl',
+})
+
+
+class AsyncMPDService:
+    """Owns an event-loop thread and one asyncio MPD connection."""
+    
+    def __init__(self, host='localhost', port=6600, timeout=30, max_blocking_workers=4):
+        """
+        Initialize the service (call start() to launch the loop thread).
+        
+        Args:
+            host (str): MPD server hostname or IP. Default: 'localhost'
+            port (int): MPD server port. Default: 6600
+            timeout (float): Seconds to wait when connecting or for a facade call. Default: 30
+            max_blocking_workers (int): Threads available to run_blocking(). Default: 4
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.max_blocking_workers = max_blocking_workers
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._executor = None
+        self._client = None
+        self._connect_lock = None
+        self._signals = {}
+        self._tasks = set()
+        self._stats = {'commands': 0, 'connects': 0, 'reconnects': 0, 'tasks_started': 0,
+                       'tasks_failed': 0, 'blocking_calls': 0}
+    
+    @property
+    def running(self):
+        """bool: True while the event-loop thread is alive."""
+        return self._thread is not None and self._thread.is_alive() and self._ready.is_set()
+    
+    @property
+    def loop(self):
+        """asyncio.AbstractEventLoop: The service loop (None before start())."""
+        return self._loop
+    
+    def start(self):
+        """
+        Start the event-loop thread (no-op if already running).
+        
+        Returns:
+            bool: True if the loop is running, False if asyncio MPD is unavailable
+        """
+        if not ASYNCIO_AVAILABLE:
+            logger.warning("mpd.asyncio not available - async MPD service disabled")
+            return False
+        if self.running:
+            return True
+        self._ready.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_blocking_workers,
+                                            thread_name_prefix='mpd-async-blocking')
+        self._thread = threading.Thread(target=self._run_loop, name='mpd-asyncio', daemon=True)
+        self._thread.start()
+        self._ready.wait(self.timeout)
+        return self.running
+    
+    def stop(self, timeout=5):
+        """
+        Cancel running tasks, close the connection and stop the loop.
+        
+        Args:
+            timeout (float): Seconds to wait for the loop thread to exit
+        """
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(), loop)
+        try:
+            future.result(timeout)
+        except Exception as e:
+            logger.warning(f"Async MPD shutdown did not finish cleanly: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        if self._executor:
+            self._executor.shutdown(wait=False)
+    
+    def _run_loop(self):
+        """Thread target: create the loop and run it forever."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.set_default_executor(self._executor)
+        self._loop = loop
+        self._connect_lock = asyncio.Lock()
+        loop.call_soon(self._ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+            self._loop = None
+            self._ready.clear()
+    
+    async def _shutdown(self):
+        """Cancel outstanding tasks and drop the connection (runs on the loop)."""
+        current = asyncio.current_task()
+        tasks = [task for task in self._tasks if task is not current]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._drop_client()
+    
+    # Connection handling
+    
+    async def client(self):
+        """
+        Get the shared asyncio client, connecting on first use.
+        
+        Returns:
+            mpd.asyncio.MPDClient: Connected client
+        """
+        if self._client is not None and self._client.connected:
+            return self._client
+        async with self._connect_lock:
+            if self._client is not None and self._client.connected:
+                return self._client
+            client = AsyncMPDClient()
+            await asyncio.wait_for(client.connect(self.host, self.port), self.timeout)
+            if self._stats['connects']:
+                self._stats['reconnects'] += 1
+            self._stats['connects'] += 1
+            logger.info(f"Async MPD client connected to {self.host}:{self.port}")
+            self._client = client
+            return client
+    
+    def _drop_client(self):
+        """Disconnect and forget the shared client."""
+        client, self._client = self._client, None
+        if client is not None:
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+    
+    async def execute(self, command, *args):
+        """
+        Run one MPD command, reconnecting once if the connection was lost.
+        
+        Read-only and idempotent commands are resent on the new connection;
+        commands in _NO_RETRY_COMMANDS raise instead.
+        
+        Args:
+            command (str): python-mpd2 command name, e.g. 'find' or 'status'
+            *args: Command arguments
+        
+        Returns:
+            The command result (lists are fully read)
+        """
+        for attempt in (1, 2):
+            client = await self.client()
+            try:
+                self._stats['commands'] += 1
+                return await getattr(client, command)(*args)
+            except _RECONNECT_ERRORS as e:
+                self._drop_client()
+                if attempt == 2 or command in _NO_RETRY_COMMANDS:
+                    raise
+                logger.warning(f"Async MPD connection lost during '{command}' ({e}), reconnecting")
+    
+    async def add_many(self, uris, connect):
+        """
+        Add songs to the queue in command-list batches, reporting failures per URI.
+        
+        mpd.asyncio cannot send command lists, so the batches go through
+        add_uris_batched() on a synchronous client in the blocking executor.
+        
+        Args:
+            uris (iterable): Song URIs or directories to add, in order
+            connect (callable): Returns a connected (pooled) client, or None;
+                its disconnect() is called when done
+        
+        Returns:
+            dict: {'added': int, 'failed': [(uri, error message)], 'round_trips': int}
+        """
+        return await self.run_blocking(_add_batched, connect, list(uris))
+    
+    # Scheduling
+    
+    def submit(self, coro):
+        """
+        Schedule a coroutine on the service loop from any thread.
+        
+        Args:
+            coro: Coroutine object
+        
+        Returns:
+            concurrent.futures.Future: Resolves with the coroutine result
+        """
+        if not self.running:
+            coro.close()
+            raise RuntimeError('Async MPD service is not running')
+        return asyncio.run_coroutine_threadsafe(self._track(coro), self._loop)
+    
+    def spawn(self, coro):
+        """
+        Start a fire-and-forget background coroutine; failures are logged.
+        
+        Args:
+            coro: Coroutine object
+        
+        Returns:
+            concurrent.futures.Future: Handle for the running task
+        """
+        future = self.submit(coro)
+        future.add_done_callback(self._log_failure)
+        return future
+    
+    async def _track(self, coro):
+        """Run a coroutine as a tracked task so stop() can cancel it."""
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        self._stats['tasks_started'] += 1
+        try:
+            return await coro
+        finally:
+            self._tasks.discard(task)
+    
+    def _log_failure(self, future):
+        """Done callback for spawn(): log exceptions from background coroutines."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self._stats['tasks_failed'] += 1
+            logger.error(f"Async background task failed: {error!r}")
+    
+    async def run_blocking(self, func, *args, **kwargs):
+        """
+        Run a blocking callable on the bounded executor and await its result.
+        
+        Args:
+            func (callable): Blocking function (HTTP request, sync MPD helper, ...)
+            *args, **kwargs: Passed to func
+        
+        Returns:
+            The function's return value
+        """
+        self._stats['blocking_calls'] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
+    
+    # Wakeups
+    
+    def _signal_event(self, name):
+        """Get (creating on the loop) the asyncio.Event behind a named signal."""
+        event = self._signals.get(name)
+        if event is None:
+            event = self._signals[name] = asyncio.Event()
+        return event
+    
+    def signal(self, name):
+        """
+        Wake coroutines waiting on a named signal. Safe to call from any thread.
+        
+        Args:
+            name (str): Signal name
+        """
+        if self.running:
+            self._loop.call_soon_threadsafe(lambda: self._signal_event(name).set())
+    
+    async def wait_signal(self, name, timeout=None):
+        """
+        Wait for a named signal, then reset it.
+        
+        Args:
+            name (str): Signal name
+            timeout (float): Maximum seconds to wait (None waits forever)
+        
+        Returns:
+            bool: True if signalled, False on timeout
+        """
+        event = self._signal_event(name)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            event.clear()
+    
+    # Synchronous access
+    
+    def run(self, coro, timeout=None):
+        """
+        Run a coroutine on the service loop and block for its result.
+        
+        Must not be called from the loop thread itself.
+        
+        Args:
+            coro: Coroutine object
+            timeout (float): Seconds to wait (defaults to the service timeout)
+        
+        Returns:
+            The coroutine result
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError('AsyncMPDService.run() called from the event loop thread')
+        return self.submit(coro).result(timeout if timeout is not None else self.timeout)
+    
+    def call(self, command, *args):
+        """
+        Run one MPD command synchronously through the shared async connection.
+        
+        Args:
+            command (str): python-mpd2 command name
+            *args: Command arguments
+        
+        Returns:
+            The command result
+        """
+        return self.run(self.execute(command, *args))
+    
+    def facade(self):
+        """
+        Get a synchronous client-like view for Flask handlers.
+        
+        Returns:
+            AsyncMPDFacade: Object whose MPD methods block on the shared connection
+        """
+        return AsyncMPDFacade(self)
+    
+    def stats(self):
+        """Get service counters plus connection and task state."""
+        stats = dict(self._stats)
+        stats['running'] = self.running
+        stats['connected'] = self._client is not None and self._client.connected
+        stats['active_tasks'] = len(self._tasks)
+        return stats
+
+
+def _add_batched(connect, uris):
+    """Executor side of add_many(): batch the adds on a checked-out client."""
+    client = connect()
+    if client is None:
+        raise ConnectionError('No MPD connection available for queue additions')
+    try:
+        return add_uris_batched(client, uris)
+    finally:
+        client.disconnect()
+
+
+class AsyncMPDFacade:
+    """Blocking MPD client interface backed by an AsyncMPDService."""
+    
+    def __init__(self, service):
+        """
+        Initialize the facade.
+        
+        Args:
+            service (AsyncMPDService): Running service to delegate to
+        """
+        self._service = service
+    
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        
+        def command(*args):
+            return self._service.call(name, *args)
+        command.__name__ = name
+        return command
+    
+    def disconnect(self):
+        """No-op: the shared connection belongs to the service."""
+        return None
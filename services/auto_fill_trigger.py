@@ -0,0 +1,138 @@
+"""
+AutoFillTrigger - wake auto-fill on queue and song changes
+
+Subscribes to the status snapshot instead of polling it every few seconds:
+- on_status() filters snapshot updates down to the fields auto-fill acts on
+  (play state, queue length, current song), so the once-a-second elapsed
+  tick does not wake the monitor
+- wait() blocks a monitor thread until one of those changes; coroutines use
+  the on_change callback (e.g. an async signal) and consume() instead
+- begin()/finish() hand out a single in-flight job token so overlapping
+  triggers cannot start two fills; a token older than job_timeout is
+  treated as abandoned
+"""
+
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds after which an unfinished fill job no longer blocks new ones
+DEFAULT_JOB_TIMEOUT = 300
+
+
+def status_key(status):
+    """The status fields an auto-fill decision depends on."""
+    return (status.get('state'), status.get('queue_length'), status.get('song_id'))
+
+
+class AutoFillTrigger:
+    """Thread-safe change filter and in-flight job token for auto-fill."""
+    
+    def __init__(self, on_change=None, job_timeout=DEFAULT_JOB_TIMEOUT, clock=time.monotonic):
+        """
+        Initialize the trigger.
+        
+        Args:
+            on_change (callable): Called with no arguments after each relevant change
+            job_timeout (float): Seconds before an unfinished job token expires
+            clock (callable): Time source (for tests)
+        """
+        self._on_change = on_change
+        self.job_timeout = job_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._last_key = None
+        self._tokens = itertools.count(1)
+        self._job = None
+        self._stats = {'changes': 0, 'ignored_updates': 0, 'jobs_started': 0,
+                       'jobs_skipped': 0, 'jobs_expired': 0}
+    
+    def on_status(self, status, version=None):
+        """
+        Status snapshot subscriber: wake auto-fill if a relevant field changed.
+        
+        Args:
+            status (dict): New status
+            version (int): Snapshot version (unused)
+        """
+        key = status_key(status)
+        with self._lock:
+            if key == self._last_key:
+                self._stats['ignored_updates'] += 1
+                return
+            self._last_key = key
+            self._stats['changes'] += 1
+        self.poke()
+    
+    def poke(self):
+        """Force an evaluation (e.g. after auto-fill was switched on)."""
+        self._changed.set()
+        if self._on_change:
+            try:
+                self._on_change()
+            except Exception as e:
+                logger.warning(f"Auto-fill change callback failed: {e}")
+    
+    def wait(self, timeout=None):
+        """
+        Block until a relevant change (or poke) arrives.
+        
+        Args:
+            timeout (float): Maximum seconds to wait (None waits forever)
+        
+        Returns:
+            bool: True if something changed, False on timeout
+        """
+        self._changed.wait(timeout)
+        return self.consume()
+    
+    def consume(self):
+        """Clear and return the pending-change flag."""
+        with self._lock:
+            changed = self._changed.is_set()
+            self._changed.clear()
+            return changed
+    
+    def begin(self):
+        """
+        Claim the in-flight job token.
+        
+        Returns:
+            int or None: Token to pass to finish(), None if a fill is already running
+        """
+        now = self._clock()
+        with self._lock:
+            if self._job is not None:
+                token, started = self._job
+                if now - started < self.job_timeout:
+                    self._stats['jobs_skipped'] += 1
+                    return None
+                logger.warning(f"Auto-fill job {token} did not finish within {self.job_timeout}s")
+                self._stats['jobs_expired'] += 1
+            token = next(self._tokens)
+            self._job = (token, now)
+            self._stats['jobs_started'] += 1
+            return token
+    
+    def finish(self, token):
+        """Release the job token (ignored if it expired and was replaced)."""
+        with self._lock:
+            if self._job is not None and self._job[0] == token:
+                self._job = None
+    
+    @property
+    def busy(self):
+        """bool: True while a fill job holds the token."""
+        with self._lock:
+            return self._job is not None and self._clock() - self._job[1] < self.job_timeout
+    
+    def stats(self):
+        """Get change and job counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['job_running'] = self._job is not None
+            return stats
@@ -0,0 +1,13 @@
+"""
+Background helpers shared by services
+
+Services that run work off the calling thread take a `spawn` callable so tests
+can capture the job instead of starting a thread; spawn_thread is the default.
+"""
+
+import threading
+
+
+def spawn_thread(target):
+    """Run target on a new daemon thread."""
+    threading.Thread(target=target, daemon=True).start()
@@ -0,0 +1,150 @@
+"""
+CandidatePool - auto-fill candidates prefetched in the background
+
+Keeps a ready pool of track URIs for the current auto-fill seed (similar
+artists of the playing artist, or a genre station) so that when the queue
+runs low the fill is taken from memory instead of waiting on Last.fm and
+MPD lookups:
+- prefetch(key, producer) refills the pool on a background thread when the
+  seed changed or the pool is running low (one refill at a time)
+- take(key, count) hands out tracks only for the matching seed, skipping
+  excluded (recently played or queued) files; a pool that cannot cover the
+  request is a miss and the caller falls back to a live fill
+- Hit rate and refill latency are counted for the status endpoints
+"""
+
+import logging
+import random
+import threading
+import time
+
+from services.background import spawn_thread
+
+logger = logging.getLogger(__name__)
+
+# Tracks kept per seed
+DEFAULT_MAX_SIZE = 200
+
+# Remaining tracks below which a prefetch for the same seed refills the pool
+DEFAULT_REFILL_BELOW = 40
+
+
+class CandidatePool:
+    """Thread-safe single-seed pool of prefetched auto-fill candidates."""
+    
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, refill_below=DEFAULT_REFILL_BELOW,
+                 spawn=spawn_thread, rng=None, clock=time.monotonic):
+        """
+        Initialize an empty pool.
+        
+        Args:
+            max_size (int): Tracks kept after a refill
+            refill_below (int): Pool size that triggers a refill for the same seed
+            spawn (callable): Runs a refill in the background (for tests). Default: daemon thread
+            rng (random.Random): Shuffles refilled candidates (for tests). Default: module random
+            clock (callable): Time source for refill latency (for tests)
+        """
+        self.max_size = max_size
+        self.refill_below = refill_below
+        self._spawn = spawn
+        self._random = rng or random
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._key = None
+        self._uris = []
+        self._refilling = None
+        self._stats = {'hits': 0, 'misses': 0, 'refills': 0, 'refill_errors': 0,
+                       'last_refill_seconds': None, 'total_refill_seconds': 0.0}
+    
+    def prefetch(self, key, producer):
+        """
+        Refill the pool in the background if needed.
+        
+        Args:
+            key (hashable): Seed the candidates belong to
+            producer (callable): Returns candidate URIs for the seed (may block)
+        
+        Returns:
+            bool: True if a refill was started
+        """
+        with self._lock:
+            if self._refilling == key:
+                return False
+            if key == self._key and len(self._uris) >= self.refill_below:
+                return False
+            self._refilling = key
+        self._spawn(lambda: self._refill(key, producer))
+        return True
+    
+    def _refill(self, key, producer):
+        started = self._clock()
+        try:
+            uris = list(dict.fromkeys(uri for uri in producer() if uri))
+        except Exception as e:
+            logger.warning(f"Auto-fill prefetch failed for {key}: {e}")
+            with self._lock:
+                self._stats['refill_errors'] += 1
+                if self._refilling == key:
+                    self._refilling = None
+            return
+        self._random.shuffle(uris)
+        elapsed = self._clock() - started
+        with self._lock:
+            if self._refilling != key:
+                # A newer seed took over while this refill ran
+                return
+            if key == self._key:
+                # Keep what is left, topped up with new tracks
+                kept = set(self._uris)
+                uris = self._uris + [uri for uri in uris if uri not in kept]
+            self._key = key
+            self._uris = uris[:self.max_size]
+            self._refilling = None
+            self._stats['refills'] += 1
+            self._stats['last_refill_seconds'] = round(elapsed, 3)
+            self._stats['total_refill_seconds'] += elapsed
+    
+    def take(self, key, count, exclude=()):
+        """
+        Take tracks for a seed from the pool.
+        
+        Args:
+            key (hashable): Seed the tracks must belong to
+            count (int): Tracks wanted
+            exclude (collection): URIs to skip (dropped from the pool)
+        
+        Returns:
+            list: count URIs, or [] on a miss (wrong seed or too few ready)
+        """
+        with self._lock:
+            if key == self._key:
+                self._uris = [uri for uri in self._uris if uri not in exclude]
+                if count > 0 and len(self._uris) >= count:
+                    picked, self._uris = self._uris[:count], self._uris[count:]
+                    self._stats['hits'] += 1
+                    return picked
+            self._stats['misses'] += 1
+            return []
+    
+    def invalidate(self):
+        """Drop the pool (e.g. after the music database changed)."""
+        with self._lock:
+            self._key = None
+            self._uris = []
+            self._refilling = None
+    
+    def stats(self):
+        """Get pool size, hit rate and refill latency."""
+        with self._lock:
+            stats = dict(self._stats)
+            requests = stats['hits'] + stats['misses']
+            stats.update({
+                'size': len(self._uris),
+                'seed': None if self._key is None else str(self._key),
+                'refilling': self._refilling is not None,
+                'hit_rate': round(stats['hits'] / requests, 3) if requests else None,
+                'avg_refill_seconds': round(stats['total_refill_seconds'] / stats['refills'], 3)
+                if stats['refills'] else None,
+            })
+            stats['total_refill_seconds'] = round(stats['total_refill_seconds'], 3)
+            return stats
@@ -0,0 +1,209 @@
+"""
+GenreMatcher - precomputed genre matching for genre-filtered auto-fill
+
+Replaces per-call lowercasing, substring tests and parenthesis parsing with
+tables built once per library load:
+- Every raw genre string maps to a canonical genre (case, separators and
+  aliases folded, so 'Hip-Hop', 'hip hop' and 'Rap' can be one genre) and a
+  base genre (the part before a parenthesis: 'Jazz (Bebop)' -> 'jazz')
+- The raw genres compatible with a target are computed once per target and
+  kept as a set, so filtering a candidate is a membership check
+
+Two genres match when their canonical forms are equal or one contains the
+other, or when their base genres are equal (the rules is_genre_match used).
+Alias rules can be loaded from a JSON file: {"canonical": ["alias", ...]}.
+"""
+
+import json
+import logging
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Built-in alias rules (a JSON file can extend or override them)
+DEFAULT_ALIASES = {
+    'hip hop': ['hip-hop', 'hiphop', 'rap'],
+    'r&b': ['rnb', 'r and b', 'rhythm and blues', 'rhythm & blues'],
+    'drum and bass': ['drum & bass', 'drum n bass', "drum'n'bass", 'dnb'],
+    'electronic': ['electronica'],
+    'soundtrack': ['ost', 'original soundtrack'],
+}
+
+_SEPARATORS_RE = re.compile(r'[\s\-_/.]+')
+
+
+def normalize(genre):
+    """
+    Fold case and separators: 'Hip-Hop' and 'hip_hop' both become 'hip hop'.
+    
+    Args:
+        genre (str): Raw genre
+    
+    Returns:
+        str: Normalized genre ('' for None)
+    """
+    if not genre:
+        return ''
+    return _SEPARATORS_RE.sub(' ', genre.casefold()).strip()
+
+
+def load_aliases(path):
+    """
+    Read alias rules from a JSON file.
+    
+    Args:
+        path (str): File holding {"canonical genre": ["alias", ...], ...}
+    
+    Returns:
+        dict: The rules, or {} if the file is missing or invalid
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            rules = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not read genre aliases from {path}: {e}")
+        return {}
+    if not isinstance(rules, dict):
+        logger.error(f"Genre aliases in {path} must be an object of lists")
+        return {}
+    return {str(canonical): [str(alias) for alias in aliases]
+            for canonical, aliases in rules.items() if isinstance(aliases, list)}
+
+
+class GenreMatcher:
+    """Thread-safe genre normalization table with cached compatibility sets."""
+    
+    def __init__(self, aliases=None):
+        """
+        Initialize the matcher.
+        
+        Args:
+            aliases (dict): {canonical: [aliases]} rules added to DEFAULT_ALIASES
+        """
+        self._lock = threading.Lock()
+        self._alias_map = {}
+        self._table = {}
+        self._library = frozenset()
+        self._compatible = {}
+        self._stats = {'builds': 0, 'compatibility_sets': 0}
+        self.set_aliases(aliases or {})
+    
+    def set_aliases(self, aliases):
+        """
+        Replace the alias rules (on top of DEFAULT_ALIASES) and forget cached sets.
+        
+        Args:
+            aliases (dict): {canonical: [aliases]}
+        """
+        alias_map = {}
+        for rules in (DEFAULT_ALIASES, aliases):
+            for canonical, names in rules.items():
+                target = normalize(canonical)
+                alias_map[target] = target
+                for name in names:
+                    alias_map[normalize(name)] = target
+        with self._lock:
+            self._alias_map = alias_map
+            genres = self._library
+        self.build(genres)
+    
+    def _canonical(self, text):
+        """Normalized text with alias rules applied."""
+        normalized = normalize(text)
+        return self._alias_map.get(normalized, normalized)
+    
+    def _entry(self, genre):
+        """(canonical, base) for a raw genre, memoized."""
+        entry = self._table.get(genre)
+        if entry is None:
+            canonical = self._canonical(genre)
+            base = self._canonical(genre.split('(')[0]) if '(' in genre and ')' in genre else canonical
+            entry = self._table[genre] = (canonical, base)
+        return entry
+    
+    @staticmethod
+    def _related(a, b):
+        """True if two (canonical, base) entries match."""
+        (canonical_a, base_a), (canonical_b, base_b) = a, b
+        if canonical_a and canonical_b and (canonical_a in canonical_b or canonical_b in canonical_a):
+            return True
+        return bool(base_a) and base_a == base_b
+    
+    def build(self, genres):
+        """
+        Rebuild the normalization table for a library's genres.
+        
+        Args:
+            genres (iterable): Every raw genre string in the library
+        """
+        with self._lock:
+            self._table = {}
+            self._compatible = {}
+            self._library = frozenset(genre for genre in genres if genre)
+            for genre in self._library:
+                self._entry(genre)
+            self._stats['builds'] += 1
+    
+    def canonical(self, genre):
+        """Canonical form of a raw genre ('' for None)."""
+        if not genre:
+            return ''
+        with self._lock:
+            return self._entry(genre)[0]
+    
+    def compatible(self, target):
+        """
+        Raw library genres matching a target genre.
+        
+        Args:
+            target (str): Genre to match against
+        
+        Returns:
+            frozenset: Raw genre strings (computed once per target and library load)
+        """
+        if not target:
+            return frozenset()
+        with self._lock:
+            found = self._compatible.get(target)
+            if found is None:
+                wanted = self._entry(target)
+                found = frozenset(genre for genre in self._library
+                                  if self._related(wanted, self._entry(genre)))
+                self._compatible[target] = found
+                self._stats['compatibility_sets'] += 1
+            return found
+    
+    def matches(self, target, candidate):
+        """
+        True if a candidate genre (or any value of a multi-value tag) matches the target.
+        
+        Args:
+            target (str): Genre to match against
+            candidate (str or list): Genre tag of a candidate track
+        
+        Returns:
+            bool
+        """
+        if not target or not candidate:
+            return False
+        compatible = self.compatible(target)
+        for value in (candidate if isinstance(candidate, (list, tuple)) else (candidate,)):
+            if value in compatible:
+                return True
+            if value and value not in self._library:
+                # Genre not in the library table (e.g. from a stream): compare directly
+                with self._lock:
+                    if self._related(self._entry(target), self._entry(value)):
+                        return True
+        return False
+    
+    def stats(self):
+        """Get build counters and table sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({'genres': len(self._library), 'aliases': len(self._alias_map),
+                          'cached_targets': len(self._compatible)})
+            return stats
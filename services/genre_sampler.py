@@ -0,0 +1,99 @@
+"""
+GenreSampler - random tracks across a genre station's genres
+
+Draws tracks straight from the library index's genre -> tracks lists instead
+of running find('genre', g) per genre over fresh MPD connections:
+- Each draw picks a (genre, position) pair uniformly, so genres are weighted
+  by their size and every selected genre takes part (no early stop that lets
+  the first genres dominate)
+- A draw costs one bisect over the cumulative genre sizes: O(k log g) for k
+  tracks from g genres
+- Recently played or queued files can be excluded
+"""
+
+import bisect
+import itertools
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+
+# Draws per wanted track before falling back to a scan of what is left
+MAX_DRAWS_PER_TRACK = 20
+
+
+class GenreSampler:
+    """Weighted random track picker over a LibraryIndex's genre lists."""
+    
+    def __init__(self, index, rng=None):
+        """
+        Initialize the sampler.
+        
+        Args:
+            index (LibraryIndex): Loaded library index
+            rng (random.Random): Random source (for tests). Default: module random
+        """
+        self._index = index
+        self._random = rng or random
+        self._stats = {'samples': 0, 'fallback_scans': 0}
+    
+    def genre_sizes(self, genres):
+        """
+        Track counts of the given genres.
+        
+        Args:
+            genres (iterable): Exact genre names
+        
+        Returns:
+            dict: {genre: track count} (0 for unknown genres)
+        """
+        return {genre: len(self._index.tag_tracks('genre', genre)) for genre in genres}
+    
+    def sample(self, genres, count, exclude=()):
+        """
+        Pick distinct random tracks from the union of several genres.
+        
+        Args:
+            genres (iterable): Exact genre names (as MPD `find genre` matches them)
+            count (int): Tracks wanted
+            exclude (collection): File URIs never to pick (recently played, queued)
+        
+        Returns:
+            list: File URIs, at most count (fewer if the genres run out)
+        """
+        pools = [pool for pool in (self._index.tag_tracks('genre', g) for g in dict.fromkeys(genres)) if pool]
+        if not pools or count <= 0:
+            return []
+        bounds = list(itertools.accumulate(len(pool) for pool in pools))
+        total = bounds[-1]
+        exclude = exclude if isinstance(exclude, (set, frozenset, dict)) else set(exclude)
+        
+        picked = []
+        chosen = set()
+        for _ in range(count * MAX_DRAWS_PER_TRACK):
+            if len(picked) >= count:
+                break
+            draw = self._random.randrange(total)
+            which = bisect.bisect_right(bounds, draw)
+            offset = draw - (bounds[which - 1] if which else 0)
+            file_path = pools[which][offset].file
+            if file_path in chosen or file_path in exclude:
+                continue
+            chosen.add(file_path)
+            picked.append(file_path)
+        
+        if len(picked) < count:
+            # Mostly excluded or tiny genres: take whatever is left
+            self._stats['fallback_scans'] += 1
+            remaining = list(dict.fromkeys(
+                t.file for pool in pools for t in pool if t.file not in chosen and t.file not in exclude))
+            self._random.shuffle(remaining)
+            picked.extend(remaining[:count - len(picked)])
+            logger.debug(f"Genre sample fell back to a scan: {len(picked)} of {count} tracks")
+        
+        self._stats['samples'] += 1
+        return picked
+    
+    def stats(self):
+        """Get sampling counters."""
+        return dict(self._stats)
@@ -0,0 +1,205 @@
+"""
+LastfmCache - persistent response cache for Last.fm artist lookups
+
+Keeps artist.getSimilar / getTopTracks / getTopAlbums responses in SQLite so
+auto-fill runs for a seed artist seen before make no network calls:
+- Per-method TTLs (similar artists change slower than top tracks)
+- Stale-while-revalidate: an expired entry is still returned for up to
+  STALE_WINDOW seconds while a background thread refetches it; a failed
+  fetch also falls back to stale data
+- Bounded size: least recently used entries are evicted past max_entries
+- Survives restarts
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from services.background import spawn_thread
+
+logger = logging.getLogger(__name__)
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# Seconds a response is fresh, per Last.fm method (lowercase)
+DEFAULT_TTLS = {
+    'artist.getsimilar': 14 * DAY,
+    'artist.gettoptracks': 3 * DAY,
+    'artist.gettopalbums': 3 * DAY,
+}
+DEFAULT_TTL = DAY
+
+# Seconds past expiry an entry may still be served while it is refreshed
+STALE_WINDOW = 30 * DAY
+
+# Entries kept on disk
+MAX_ENTRIES = 20000
+
+
+def cache_key(method, params):
+    """Stable key for a method call: artist names compare case-insensitively."""
+    normalized = {k: (v.strip().casefold() if isinstance(v, str) else v) for k, v in params.items()}
+    return f"{method.lower()}:{json.dumps(normalized, sort_keys=True, ensure_ascii=False)}"
+
+
+class LastfmCache:
+    """Thread-safe SQLite cache with TTLs, stale-while-revalidate and LRU eviction."""
+    
+    def __init__(self, path, ttls=None, max_entries=MAX_ENTRIES, stale_window=STALE_WINDOW,
+                 clock=time.time, spawn=spawn_thread):
+        """
+        Open (creating if needed) the cache database.
+        
+        Args:
+            path (str): SQLite file path, or ':memory:' for a throwaway cache
+            ttls (dict): {method: seconds} overriding DEFAULT_TTLS
+            max_entries (int): Entries kept before evicting the least recently used
+            stale_window (int): Seconds past expiry an entry is served while refreshing
+            clock (callable): Time source (for tests)
+            spawn (callable): Runs a background refresh (for tests). Default: daemon thread
+        """
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_entries = max_entries
+        self.stale_window = stale_window
+        self._clock = clock
+        self._spawn = spawn
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, method TEXT NOT NULL, '
+                'payload TEXT NOT NULL, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        self._stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0,
+                       'fetch_errors': 0, 'evictions': 0}
+    
+    def ttl(self, method):
+        """Fresh lifetime of a method's responses in seconds."""
+        return self.ttls.get(method.lower(), DEFAULT_TTL)
+    
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+    
+    def _load(self, key):
+        with self._lock:
+            row = self._conn.execute('SELECT payload, fetched_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (self._clock(), key))
+        return json.loads(row[0]), row[1]
+    
+    def _store(self, key, method, payload):
+        now = self._clock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, method, payload, fetched_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?)', (key, method.lower(), json.dumps(payload), now, now)
+            )
+            excess = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    'DELETE FROM responses WHERE key IN '
+                    '(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)', (excess,)
+                )
+                self._stats['evictions'] += excess
+    
+    def _refresh(self, key, method, fetch):
+        """Refetch an expired entry in the background."""
+        try:
+            self._store(key, method, fetch())
+            self._count('refreshes')
+        except Exception as e:
+            self._count('fetch_errors')
+            logger.warning(f"Last.fm refresh failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+    
+    def get(self, method, params, fetch):
+        """
+        Get a response from the cache, fetching it when missing or too old.
+        
+        Args:
+            method (str): Last.fm method, e.g. 'artist.getsimilar'
+            params (dict): Call parameters that identify the response (artist, limit)
+            fetch (callable): Returns the parsed JSON response; raises on failure
+        
+        Returns:
+            The cached or freshly fetched response
+        
+        Raises:
+            Whatever fetch raises, when there is no stale entry to fall back to
+        """
+        key = cache_key(method, params)
+        cached = self._load(key)
+        if cached is not None:
+            payload, fetched_at = cached
+            age = self._clock() - fetched_at
+            ttl = self.ttl(method)
+            if age < ttl:
+                self._count('hits')
+                return payload
+            if age < ttl + self.stale_window:
+                with self._lock:
+                    self._stats['stale_hits'] += 1
+                    start = key not in self._refreshing
+                    self._refreshing.add(key)
+                if start:
+                    self._spawn(lambda: self._refresh(key, method, fetch))
+                return payload
+        
+        self._count('misses')
+        try:
+            payload = fetch()
+        except Exception:
+            self._count('fetch_errors')
+            if cached is not None:
+                logger.warning(f"Last.fm fetch failed for {key}, serving expired entry")
+                return cached[0]
+            raise
+        self._store(key, method, payload)
+        return payload
+    
+    def entries(self, method):
+        """
+        Every cached response of one method, fresh or not (no fetches, no LRU update).
+        
+        Args:
+            method (str): Last.fm method, e.g. 'artist.getsimilar'
+        
+        Returns:
+            list: (params dict, response) tuples
+        """
+        with self._lock:
+            rows = self._conn.execute('SELECT key, payload FROM responses WHERE method = ?',
+                                      (method.lower(),)).fetchall()
+        entries = []
+        for key, payload in rows:
+            try:
+                entries.append((json.loads(key.split(':', 1)[1]), json.loads(payload)))
+            except (IndexError, ValueError):
+                continue
+        return entries
+    
+    def clear(self):
+        """Drop every cached response."""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM responses')
+    
+    def stats(self):
+        """Get hit/miss counters and the number of cached responses."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            return stats
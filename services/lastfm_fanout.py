@@ -0,0 +1,108 @@
+"""
+LastfmFanout - concurrent Last.fm lookups with an overall deadline
+
+Runs one lookup per item (e.g. top tracks for each similar artist) on a
+shared, bounded thread pool instead of one after another:
+- Results are yielded in completion order, so the caller can start matching
+  against the local library as soon as the first response lands
+- An overall deadline bounds the wall time; items still pending when it
+  passes are yielded with a default (partial results), and lookups that
+  have not started are cancelled
+- Only the HTTP lookups run in the pool: the caller's MPD client stays on
+  the calling thread
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+
+logger = logging.getLogger(__name__)
+
+# Concurrent Last.fm requests across all fan-outs
+DEFAULT_MAX_WORKERS = 8
+
+# Seconds a whole fan-out may take
+DEFAULT_DEADLINE = 15
+
+
+class LastfmFanout:
+    """Bounded thread pool for per-item Last.fm lookups."""
+    
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, deadline=DEFAULT_DEADLINE):
+        """
+        Initialize the fan-out (the pool is created on first use).
+        
+        Args:
+            max_workers (int): Concurrent lookups. Default: 8
+            deadline (float): Default seconds per fan-out. Default: 15
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        self._executor = None
+        self._stats = {'runs': 0, 'lookups': 0, 'errors': 0, 'deadline_hits': 0, 'timed_out': 0}
+    
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='lastfm-fanout')
+            return self._executor
+    
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+    
+    def map(self, fetch, items, deadline=None, default=None):
+        """
+        Run fetch(item) for every item concurrently.
+        
+        Args:
+            fetch (callable): Lookup for one item
+            items (iterable): Items to look up (duplicates are looked up once)
+            deadline (float): Seconds for the whole fan-out. Default: self.deadline
+            default: Result yielded for items that failed or missed the deadline
+        
+        Yields:
+            tuple: (item, result) in completion order, then (item, default) for
+            anything still pending at the deadline
+        """
+        items = list(dict.fromkeys(items))
+        if not items:
+            return
+        self._count('runs')
+        timeout = self.deadline if deadline is None else deadline
+        pool = self._pool()
+        futures = {pool.submit(fetch, item): item for item in items}
+        pending = set(futures)
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                pending.discard(future)
+                item = futures[future]
+                try:
+                    result = future.result()
+                    self._count('lookups')
+                except Exception as e:
+                    self._count('errors')
+                    logger.warning(f"Last.fm lookup failed for {item}: {e}")
+                    result = default
+                yield item, result
+        except FuturesTimeoutError:
+            self._count('deadline_hits')
+            self._count('timed_out', len(pending))
+            logger.info(f"Last.fm fan-out deadline ({timeout}s) hit with {len(pending)} of {len(items)} lookups pending")
+            for future in [f for f in futures if f in pending]:
+                future.cancel()
+                pending.discard(future)
+                yield futures[future], default
+        finally:
+            # Consumer stopped early: drop lookups that have not started
+            for future in pending:
+                future.cancel()
+    
+    def stats(self):
+        """Get fan-out counters and pool settings."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({'max_workers': self.max_workers, 'deadline': self.deadline})
+            return stats
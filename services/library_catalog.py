@@ -0,0 +1,258 @@
+"""
+LibraryCatalog - persistent SQLite catalog of the MPD database for search
+
+Mirrors every song into an on-disk SQLite database with an FTS5 full-text
+index over artist, albumartist, album, title, genre and path:
+- Incremental sync: only songs whose `last-modified` changed are rewritten,
+  songs that disappeared from MPD are deleted
+- Ranked (bm25), prefix-aware queries: every search term matches as a prefix
+  and all terms must match
+- Survives restarts, so search works before MPD has been re-scanned
+- Falls back to LIKE queries if the SQLite build lacks FTS5
+- ready is False while a sync holds the database, so callers can answer
+  searches elsewhere instead of waiting for it
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Song tags stored in the catalog (multi-value tags are joined with '; ')
+CATALOG_TAGS = ('artist', 'albumartist', 'album', 'title', 'genre', 'date', 'track', 'disc')
+
+# Full-text columns and their bm25 weights (artist/album hits outrank path hits)
+FTS_COLUMNS = (('artist', 10.0), ('albumartist', 8.0), ('album', 6.0), ('title', 5.0), ('genre', 2.0), ('path', 1.0))
+
+# Search tag -> full-text columns it is restricted to
+SEARCH_TAG_COLUMNS = {
+    'artist': ('artist', 'albumartist'),
+    'albumartist': ('albumartist',),
+    'album': ('album',),
+    'title': ('title',),
+    'genre': ('genre',),
+    'file': ('path',),
+    'path': ('path',),
+}
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _tag_text(value):
+    """Flatten an MPD tag value (str or list) to a single string."""
+    if isinstance(value, (list, tuple)):
+        return '; '.join(str(v) for v in value if v is not None)
+    return None if value is None else str(value)
+
+
+class LibraryCatalog:
+    """Thread-safe SQLite mirror of the MPD library with full-text search."""
+    
+    def __init__(self, path):
+        """
+        Open (creating if needed) the catalog database.
+        
+        Args:
+            path (str): SQLite file path, or ':memory:' for a throwaway catalog
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self.fts_available = self._create_schema()
+        self._rows = self._conn.execute('SELECT COUNT(*) FROM tracks').fetchone()[0]
+        self._syncing = False
+        self._stats = {'syncs': 0, 'searches': 0, 'last_sync': None}
+    
+    def _create_schema(self):
+        """Create tables; returns False if FTS5 is not compiled into SQLite."""
+        columns = ', '.join(f'{tag} TEXT' for tag in CATALOG_TAGS)
+        with self._conn:
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS tracks (id INTEGER PRIMARY KEY, file TEXT UNIQUE NOT NULL, '
+                f'{columns}, time TEXT, duration TEXT, last_modified TEXT)'
+            )
+            try:
+                fts_columns = ', '.join(name for name, _ in FTS_COLUMNS)
+                self._conn.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS tracks_fts USING fts5({fts_columns}, "
+                    f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+                )
+                return True
+            except sqlite3.OperationalError as e:
+                logger.warning(f"SQLite FTS5 unavailable ({e}); catalog search will use LIKE")
+                return False
+    
+    @property
+    def ready(self):
+        """bool: True if the catalog holds songs and no sync is writing to it."""
+        return self._rows > 0 and not self._syncing
+    
+    def count(self):
+        """Get the number of songs in the catalog (tracked by sync(), no query)."""
+        return self._rows
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    # Sync
+    
+    def sync(self, songs):
+        """
+        Bring the catalog in line with the MPD database.
+        
+        Args:
+            songs (iterable): Song dicts (listallinfo() entries; others are skipped)
+        
+        Returns:
+            dict: {'added': int, 'updated': int, 'removed': int, 'seconds': float}
+        """
+        started = time.time()
+        result = {'added': 0, 'updated': 0, 'removed': 0}
+        self._syncing = True
+        try:
+            self._sync(songs, result)
+        finally:
+            self._syncing = False
+        
+        result['seconds'] = round(time.time() - started, 3)
+        self._stats['syncs'] += 1
+        self._stats['last_sync'] = dict(result, at=time.time())
+        logger.info(f"Library catalog sync: {result}")
+        return result
+    
+    def _sync(self, songs, result):
+        """Write the changes of one sync in a single transaction."""
+        with self._lock, self._conn:
+            existing = {row[0]: (row[1], row[2]) for row in
+                        self._conn.execute('SELECT file, last_modified, id FROM tracks')}
+            seen = set()
+            for song in songs:
+                file_path = song.get('file')
+                if not file_path or file_path in seen:
+                    continue
+                seen.add(file_path)
+                last_modified = song.get('last-modified')
+                known = existing.get(file_path)
+                if known and last_modified is not None and known[0] == last_modified:
+                    continue
+                if known:
+                    self._write(song, known[1])
+                    result['updated'] += 1
+                else:
+                    self._write(song, None)
+                    result['added'] += 1
+            
+            removed_ids = [(track_id,) for file_path, (_, track_id) in existing.items() if file_path not in seen]
+            if removed_ids:
+                self._conn.executemany('DELETE FROM tracks WHERE id = ?', removed_ids)
+                if self.fts_available:
+                    self._conn.executemany('DELETE FROM tracks_fts WHERE rowid = ?', removed_ids)
+            result['removed'] = len(removed_ids)
+            self._rows = len(seen)
+    
+    def _write(self, song, track_id):
+        """Insert or replace one song and its full-text row (lock and transaction held)."""
+        values = [_tag_text(song.get(tag)) for tag in CATALOG_TAGS]
+        extra = [_tag_text(song.get('time')), _tag_text(song.get('duration')), song.get('last-modified')]
+        columns = ('file',) + CATALOG_TAGS + ('time', 'duration', 'last_modified')
+        if track_id is None:
+            placeholders = ', '.join('?' for _ in columns)
+            cursor = self._conn.execute(
+                f"INSERT INTO tracks ({', '.join(columns)}) VALUES ({placeholders})",
+                [song['file']] + values + extra
+            )
+            track_id = cursor.lastrowid
+        else:
+            assignments = ', '.join(f'{column} = ?' for column in columns[1:])
+            self._conn.execute(f'UPDATE tracks SET {assignments} WHERE id = ?', values + extra + [track_id])
+            if self.fts_available:
+                self._conn.execute('DELETE FROM tracks_fts WHERE rowid = ?', (track_id,))
+        if self.fts_available:
+            fts_values = [_tag_text(song.get(name)) for name, _ in FTS_COLUMNS[:-1]] + [song['file']]
+            self._conn.execute(
+                f"INSERT INTO tracks_fts (rowid, {', '.join(name for name, _ in FTS_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' for _ in FTS_COLUMNS)})",
+                [track_id] + fts_values
+            )
+    
+    # Search
+    
+    @staticmethod
+    def _match_expression(terms, tag):
+        """Build an FTS5 MATCH string: all terms as quoted prefixes, optionally column-scoped."""
+        expression = ' '.join(f'"{term}"*' for term in terms)
+        columns = SEARCH_TAG_COLUMNS.get(tag)
+        if columns:
+            expression = '{' + ' '.join(columns) + '}: (' + expression + ')'
+        return expression
+    
+    def search(self, query, tag='any', limit=200):
+        """
+        Ranked, prefix-aware search.
+        
+        Args:
+            query (str): Free text; every word must match the start of a word
+            tag (str): 'any' or a tag from SEARCH_TAG_COLUMNS to restrict the match
+            limit (int): Maximum results. Default: 200
+        
+        Returns:
+            list: MPD-style song dicts, best match first
+        """
+        terms = [term.lower() for term in _TERM_RE.findall(query or '')]
+        if not terms:
+            return []
+        self._stats['searches'] += 1
+        with self._lock:
+            if self.fts_available:
+                weights = ', '.join(str(weight) for _, weight in FTS_COLUMNS)
+                rows = self._conn.execute(
+                    f'SELECT t.* FROM tracks_fts JOIN tracks t ON t.id = tracks_fts.rowid '
+                    f'WHERE tracks_fts MATCH ? ORDER BY bm25(tracks_fts, {weights}) LIMIT ?',
+                    (self._match_expression(terms, tag), limit)
+                ).fetchall()
+            else:
+                rows = self._like_search(terms, tag, limit)
+        return [self._row_to_song(row) for row in rows]
+    
+    def _like_search(self, terms, tag, limit):
+        """Substring fallback when FTS5 is missing (lock held)."""
+        columns = [('file' if c == 'path' else c) for c in SEARCH_TAG_COLUMNS.get(tag, [n for n, _ in FTS_COLUMNS])]
+        clauses, params = [], []
+        for term in terms:
+            clauses.append('(' + ' OR '.join(f'{column} LIKE ?' for column in columns) + ')')
+            params.extend([f'%{term}%'] * len(columns))
+        return self._conn.execute(
+            f"SELECT * FROM tracks WHERE {' AND '.join(clauses)} ORDER BY artist, album, track LIMIT ?",
+            params + [limit]
+        ).fetchall()
+    
+    @staticmethod
+    def _row_to_song(row):
+        """Convert a tracks row to an MPD-style song dict."""
+        song = {'file': row['file']}
+        for tag in CATALOG_TAGS + ('time', 'duration'):
+            if row[tag] is not None:
+                song[tag] = row[tag]
+        if row['last_modified'] is not None:
+            song['last-modified'] = row['last_modified']
+        return song
+    
+    def stats(self):
+        """Get sync/search counters plus catalog size."""
+        stats = dict(self._stats)
+        stats['tracks'] = self.count()
+        stats['fts5'] = self.fts_available
+        stats['path'] = self.path
+        if self.path != ':memory:' and os.path.exists(self.path):
+            stats['size_bytes'] = os.path.getsize(self.path)
+        return stats
@@ -0,0 +1,794 @@
+"""
+LibraryIndex - in-memory copy of the MPD music database
+
+Loads every song once with listallinfo() and answers browse/search queries
+from memory instead of issuing list/find/search round-trips to MPD:
+- Compact per-track records (slotted, tag strings interned)
+- Exact-match indexes per tag, by file and by directory
+- A genre -> artist -> album -> directory -> tracks tree for browsing
+- Per-genre artist/album/track counts and playtime, computed while loading
+  (the genre -> tracks lists double as the inverted index for genre stations)
+- An album table keyed by (albumartist, album, directory) for sampling
+- An album resolver: normalized (artist, album) keys -> disc/track ordered
+  tracks, replacing the find/search/list fallback chain used to add albums
+- LibraryReader: read-only stand-in for an MPD client (find/search/list/
+  listallinfo) so existing query code can run unchanged against the index
+
+The index is rebuilt off to the side and swapped in atomically; callers refresh
+it at startup and whenever MPD reports a 'database' idle event. Refreshes are
+skipped while MPD's db_update stamp is unchanged.
+"""
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+from mpd import CommandError
+
+logger = logging.getLogger(__name__)
+
+# Tags kept on each track record (MPD may return a list for multi-value tags)
+TRACK_TAGS = ('artist', 'albumartist', 'album', 'title', 'genre', 'date', 'track', 'disc', 'composer')
+
+# Tags with an exact-match value -> tracks index
+INDEXED_TAGS = ('artist', 'albumartist', 'album', 'genre', 'title', 'date', 'composer')
+
+# Non-tag song fields carried through to query results
+_EXTRA_FIELDS = (('time', 'time'), ('duration', 'duration'), ('last-modified', 'last_modified'))
+
+_YEAR_RE = re.compile(r'\d{4}')
+
+_NUMBER_RE = re.compile(r'\d+')
+
+_KEY_STRIP_RE = re.compile(r'[\W_]+')
+
+
+def _intern(value):
+    """Normalize a tag value: str stays str (interned), lists become tuples."""
+    if isinstance(value, (list, tuple)):
+        values = tuple(sys.intern(str(v)) for v in value if v is not None)
+        if len(values) == 1:
+            return values[0]
+        return values or None
+    if value is None or value == '':
+        return None
+    return sys.intern(str(value))
+
+
+def _values(value):
+    """Iterate the individual values of a stored tag (str, tuple or None)."""
+    if value is None:
+        return ()
+    if isinstance(value, tuple):
+        return value
+    return (value,)
+
+
+def _first(value):
+    """First value of a stored tag, or None."""
+    if isinstance(value, tuple):
+        return value[0] if value else None
+    return value
+
+
+def _number(value, default):
+    """Leading number of a tag like '3' or '3/12', else default."""
+    match = _NUMBER_RE.match((_first(value) or '').strip())
+    return int(match.group()) if match else default
+
+
+def norm_key(text):
+    """
+    Normalize an artist or album name for lookups.
+    
+    Case and punctuation are ignored, so 'AC/DC' and 'ac-dc' share a key.
+    Letters outside ASCII are kept, unlike the old [^a-z0-9] filter which
+    reduced non-Latin names to ''.
+    
+    Args:
+        text (str): Name to normalize (None is treated as '')
+    
+    Returns:
+        str: Normalized key
+    """
+    if not text:
+        return ''
+    return _KEY_STRIP_RE.sub('', text.casefold())
+
+
+def disc_number(track):
+    """Disc number of a track ('2' or '2/3' -> 2), 1 when missing or invalid."""
+    return _number(track.disc, 1) or 1
+
+
+def album_order(track):
+    """Sort key for tracks of one album: disc, directory, track number, file."""
+    return (disc_number(track), track.directory, _number(track.track, 0), track.file)
+
+
+class LibraryTrack:
+    """Compact record for one song in the library."""
+    
+    __slots__ = ('file', 'directory') + TRACK_TAGS + tuple(attr for _, attr in _EXTRA_FIELDS)
+    
+    def __init__(self, song):
+        """
+        Build a record from an MPD song dict.
+        
+        Args:
+            song (dict): Entry from listallinfo()/find() containing a 'file' key
+        """
+        self.file = song['file']
+        self.directory = sys.intern(os.path.dirname(self.file))
+        for tag in TRACK_TAGS:
+            setattr(self, tag, _intern(song.get(tag)))
+        for key, attr in _EXTRA_FIELDS:
+            value = song.get(key)
+            setattr(self, attr, str(value) if value is not None else None)
+    
+    @property
+    def seconds(self):
+        """float: Track length from 'duration', else 'time' (0 if unknown)."""
+        for value in (self.duration, self.time):
+            if value:
+                try:
+                    return float(value)
+                except ValueError:
+                    pass
+        return 0.0
+    
+    @property
+    def display_artist(self):
+        """str: AlbumArtist if present, otherwise Artist (as the browse pages group)."""
+        return _first(self.albumartist) or _first(self.artist) or 'Unknown Artist'
+    
+    def tag(self, name):
+        """
+        Get a tag value as MPD would return it.
+        
+        Args:
+            name (str): Tag name (lowercase)
+        
+        Returns:
+            str, list or None
+        """
+        if name == 'file':
+            return self.file
+        value = getattr(self, name, None) if name in TRACK_TAGS else None
+        return list(value) if isinstance(value, tuple) else value
+    
+    def as_dict(self):
+        """
+        Convert to an MPD-style song dict.
+        
+        Returns:
+            dict: Song with 'file', present tags and time fields
+        """
+        song = {'file': self.file}
+        for tag in TRACK_TAGS:
+            value = getattr(self, tag)
+            if value is not None:
+                song[tag] = list(value) if isinstance(value, tuple) else value
+        for key, attr in _EXTRA_FIELDS:
+            value = getattr(self, attr)
+            if value is not None:
+                song[key] = value
+        return song
+
+
+class LibraryAlbum:
+    """One album: the tracks sharing an AlbumArtist/Artist, album name and directory."""
+    
+    __slots__ = ('artist', 'album', 'directory', 'genres', 'year', 'track_count', 'sample_file', 'tracks')
+    
+    def __init__(self, artist, album, directory, sample_file):
+        """
+        Start an album record from its first track.
+        
+        Args:
+            artist (str): AlbumArtist, else Artist
+            album (str): Album name
+            directory (str): Directory holding the tracks
+            sample_file (str): A track file (used for cover art)
+        """
+        self.artist = artist
+        self.album = album
+        self.directory = directory
+        self.genres = ()
+        self.year = None
+        self.track_count = 0
+        self.sample_file = sample_file
+        self.tracks = []
+    
+    @property
+    def key(self):
+        """tuple: (artist, album, directory) identity."""
+        return (self.artist, self.album, self.directory)
+    
+    def add(self, track):
+        """Account for one more track of this album."""
+        self.track_count += 1
+        self.tracks.append(track)
+        for genre in _values(track.genre):
+            if genre not in self.genres:
+                self.genres += (genre,)
+        if self.year is None:
+            match = _YEAR_RE.search(_first(track.date) or '')
+            if match:
+                self.year = int(match.group())
+    
+    def as_dict(self):
+        """
+        Convert to a plain dict for templates and JSON.
+        
+        Returns:
+            dict: artist, album, directory, genre (first genre), year, track_count, sample_file
+        """
+        return {
+            'artist': self.artist,
+            'album': self.album,
+            'directory': self.directory,
+            'genre': self.genres[0] if self.genres else 'Unknown Genre',
+            'year': self.year,
+            'track_count': self.track_count,
+            'sample_file': self.sample_file,
+        }
+
+
+class LibraryIndex:
+    """Thread-safe in-memory index of the MPD database."""
+    
+    def __init__(self):
+        """Initialize an empty index (call refresh() to load it)."""
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._tracks = ()
+        self._by_file = {}
+        self._by_dir = {}
+        self._by_tag = {tag: {} for tag in INDEXED_TAGS}
+        self._tree = {}
+        self._genre_stats = {}
+        self._albums = ()
+        self._album_keys = {}
+        self._albums_by_artist = {}
+        self._albums_by_name = {}
+        self._artist_album_tracks = {}
+        self._db_update = None
+        self._loaded = False
+        self._version = 0
+        self._stats = {'refreshes': 0, 'failed_refreshes': 0, 'skipped_refreshes': 0,
+                       'load_seconds': 0.0, 'loaded_at': None}
+    
+    @property
+    def loaded(self):
+        """bool: True once the index holds a complete copy of the database."""
+        return self._loaded
+    
+    @property
+    def version(self):
+        """int: Incremented on every successful refresh."""
+        return self._version
+    
+    @property
+    def db_update(self):
+        """str: MPD's db_update stamp the loaded index corresponds to (None if unknown)."""
+        return self._db_update
+    
+    def __len__(self):
+        return len(self._tracks)
+    
+    # Loading
+    
+    def refresh(self, client):
+        """
+        Reload the whole database from MPD and swap it in.
+        
+        Concurrent refreshes are serialized; readers keep using the previous
+        index until the new one is complete. Nothing is reloaded while MPD's
+        db_update stamp matches the loaded index.
+        
+        Args:
+            client: Connected MPD client (plain or pooled)
+        
+        Returns:
+            bool: True if the index is current (reloaded or unchanged)
+        """
+        with self._refresh_lock:
+            started = time.time()
+            try:
+                db_update = self._db_update_stamp(client)
+                if self._loaded and db_update is not None and db_update == self._db_update:
+                    self._stats['skipped_refreshes'] += 1
+                    logger.info(f"Library index up to date (db_update {db_update}), skipping reload")
+                    return True
+                songs = self._fetch_all(client)
+            except Exception as e:
+                self._stats['failed_refreshes'] += 1
+                logger.error(f"Library index refresh failed: {e}")
+                return False
+            self.load(songs, db_update=db_update)
+            elapsed = time.time() - started
+            self._stats['load_seconds'] = round(elapsed, 3)
+            logger.info(f"Library index loaded {len(self._tracks)} tracks in {elapsed:.2f}s")
+            return True
+    
+    @staticmethod
+    def _db_update_stamp(client):
+        """Read MPD's last database update stamp, or None if the server does not report it."""
+        try:
+            return client.stats().get('db_update')
+        except CommandError:
+            return None
+    
+    @staticmethod
+    def _fetch_all(client):
+        """Read every song, falling back to one listallinfo per top-level directory."""
+        try:
+            return client.listallinfo()
+        except CommandError as e:
+            # Large libraries can exceed MPD's max_output_buffer_size in one response
+            logger.warning(f"listallinfo failed ({e}), loading library per directory")
+        songs = []
+        for entry in client.lsinfo():
+            if 'directory' in entry:
+                songs.extend(client.listallinfo(entry['directory']))
+            elif 'file' in entry:
+                songs.append(entry)
+        return songs
+    
+    def load(self, songs, db_update=None):
+        """
+        Build the index from song dicts and swap it in.
+        
+        Args:
+            songs (iterable): MPD entries; directories and playlists are skipped
+            db_update (str): MPD db_update stamp the songs were read at, if known
+        """
+        tracks = []
+        by_file = {}
+        by_dir = {}
+        by_tag = {tag: {} for tag in INDEXED_TAGS}
+        tree = {}
+        genre_totals = {}
+        albums = {}
+        artist_album_tracks = {}
+        for song in songs:
+            if 'file' not in song:
+                continue
+            track = LibraryTrack(song)
+            tracks.append(track)
+            by_file[track.file] = track
+            by_dir.setdefault(track.directory, []).append(track)
+            for tag in INDEXED_TAGS:
+                index = by_tag[tag]
+                for value in _values(getattr(track, tag)):
+                    index.setdefault(value, []).append(track)
+            album = _first(track.album) or 'Unknown Album'
+            seconds = track.seconds
+            if track.album is not None:
+                album_key = (track.display_artist, album, track.directory)
+                record = albums.get(album_key)
+                if record is None:
+                    record = albums[album_key] = LibraryAlbum(*album_key, track.file)
+                record.add(track)
+                # Track artists other than the album artist (guests, compilations)
+                display_key = norm_key(track.display_artist)
+                for artist in _values(track.artist):
+                    artist_key = norm_key(artist)
+                    if artist_key != display_key:
+                        (artist_album_tracks.setdefault((artist_key, norm_key(album)), [])
+                             .append(track))
+            for genre in _values(track.genre):
+                (tree.setdefault(genre, {})
+                     .setdefault(track.display_artist, {})
+                     .setdefault(album, {})
+                     .setdefault(track.directory, [])
+                     .append(track))
+                totals = genre_totals.setdefault(genre, [0, 0.0])
+                totals[0] += 1
+                totals[1] += seconds
+        
+        genre_stats = {
+            genre: {
+                'artist_count': len(artists),
+                'album_count': sum(len(albums) for albums in artists.values()),
+                'track_count': genre_totals[genre][0],
+                'playtime': int(round(genre_totals[genre][1])),
+            }
+            for genre, artists in tree.items()
+        }
+        
+        album_keys = {}
+        albums_by_artist = {}
+        albums_by_name = {}
+        for record in albums.values():
+            record.tracks.sort(key=album_order)
+            artist_key = norm_key(record.artist)
+            album_name_key = norm_key(record.album)
+            album_keys.setdefault((artist_key, album_name_key), []).append(record)
+            albums_by_artist.setdefault(artist_key, []).append(record)
+            albums_by_name.setdefault(album_name_key, []).append(record)
+        
+        with self._lock:
+            self._tracks = tuple(tracks)
+            self._by_file = by_file
+            self._by_dir = by_dir
+            self._by_tag = by_tag
+            self._tree = tree
+            self._genre_stats = genre_stats
+            self._albums = tuple(albums.values())
+            self._album_keys = album_keys
+            self._albums_by_artist = albums_by_artist
+            self._albums_by_name = albums_by_name
+            self._artist_album_tracks = artist_album_tracks
+            self._db_update = db_update
+            self._loaded = True
+            self._version += 1
+            self._stats['refreshes'] += 1
+            self._stats['loaded_at'] = time.time()
+    
+    def invalidate(self):
+        """Mark the index stale so callers fall back to MPD until the next refresh."""
+        self._loaded = False
+    
+    # Queries
+    
+    def get(self, file_path):
+        """
+        Look up one song by file path.
+        
+        Args:
+            file_path (str): Song URI relative to the music directory
+        
+        Returns:
+            dict: MPD-style song dict, or None if unknown
+        """
+        track = self._by_file.get(file_path)
+        return track.as_dict() if track else None
+    
+    def _candidates(self, criteria):
+        """Smallest indexed track list for a set of exact-match criteria."""
+        best = None
+        for tag, value in criteria:
+            if tag == 'file':
+                track = self._by_file.get(value)
+                return [track] if track else []
+            if tag in self._by_tag:
+                found = self._by_tag[tag].get(value, ())
+                if best is None or len(found) < len(best):
+                    best = found
+        return self._tracks if best is None else best
+    
+    @staticmethod
+    def _pairs(args):
+        """Turn find/search arguments ('tag', value, ...) into lowercased pairs."""
+        if len(args) % 2:
+            raise CommandError('Incorrect number of filter arguments')
+        return [(str(args[i]).lower(), str(args[i + 1])) for i in range(0, len(args), 2)]
+    
+    @staticmethod
+    def _matches(track, criteria, compare):
+        """True if every (tag, value) criterion matches the track."""
+        for tag, value in criteria:
+            if tag == 'any':
+                values = [v for name in TRACK_TAGS for v in _values(getattr(track, name))]
+            elif tag == 'file':
+                values = (track.file,)
+            elif tag == 'base':
+                if not (track.directory == value or track.directory.startswith(value.rstrip('/') + '/')):
+                    return False
+                continue
+            elif tag in TRACK_TAGS:
+                values = _values(getattr(track, tag))
+            else:
+                return False
+            if not any(compare(v, value) for v in values):
+                return False
+        return True
+    
+    def find_tracks(self, *args):
+        """
+        Exact, case-sensitive match like MPD `find`.
+        
+        Args:
+            *args: Alternating tag names and values, e.g. ('albumartist', 'X', 'album', 'Y')
+        
+        Returns:
+            list: Matching LibraryTrack records in library order
+        """
+        criteria = self._pairs(args)
+        with self._lock:
+            candidates = self._candidates(criteria)
+        return [t for t in candidates if self._matches(t, criteria, lambda have, want: have == want)]
+    
+    def search_tracks(self, *args):
+        """
+        Case-insensitive substring match like MPD `search`.
+        
+        Args:
+            *args: Alternating tag names and values
+        
+        Returns:
+            list: Matching LibraryTrack records in library order
+        """
+        criteria = [(tag, value.lower()) for tag, value in self._pairs(args)]
+        with self._lock:
+            tracks = self._tracks
+        return [t for t in tracks if self._matches(t, criteria, lambda have, want: want in have.lower())]
+    
+    def find(self, *args):
+        """Exact match like MPD `find`, returning song dicts."""
+        return [t.as_dict() for t in self.find_tracks(*args)]
+    
+    def search(self, *args):
+        """Case-insensitive substring match like MPD `search`, returning song dicts."""
+        return [t.as_dict() for t in self.search_tracks(*args)]
+    
+    def list(self, tag, *args):
+        """
+        Unique values of a tag, optionally filtered, like MPD `list`.
+        
+        Args:
+            tag (str): Tag to list
+            *args: Optional alternating filter tags and values
+        
+        Returns:
+            list: [{tag: value}, ...] sorted by value (python-mpd2 format)
+        """
+        tag = tag.lower()
+        if args:
+            tracks = self.find_tracks(*args)
+        else:
+            with self._lock:
+                if tag in self._by_tag:
+                    return [{tag: value} for value in sorted(self._by_tag[tag])]
+                tracks = self._tracks
+        values = set()
+        for track in tracks:
+            values.update(_values(track.file if tag == 'file' else getattr(track, tag, None)))
+        return [{tag: value} for value in sorted(values)]
+    
+    def tag_counts(self, tag):
+        """
+        Number of tracks carrying each value of an indexed tag.
+        
+        Args:
+            tag (str): One of INDEXED_TAGS
+        
+        Returns:
+            dict: {value: track count}
+        """
+        with self._lock:
+            return {value: len(tracks) for value, tracks in self._by_tag.get(tag.lower(), {}).items()}
+    
+    def tag_tracks(self, tag, value):
+        """
+        Tracks carrying an exact value of an indexed tag.
+        
+        Args:
+            tag (str): One of INDEXED_TAGS
+            value (str): Exact tag value
+        
+        Returns:
+            list: LibraryTrack records (shared, treat as read-only)
+        """
+        with self._lock:
+            return self._by_tag.get(tag.lower(), {}).get(value, ())
+    
+    def listallinfo(self, path=''):
+        """
+        All songs, or those below a directory, like MPD `listallinfo` (songs only).
+        
+        Args:
+            path (str): Directory relative to the music root ('' for everything)
+        
+        Returns:
+            list: Song dicts
+        """
+        if not path:
+            with self._lock:
+                tracks = self._tracks
+            return [t.as_dict() for t in tracks]
+        return self.find('base', path)
+    
+    def directory(self, path):
+        """
+        Songs directly inside one directory.
+        
+        Args:
+            path (str): Directory relative to the music root
+        
+        Returns:
+            list: Song dicts in library order
+        """
+        with self._lock:
+            tracks = self._by_dir.get(path, ())
+        return [t.as_dict() for t in tracks]
+    
+    # Browse tree
+    
+    def genres(self):
+        """Get all genre names (sorted, case-insensitive)."""
+        with self._lock:
+            return sorted(self._tree, key=str.lower)
+    
+    def genre_stats(self):
+        """
+        Per-genre totals computed when the index was loaded.
+        
+        Returns:
+            dict: {genre: {'artist_count', 'album_count', 'track_count', 'playtime' (seconds)}}
+        """
+        with self._lock:
+            return {genre: dict(stats) for genre, stats in self._genre_stats.items()}
+    
+    def album_table(self):
+        """
+        All albums, one record per (artist, album, directory).
+        
+        Returns:
+            tuple: LibraryAlbum records (shared, treat as read-only)
+        """
+        return self._albums
+    
+    def resolve_album(self, artist, album, album_dir=None):
+        """
+        Find the tracks of an album with dictionary lookups instead of MPD queries.
+        
+        Tried in order, each filtered by album_dir when given:
+        1. AlbumArtist (else Artist) and album name, compared by norm_key()
+        2. A track artist on someone else's album (guest spots, compilations)
+        3. An album of that artist whose name contains, or is contained in, the name
+        4. The album name alone (an artist that matches no tag, e.g. a joined
+           "A, B" display artist)
+        Without an artist the album name alone is used.
+        
+        Args:
+            artist (str): Album artist or track artist (may be empty)
+            album (str): Album name
+            album_dir (str): Only tracks in this directory or below it
+        
+        Returns:
+            list: Song dicts ordered by disc, directory and track number ([] if unknown)
+        """
+        artist_key = norm_key(artist)
+        album_key = norm_key(album)
+        with self._lock:
+            album_keys = self._album_keys
+            albums_by_artist = self._albums_by_artist
+            albums_by_name = self._albums_by_name
+            artist_album_tracks = self._artist_album_tracks
+        
+        def in_dir(directory):
+            return not album_dir or directory == album_dir or directory.startswith(album_dir.rstrip('/') + '/')
+        
+        def from_records(records):
+            records = [r for r in records if in_dir(r.directory)]
+            if len(records) == 1:
+                return records[0].tracks
+            return sorted((t for r in records for t in r.tracks), key=album_order)
+        
+        if not artist_key:
+            tracks = from_records(albums_by_name.get(album_key, ()))
+        else:
+            tracks = from_records(album_keys.get((artist_key, album_key), ()))
+            if not tracks:
+                tracks = sorted((t for t in artist_album_tracks.get((artist_key, album_key), ())
+                                 if in_dir(t.directory)), key=album_order)
+            if not tracks and album_key:
+                close = [r for r in albums_by_artist.get(artist_key, ())
+                         if in_dir(r.directory) and norm_key(r.album)
+                         and (album_key in norm_key(r.album) or norm_key(r.album) in album_key)]
+                if close:
+                    # Stay on one album when several names are close
+                    name = norm_key(close[0].album)
+                    tracks = from_records(r for r in close if norm_key(r.album) == name)
+            if not tracks and album_key:
+                tracks = from_records(albums_by_name.get(album_key, ()))
+        return [t.as_dict() for t in tracks]
+    
+    def artists(self, genre):
+        """
+        Artists (AlbumArtist, else Artist) with songs in a genre.
+        
+        Args:
+            genre (str): Exact genre name
+        
+        Returns:
+            dict: {artist: set of album names}
+        """
+        with self._lock:
+            artists = self._tree.get(genre, {})
+            return {artist: set(albums) for artist, albums in artists.items()}
+    
+    def albums(self, genre, artist):
+        """
+        Albums of an artist within a genre, one entry per directory.
+        
+        Args:
+            genre (str): Exact genre name
+            artist (str): AlbumArtist/Artist as returned by artists()
+        
+        Returns:
+            dict: {album: {directory: [song dicts]}}
+        """
+        with self._lock:
+            albums = self._tree.get(genre, {}).get(artist, {})
+            return {album: {d: [t.as_dict() for t in tracks] for d, tracks in dirs.items()}
+                    for album, dirs in albums.items()}
+    
+    def reader(self, searcher=None):
+        """
+        Get a read-only client-like view of the index.
+        
+        Args:
+            searcher (callable): Optional searcher(query, tag=...) returning song dicts,
+                used for two-argument search() calls instead of the substring scan
+        
+        Returns:
+            LibraryReader: Object usable in place of an MPD client for library queries
+        """
+        return LibraryReader(self, searcher)
+    
+    def stats(self):
+        """Get refresh counters plus sizes of the loaded index."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'loaded': self._loaded,
+                'version': self._version,
+                'tracks': len(self._tracks),
+                'directories': len(self._by_dir),
+                'genres': len(self._tree),
+                'artists': len(self._by_tag['artist']),
+                'albums': len(self._by_tag['album']),
+                'album_records': len(self._albums),
+                'album_keys': len(self._album_keys),
+            })
+            return stats
+
+
+class LibraryReader:
+    """Read-only MPD client stand-in answering library queries from a LibraryIndex."""
+    
+    def __init__(self, index, searcher=None):
+        """
+        Initialize the reader.
+        
+        Args:
+            index (LibraryIndex): Loaded index to query
+            searcher (callable): Optional ranked searcher for single-tag searches
+        """
+        self._index = index
+        self._searcher = searcher
+    
+    def find(self, *args):
+        return self._index.find(*args)
+    
+    def search(self, *args):
+        if self._searcher is not None and len(args) == 2:
+            return self._searcher(str(args[1]), tag=str(args[0]).lower())
+        return self._index.search(*args)
+    
+    def list(self, tag, *args):
+        return self._index.list(tag, *args)
+    
+    def listallinfo(self, path=''):
+        return self._index.listallinfo(path)
+    
+    def stats(self):
+        """MPD-style stats: song count and the db_update stamp the index was loaded at."""
+        stats = {'songs': str(len(self._index))}
+        if self._index.db_update is not None:
+            stats['db_update'] = self._index.db_update
+        return stats
+    
+    def ping(self):
+        return None
+    
+    def disconnect(self):
+        """No-op: there is no connection to release."""
+        return None
@@ -0,0 +1,315 @@
+"""
+MPD idle monitoring - event-driven replacement for status polling
+
+Provides:
+- MPDIdleWatcher: background thread that blocks on MPD's `idle` command over its
+  own long-lived connection and reports which subsystems changed
+- MPDStateCache: in-memory copy of status/currentsong/next song that refreshes
+  only the parts affected by a change and extrapolates elapsed time locally
+  (optionally backed by a QueueMirror for the queue contents)
+"""
+
+from mpd import MPDClient, ConnectionError, ProtocolError
+import logging
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Subsystems that affect what the UI shows
+DEFAULT_IDLE_SUBSYSTEMS = ('player', 'mixer', 'options', 'playlist', 'database', 'update')
+
+# Which cached parts must be re-read after each subsystem fires
+_SUBSYSTEM_REFRESH = {
+    'player': ('status', 'currentsong', 'nextsong'),
+    'playlist': ('status', 'currentsong', 'nextsong'),
+    'mixer': ('status',),
+    'options': ('status',),
+    'database': ('status', 'currentsong', 'nextsong'),
+    'update': ('status',),
+}
+_FULL_REFRESH = ('status', 'currentsong', 'nextsong')
+
+
+class MPDStateCache:
+    """Thread-safe cache of the MPD player state used to build status displays."""
+    
+    def __init__(self, queue=None):
+        """
+        Initialize an empty cache (nothing fetched yet).
+        
+        Args:
+            queue (QueueMirror): Optional queue mirror; when given, the next song is
+                read from the mirror (synced incrementally) instead of playlistinfo
+        """
+        self._queue = queue
+        self._lock = threading.Lock()
+        self._status = {}
+        self._current_song = {}
+        self._next_song = {}
+        self._fetched_at = 0.0
+        self._loaded = False
+        self._stats = {'refreshes': 0, 'commands': 0}
+    
+    @property
+    def loaded(self):
+        """bool: True once a full refresh has populated the cache."""
+        return self._loaded
+    
+    def refresh(self, client, subsystems=None):
+        """
+        Re-read the parts of the state affected by the given subsystems.
+        
+        Args:
+            client: Connected MPD client (plain or pooled)
+            subsystems (iterable): Changed subsystems as reported by `idle`.
+                None forces a full refresh.
+        
+        Returns:
+            set: Names of the parts that were re-read
+        """
+        if subsystems is None or not self._loaded:
+            parts = set(_FULL_REFRESH)
+        else:
+            parts = set()
+            for subsystem in subsystems:
+                parts.update(_SUBSYSTEM_REFRESH.get(subsystem, ()))
+        if not parts:
+            return parts
+        
+        commands = 0
+        status = self._status
+        current_song = self._current_song
+        next_song = self._next_song
+        if 'status' in parts:
+            status = client.status()
+            commands += 1
+        fetched_at = time.time()
+        if 'currentsong' in parts:
+            current_song = client.currentsong()
+            commands += 1
+        if 'nextsong' in parts:
+            next_song = {}
+            try:
+                next_pos = int(status.get('song', -1)) + 1
+                queue_length = int(status.get('playlistlength', 0))
+            except (ValueError, TypeError):
+                next_pos, queue_length = 0, 0
+            if self._queue is not None:
+                self._queue.sync(client, status)
+                if 0 < next_pos < queue_length:
+                    next_song = self._queue.get(next_pos) or {}
+            elif 0 < next_pos < queue_length:
+                found = client.playlistinfo(next_pos)
+                commands += 1
+                if found:
+                    next_song = found[0]
+        
+        with self._lock:
+            self._status = status
+            self._current_song = current_song
+            self._next_song = next_song
+            if 'status' in parts:
+                self._fetched_at = fetched_at
+            self._loaded = True
+            self._stats['refreshes'] += 1
+            self._stats['commands'] += commands
+        return parts
+    
+    def snapshot(self):
+        """
+        Get a consistent copy of the cached state.
+        
+        Returns:
+            tuple: (status dict, currentsong dict, next song dict, fetched_at timestamp)
+        """
+        with self._lock:
+            return dict(self._status), dict(self._current_song), dict(self._next_song), self._fetched_at
+    
+    def elapsed(self, now=None):
+        """
+        Extrapolate playback position from the last status read.
+        
+        Args:
+            now (float): Current time (defaults to time.time())
+        
+        Returns:
+            float: Elapsed seconds, clamped to the song duration when known
+        """
+        with self._lock:
+            status = self._status
+            fetched_at = self._fetched_at
+            duration = status.get('duration') or self._current_song.get('time')
+        return extrapolate_elapsed(status.get('elapsed'), fetched_at, status.get('state'),
+                                   duration=duration, now=now)
+    
+    def invalidate(self):
+        """Forget cached state so the next refresh reads everything."""
+        with self._lock:
+            self._loaded = False
+    
+    def stats(self):
+        """Get refresh counters (refreshes, MPD commands issued)."""
+        with self._lock:
+            return dict(self._stats)
+
+
+def extrapolate_elapsed(elapsed, timestamp, state, duration=None, now=None):
+    """
+    Compute the current playback position from a timestamped reading.
+    
+    Args:
+        elapsed: Elapsed seconds at `timestamp` (str or float, may be None)
+        timestamp (float): Wall-clock time the reading was taken
+        state (str): MPD player state ('play', 'pause', 'stop')
+        duration: Song duration in seconds, used as an upper bound (optional)
+        now (float): Current time (defaults to time.time())
+    
+    Returns:
+        float: Estimated elapsed seconds
+    """
+    try:
+        position = float(elapsed or 0.0)
+    except (ValueError, TypeError):
+        position = 0.0
+    if state == 'play' and timestamp:
+        if now is None:
+            now = time.time()
+        position += max(0.0, now - timestamp)
+        try:
+            limit = float(duration or 0.0)
+        except (ValueError, TypeError):
+            limit = 0.0
+        if limit > 0:
+            position = min(position, limit)
+    return position
+
+
+class MPDIdleWatcher:
+    """Background thread that waits on MPD `idle` and reports changed subsystems."""
+    
+    def __init__(self, host='localhost', port=6600, on_change=None, on_disconnect=None,
+                 subsystems=DEFAULT_IDLE_SUBSYSTEMS, timeout=30,
+                 reconnect_delay=1, max_reconnect_delay=30):
+        """
+        Initialize the watcher (call start() to begin watching).
+        
+        Args:
+            host (str): MPD server hostname or IP. Default: 'localhost'
+            port (int): MPD server port. Default: 6600
+            on_change (callable): Called as on_change(client, subsystems) after connecting
+                (subsystems=None) and after every idle wakeup. The client may be used
+                for follow-up commands before idling resumes.
+            on_disconnect (callable): Called as on_disconnect(error) when the connection drops
+            subsystems (tuple): Subsystems to idle on
+            timeout (int): Socket timeout for regular commands in seconds. Default: 30
+            reconnect_delay (float): Initial delay before reconnecting in seconds. Default: 1
+            max_reconnect_delay (float): Upper bound for reconnect backoff. Default: 30
+        """
+        self.host = host
+        self.port = port
+        self.on_change = on_change
+        self.on_disconnect = on_disconnect
+        self.subsystems = tuple(subsystems)
+        self.timeout = timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._client = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._connected = False
+        self._stats = {'connects': 0, 'wakeups': 0, 'disconnects': 0}
+    
+    @property
+    def connected(self):
+        """bool: True while the idle connection is up."""
+        return self._connected
+    
+    def start(self):
+        """Start the watcher thread (no-op if already running)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='mpd-idle-watcher', daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout=5):
+        """
+        Stop watching and close the idle connection.
+        
+        Args:
+            timeout (float): Seconds to wait for the thread to exit
+        """
+        self._stop_event.set()
+        client = self._client
+        if client is not None:
+            # Closing the socket unblocks the pending idle read
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+    
+    def stats(self):
+        """Get watcher counters (connects, wakeups, disconnects) and connection state."""
+        stats = dict(self._stats)
+        stats['connected'] = self._connected
+        return stats
+    
+    def _connect(self):
+        """Open the dedicated idle connection."""
+        client = MPDClient()
+        client.timeout = self.timeout
+        client.idletimeout = None
+        client.connect(self.host, self.port)
+        return client
+    
+    def _notify(self, client, subsystems):
+        """Invoke the change callback, isolating its failures from the idle loop."""
+        if not self.on_change:
+            return
+        try:
+            self.on_change(client, subsystems)
+        except (ConnectionError, ProtocolError, socket.error):
+            raise
+        except Exception as e:
+            logger.error(f"Idle change handler failed: {e}")
+    
+    def _run(self):
+        """Idle loop with exponential reconnect backoff."""
+        delay = self.reconnect_delay
+        while not self._stop_event.is_set():
+            try:
+                self._client = self._connect()
+                self._connected = True
+                self._stats['connects'] += 1
+                delay = self.reconnect_delay
+                logger.info(f"Idle watcher connected to MPD at {self.host}:{self.port}")
+                self._notify(self._client, None)
+                while not self._stop_event.is_set():
+                    changed = self._client.idle(*self.subsystems)
+                    self._stats['wakeups'] += 1
+                    self._notify(self._client, set(changed))
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                logger.warning(f"Idle watcher lost MPD connection: {e}")
+                self._stats['disconnects'] += 1
+                self._connected = False
+                if self.on_disconnect:
+                    try:
+                        self.on_disconnect(e)
+                    except Exception as cb_error:
+                        logger.error(f"Idle disconnect handler failed: {cb_error}")
+            finally:
+                self._connected = False
+                if self._client is not None:
+                    try:
+                        self._client.disconnect()
+                    except Exception:
+                        pass
+                    self._client = None
+            self._stop_event.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
@@ -5,13 +5,72 @@ This service provides a clean interface for interacting with MPD, with:
 - Explicit dependency injection (host, port, timeout via constructor)
 - Error handling and connection management
 - Wrapper methods for all MPD operations used in the app
+- MPDConnectionPool: bounded, thread-safe pool of persistent connections
+- add_uris_batched: bulk queue additions over command lists
 """
 
-from mpd import MPDClient, ConnectionError, CommandError
+from mpd import MPDClient, ConnectionError, CommandError, ProtocolError
+from contextlib import contextmanager
+from collections import deque
 import logging
+import socket
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Errors that mean the underlying socket can no longer be trusted
+_BROKEN_CONNECTION_ERRORS = (ConnectionError, ProtocolError, socket.error)
+
+# Default number of add commands sent per command list
+ADD_BATCH_SIZE = 500
+
+
+def add_uris_batched(client, uris, chunk=ADD_BATCH_SIZE):
+    """
+    Add many URIs to the queue using command lists.
+    
+    Each chunk is sent as one command_list_ok_begin/command_list_end round-trip.
+    MPD aborts a command list at the first failing command, so on a CommandError
+    the offending URI (identified by the error offset) is recorded and the rest of
+    the chunk is resent.
+    
+    Args:
+        client: Connected MPD client (plain or pooled)
+        uris (iterable): Song URIs or directories to add, in order
+        chunk (int): Maximum commands per command list. Default: 500
+    
+    Returns:
+        dict: {'added': int, 'failed': [(uri, error message)], 'round_trips': int}
+    """
+    uris = [uri for uri in uris if uri]
+    chunk = max(1, int(chunk))
+    result = {'added': 0, 'failed': [], 'round_trips': 0}
+    start = 0
+    while start < len(uris):
+        batch = uris[start:start + chunk]
+        result['round_trips'] += 1
+        client.command_list_ok_begin()
+        for uri in batch:
+            client.add(uri)
+        try:
+            client.command_list_end()
+        except CommandError as e:
+            offset = e.offset if isinstance(e.offset, int) and 0 <= e.offset < len(batch) else None
+            if offset is None:
+                # Cannot tell how much of the list MPD applied; resending could duplicate
+                logger.error(f"Command list add failed without an offset: {e}")
+                result['failed'].extend((uri, e.msg or str(e)) for uri in batch)
+                start += len(batch)
+                continue
+            result['added'] += offset
+            result['failed'].append((batch[offset], e.msg or str(e)))
+            start += offset + 1
+            continue
+        result['added'] += len(batch)
+        start += len(batch)
+    return result
+
 
 class MPDService:
     """Service for managing MPD client connections and operations."""
@@ -309,6 +368,28 @@ class MPDService:
             logger.error(f"Error adding to playlist: {e}")
             return False
     
+    def add_many(self, uris, chunk=ADD_BATCH_SIZE):
+        """
+        Add many songs to the playlist in ceil(N/chunk) round-trips.
+        
+        Args:
+            uris (iterable): Song file paths or directories
+            chunk (int): Maximum commands per command list. Default: 500
+        
+        Returns:
+            dict: {'added': int, 'failed': [(uri, error message)], 'round_trips': int}
+        """
+        uris = [uri for uri in uris if uri]
+        client = self.get_client()
+        if not client:
+            return {'added': 0, 'failed': [(uri, 'Not connected to MPD') for uri in uris], 'round_trips': 0}
+        
+        try:
+            return add_uris_batched(client, uris, chunk)
+        except Exception as e:
+            logger.error(f"Error adding songs to playlist: {e}")
+            return {'added': 0, 'failed': [(uri, str(e)) for uri in uris], 'round_trips': 0}
+    
     def clear(self):
         """
         Clear the entire playlist.
@@ -512,3 +593,283 @@ class MPDService:
     def __del__(self):
         """Cleanup on object destruction."""
         self.close()
+
+
+class PooledMPDClient:
+    """
+    An MPD connection checked out of an MPDConnectionPool.
+    
+    Behaves like an MPDClient (all commands are proxied), but disconnect()
+    and close() hand the connection back to the pool instead of closing
+    the socket. Existing call sites that do ``client = connect(); ...;
+    client.disconnect()`` therefore work unchanged.
+    """
+    
+    # Class-level defaults keep __getattr__ from recursing during teardown
+    _pool = None
+    _client = None
+    _released = True
+    _broken = False
+    
+    def __init__(self, pool, client):
+        self._pool = pool
+        self._client = client
+        self._released = False
+        self._broken = False
+    
+    @property
+    def raw_client(self):
+        """The underlying MPDClient (for code that needs the real object)."""
+        return self._client
+    
+    def __getattr__(self, name):
+        if self._released:
+            raise ConnectionError("Pooled MPD connection already returned to pool")
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+        
+        def _call(*args, **kwargs):
+            try:
+                return attr(*args, **kwargs)
+            except _BROKEN_CONNECTION_ERRORS:
+                # Socket is dead or out of sync - never hand it out again
+                self._broken = True
+                raise
+        return _call
+    
+    def disconnect(self):
+        """Return the connection to the pool (does not close the socket)."""
+        if not self._released:
+            self._released = True
+            self._pool._release(self._client, broken=self._broken)
+    
+    close = disconnect
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disconnect()
+        return False
+    
+    def __del__(self):
+        # Safety net for handlers that return early without disconnect()
+        try:
+            self.disconnect()
+        except Exception:
+            pass
+
+
+class MPDConnectionPool:
+    """
+    Bounded, thread-safe pool of persistent MPD connections.
+    
+    Connections are opened lazily on first demand, health-checked with a
+    ping when they have been idle for a while, and discarded (then lazily
+    reopened) when a command fails at the socket level. At most
+    ``max_size`` connections exist at once; callers block for up to
+    ``acquire_timeout`` seconds waiting for one to be returned.
+    """
+    
+    def __init__(self, host='localhost', port=6600, timeout=30, idletimeout=None,
+                 max_size=8, acquire_timeout=10, health_check_interval=10,
+                 max_idle_time=50):
+        """
+        Initialize the pool (no connections are opened yet).
+        
+        Args:
+            host (str): MPD server hostname or IP. Default: 'localhost'
+            port (int): MPD server port. Default: 6600
+            timeout (int): Socket timeout for each connection. Default: 30
+            idletimeout (int): Timeout for idle commands. Default: None
+            max_size (int): Maximum number of open connections. Default: 8
+            acquire_timeout (float): Seconds to wait for a free connection. Default: 10
+            health_check_interval (float): Ping connections idle longer than this. Default: 10
+            max_idle_time (float): Drop connections idle longer than this instead of
+                pinging (MPD closes idle clients after connection_timeout, 60s by default).
+                Default: 50
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.idletimeout = idletimeout
+        self.max_size = max(1, int(max_size))
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+        self.max_idle_time = max_idle_time
+        
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = deque()  # (MPDClient, last_used_monotonic), most recent on the right
+        self._in_use = 0
+        self._stats = {
+            'connects': 0,
+            'connect_failures': 0,
+            'acquires': 0,
+            'reuses': 0,
+            'discards': 0,
+            'timeouts': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+        }
+    
+    def _open(self):
+        """Open a brand new MPD connection, or return None on failure."""
+        client = MPDClient()
+        client.timeout = self.timeout
+        client.idletimeout = self.idletimeout
+        try:
+            client.connect(self.host, self.port)
+        except Exception as e:
+            logger.error(f"MPD pool could not connect to {self.host}:{self.port}: {e}")
+            with self._cond:
+                self._stats['connect_failures'] += 1
+            return None
+        with self._cond:
+            self._stats['connects'] += 1
+        return client
+    
+    @staticmethod
+    def _close_quietly(client):
+        try:
+            client.disconnect()
+        except Exception:
+            pass
+    
+    def _is_healthy(self, client, idle_for):
+        """Decide whether an idle connection can be handed out again."""
+        if idle_for > self.max_idle_time:
+            return False
+        if idle_for > self.health_check_interval:
+            try:
+                client.ping()
+            except Exception as e:
+                logger.debug(f"MPD pool health check failed: {e}")
+                return False
+        return True
+    
+    def acquire(self, timeout=None):
+        """
+        Check out a connection from the pool.
+        
+        Args:
+            timeout (float, optional): Seconds to wait for a free slot.
+                Defaults to the pool's acquire_timeout.
+        
+        Returns:
+            PooledMPDClient: Connected client, or None if MPD is unreachable
+            or the pool stayed exhausted for the whole timeout.
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        
+        while True:
+            candidate = None
+            idle_for = 0.0
+            with self._cond:
+                while not self._idle and self._in_use >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        self._record_wait(started)
+                        logger.warning(f"MPD pool exhausted ({self.max_size} connections in use)")
+                        return None
+                    self._cond.wait(remaining)
+                
+                self._in_use += 1
+                if self._idle:
+                    candidate, last_used = self._idle.pop()
+                    idle_for = time.monotonic() - last_used
+            
+            if candidate is not None:
+                if self._is_healthy(candidate, idle_for):
+                    with self._cond:
+                        self._stats['reuses'] += 1
+                        self._stats['acquires'] += 1
+                        self._record_wait(started)
+                    return PooledMPDClient(self, candidate)
+                # Stale connection: drop it and try again (lazy reconnect)
+                self._close_quietly(candidate)
+                with self._cond:
+                    self._stats['discards'] += 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                continue
+            
+            client = self._open()
+            with self._cond:
+                if client is None:
+                    self._in_use -= 1
+                    self._cond.notify()
+                    self._record_wait(started)
+                    return None
+                self._stats['acquires'] += 1
+                self._record_wait(started)
+            return PooledMPDClient(self, client)
+    
+    def _record_wait(self, started):
+        """Accumulate checkout wait time. Caller must hold the lock."""
+        waited = time.monotonic() - started
+        self._stats['wait_time_total'] += waited
+        if waited > self._stats['wait_time_max']:
+            self._stats['wait_time_max'] = waited
+    
+    def _release(self, client, broken=False):
+        """Return a raw client to the pool (called by PooledMPDClient)."""
+        # A connection left mid command-list or mid-iteration is out of sync
+        if isinstance(getattr(client, '_command_list', None), list) or getattr(client, '_iterating', False) is True:
+            broken = True
+        if broken:
+            self._close_quietly(client)
+        with self._cond:
+            self._in_use = max(0, self._in_use - 1)
+            if broken:
+                self._stats['discards'] += 1
+            else:
+                self._idle.append((client, time.monotonic()))
+            self._cond.notify()
+    
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Context manager for a pooled connection.
+        
+        Yields:
+            PooledMPDClient or None: None if no connection could be obtained.
+        
+        Example:
+            with pool.connection() as client:
+                if client:
+                    client.play()
+        """
+        lease = self.acquire(timeout=timeout)
+        try:
+            yield lease
+        finally:
+            if lease is not None:
+                lease.disconnect()
+    
+    def stats(self):
+        """
+        Snapshot of pool counters.
+        
+        Returns:
+            dict: Sizes, connect/reuse/discard counts and checkout wait times
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats['max_size'] = self.max_size
+            stats['in_use'] = self._in_use
+            stats['idle'] = len(self._idle)
+        acquires = stats['acquires'] + stats['timeouts']
+        stats['wait_time_avg'] = (stats['wait_time_total'] / acquires) if acquires else 0.0
+        return stats
+    
+    def close_all(self):
+        """Close every idle connection (checked-out ones close on return)."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+        for client, _ in idle:
+            self._close_quietly(client)
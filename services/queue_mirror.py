@@ -0,0 +1,167 @@
+"""
+QueueMirror - in-memory copy of the MPD play queue
+
+Keeps a local mirror of the queue in sync using MPD's playlist version:
+- First sync (or after an MPD restart) loads the queue with playlistinfo
+- Later syncs ask only for what changed since the mirrored version, using
+  plchangesposid (positions and ids only) and falling back to plchanges for
+  songs the mirror has never seen
+- Unchanged queues cost a single status() call, or nothing when the caller
+  already has a fresh status
+"""
+
+import logging
+import threading
+
+from mpd import CommandError
+
+logger = logging.getLogger(__name__)
+
+
+class QueueMirror:
+    """Thread-safe mirror of the MPD queue keyed by playlist version."""
+    
+    def __init__(self):
+        """Initialize an empty, unsynced mirror."""
+        self._lock = threading.RLock()
+        self._songs = []
+        self._by_id = {}
+        self._version = None
+        self._stats = {'full_loads': 0, 'incremental_syncs': 0, 'changes_applied': 0, 'songs_fetched': 0}
+    
+    @property
+    def version(self):
+        """int: Playlist version the mirror reflects (None until first sync)."""
+        return self._version
+    
+    def __len__(self):
+        return len(self._songs)
+    
+    def sync(self, client, status=None):
+        """
+        Bring the mirror up to date with the server.
+        
+        Args:
+            client: Connected MPD client (plain or pooled)
+            status (dict): A status() result the caller already holds (saves a round-trip)
+        
+        Returns:
+            int: Number of queue positions that changed (-1 for a full reload)
+        """
+        with self._lock:
+            if status is None:
+                status = client.status()
+            try:
+                version = int(status.get('playlist', 0))
+                length = int(status.get('playlistlength', 0))
+            except (ValueError, TypeError):
+                return self._full_load(client)
+            
+            if self._version is None or version < self._version:
+                return self._full_load(client, version)
+            if version == self._version:
+                return 0
+            
+            try:
+                changed = self._apply_changes(client, length)
+            except CommandError as e:
+                logger.warning(f"plchanges failed ({e}), reloading queue")
+                return self._full_load(client, version)
+            if changed is None:
+                logger.warning("Queue mirror out of step with MPD, reloading queue")
+                return self._full_load(client, version)
+            self._version = version
+            self._stats['incremental_syncs'] += 1
+            self._stats['changes_applied'] += changed
+            return changed
+    
+    def _full_load(self, client, version=None):
+        """Replace the mirror with a fresh playlistinfo()."""
+        songs = client.playlistinfo()
+        if version is None:
+            try:
+                version = int(client.status().get('playlist', 0))
+            except (ValueError, TypeError):
+                version = 0
+        self._songs = [self._normalize(song, pos) for pos, song in enumerate(songs)]
+        self._by_id = {song.get('id'): song for song in self._songs}
+        self._version = version
+        self._stats['full_loads'] += 1
+        self._stats['songs_fetched'] += len(songs)
+        return -1
+    
+    def _apply_changes(self, client, length):
+        """Apply position/id changes since the mirrored version (None if it leaves gaps)."""
+        changes = client.plchangesposid(self._version)
+        unknown = [c for c in changes if c.get('id') not in self._by_id]
+        if unknown:
+            # New songs need full tags; plchanges returns them for every changed position
+            fetched = client.plchanges(self._version)
+            self._stats['songs_fetched'] += len(fetched)
+            for song in fetched:
+                self._by_id[song.get('id')] = song
+            changes = [{'cpos': song.get('pos'), 'id': song.get('id')} for song in fetched]
+        
+        songs = self._songs[:length]
+        if len(songs) < length:
+            songs.extend([None] * (length - len(songs)))
+        for change in changes:
+            try:
+                pos = int(change.get('cpos'))
+            except (ValueError, TypeError):
+                continue
+            if 0 <= pos < length:
+                songs[pos] = self._normalize(self._by_id[change.get('id')], pos)
+        
+        if any(song is None for song in songs):
+            return None
+        self._songs = songs
+        self._by_id = {song.get('id'): song for song in songs}
+        return len(changes)
+    
+    @staticmethod
+    def _normalize(song, pos):
+        """Copy a song dict with its queue position set as an int."""
+        song = dict(song)
+        song['pos'] = pos
+        return song
+    
+    def playlist(self):
+        """
+        Get the mirrored queue.
+        
+        Returns:
+            list: Copies of the song dicts, each with an int 'pos'
+        """
+        with self._lock:
+            return [dict(song) for song in self._songs]
+    
+    def get(self, pos):
+        """
+        Get the song at a queue position.
+        
+        Args:
+            pos (int): Zero-based position
+        
+        Returns:
+            dict: Copy of the song, or None if out of range
+        """
+        with self._lock:
+            if 0 <= pos < len(self._songs):
+                return dict(self._songs[pos])
+            return None
+    
+    def invalidate(self):
+        """Drop the mirror so the next sync reloads the whole queue."""
+        with self._lock:
+            self._songs = []
+            self._by_id = {}
+            self._version = None
+    
+    def stats(self):
+        """Get sync counters plus the mirrored version and length."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['version'] = self._version
+            stats['length'] = len(self._songs)
+            return stats
@@ -0,0 +1,181 @@
+"""
+RecentAlbumsIndex - newest albums in the configured directories, by last-modified
+
+Builds compact album summaries from the library index instead of running
+listallinfo over every recent-albums directory and keeping each song dict:
+- One summary per (source directory, album artist, album); disc folders of
+  the same album are merged
+- Summaries are kept sorted newest first, so recent(limit) is a slice
+- Rebuilt only when the library index reloads (MPD 'database' events) or the
+  configured directories change
+"""
+
+import logging
+import threading
+
+from services.library_index import disc_number
+
+logger = logging.getLogger(__name__)
+
+
+def _format_duration(total):
+    """Seconds -> 'M:SS' or 'H:MM:SS'."""
+    hours, rest = divmod(total, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours > 0:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class RecentAlbum:
+    """Summary of one recently added album."""
+    
+    __slots__ = ('album', 'artist', 'original_artist', 'genre', 'source_dir', 'date',
+                 'file_count', 'duration', 'sample_file', 'discs')
+    
+    def __init__(self, source_dir, record):
+        """
+        Start a summary from the first LibraryAlbum record found for it.
+        
+        Args:
+            source_dir (str): Configured directory the album was found in
+            record (LibraryAlbum): Album record from the library index
+        """
+        first = record.tracks[0]
+        artists = first.tag('albumartist') or first.tag('artist') or 'Unknown Artist'
+        if isinstance(artists, list):
+            self.artist = ', '.join(artists)
+            self.original_artist = artists[0]
+        else:
+            self.artist = self.original_artist = artists
+        self.album = record.album
+        self.genre = first.tag('genre') or 'Unknown Genre'
+        self.source_dir = source_dir
+        self.date = ''
+        self.file_count = 0
+        self.duration = 0
+        self.sample_file = record.sample_file
+        self.discs = {}
+    
+    def add(self, record):
+        """Fold the tracks of one album directory into the summary."""
+        for track in record.tracks:
+            self.file_count += 1
+            if track.last_modified and track.last_modified > self.date:
+                self.date = track.last_modified
+            try:
+                self.duration += int(track.time or 0)
+            except ValueError:
+                pass
+            disc = disc_number(track)
+            self.discs[disc] = self.discs.get(disc, 0) + 1
+    
+    def as_dict(self):
+        """
+        Convert to the /recent_albums JSON shape.
+        
+        Returns:
+            dict: album, artist (with source directory), original_artist, genre, date,
+                file_count, duration, duration_formatted, sample_file,
+                disc_structure ({disc: track count} if multi-disc, else None), is_multi_disc
+        """
+        multi_disc = max(self.discs, default=1) > 1
+        return {
+            'album': self.album,
+            'artist': f"{self.artist} [{self.source_dir}]",
+            'original_artist': self.original_artist,
+            'genre': self.genre,
+            'date': self.date,
+            'file_count': self.file_count,
+            'duration': self.duration,
+            'duration_formatted': _format_duration(self.duration),
+            'sample_file': self.sample_file,
+            'disc_structure': dict(sorted(self.discs.items())) if multi_disc else None,
+            'is_multi_disc': multi_disc and len(self.discs) > 1,
+        }
+
+
+class RecentAlbumsIndex:
+    """Thread-safe newest-first album summaries over a LibraryIndex."""
+    
+    def __init__(self, index):
+        """
+        Initialize the recent albums index.
+        
+        Args:
+            index (LibraryIndex): Library index the summaries are built from
+        """
+        self._index = index
+        self._lock = threading.Lock()
+        self._version = None
+        self._directories = ()
+        self._albums = []
+        self._stats = {'rebuilds': 0, 'queries': 0}
+    
+    @staticmethod
+    def _source_dir(directory, sources):
+        """The configured directory containing an album directory, or None."""
+        for source in sources:
+            if directory == source or directory.startswith(source + '/'):
+                return source
+        return None
+    
+    def refresh(self, directories):
+        """
+        Rebuild the summaries if the library index or the directories changed.
+        
+        Args:
+            directories (iterable): Music-root-relative directories to collect albums from
+        
+        Returns:
+            bool: True if the summaries were rebuilt
+        """
+        sources = tuple(d.strip('/') for d in directories if d and d.strip('/'))
+        with self._lock:
+            version = self._index.version
+            if version == self._version and sources == self._directories:
+                return False
+            albums = {}
+            for record in self._index.album_table():
+                source = self._source_dir(record.directory, sources)
+                if source is None or not record.tracks:
+                    continue
+                key = (source, record.artist, record.album)
+                summary = albums.get(key)
+                if summary is None:
+                    summary = albums[key] = RecentAlbum(source, record)
+                summary.add(record)
+            self._albums = sorted(albums.values(), key=lambda album: album.date, reverse=True)
+            self._version = version
+            self._directories = sources
+            self._stats['rebuilds'] += 1
+        logger.info(f"Recent albums index: {len(self._albums)} albums in {list(sources)}")
+        return True
+    
+    def recent(self, limit=25, directories=('ripped',)):
+        """
+        Newest albums first.
+        
+        Args:
+            limit (int): Albums wanted. Default: 25
+            directories (iterable): Configured recent-albums directories
+        
+        Returns:
+            list: Album dicts (see RecentAlbum.as_dict)
+        """
+        self.refresh(directories)
+        with self._lock:
+            self._stats['queries'] += 1
+            return [album.as_dict() for album in self._albums[:max(limit, 0)]]
+    
+    def invalidate(self):
+        """Force a rebuild on the next query."""
+        with self._lock:
+            self._version = None
+    
+    def stats(self):
+        """Get rebuild/query counters and the number of summaries."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({'albums': len(self._albums), 'directories': list(self._directories)})
+            return stats
@@ -0,0 +1,138 @@
+"""
+Search Service - the built-in search used when rudimentary_search is not installed
+
+Turns a search tag and query into the result rows search_results.html renders:
+- 'artist': the artist's albums, one row per (album, directory), from a single
+  `find` instead of one `find` per album
+- 'album' and 'any': matching songs grouped into album rows
+- anything else: individual song rows
+
+The client may be a real MPD client or a LibraryReader over the library index.
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def _first(value):
+    """First value of a possibly multi-valued tag."""
+    if isinstance(value, list):
+        return value[0] if value else ''
+    return value
+
+
+def _album_row(artist, album, song):
+    """Start an album result row from its first song."""
+    return {
+        'item_type': 'album',
+        'artist': artist,
+        'album': album,
+        'genre': song.get('genre', 'Unknown Genre'),
+        'track_count': 0,
+        'sample_file': song.get('file', ''),
+    }
+
+
+def group_by_album(songs):
+    """
+    Group songs into album rows keyed by (artist, album, directory).
+    
+    Args:
+        songs (list): MPD song dicts
+    
+    Returns:
+        list: Album rows in order of first appearance
+    """
+    albums = {}
+    for song in songs:
+        album_name = song.get('album', 'Unknown Album')
+        artist_name = song.get('artist', 'Unknown Artist')
+        song_file = song.get('file', '')
+        album_dir = os.path.dirname(song_file) if song_file else ''
+        album_key = f"{artist_name}|||{album_name}|||{album_dir}"
+        
+        if album_key not in albums:
+            albums[album_key] = _album_row(artist_name, album_name, song)
+        albums[album_key]['track_count'] += 1
+    return list(albums.values())
+
+
+def artist_albums(client, artist):
+    """
+    Albums of one artist from a single exact `find`, grouped in Python.
+    
+    Replaces list('album', 'artist', ...) followed by a find() per album, which
+    cost one MPD round-trip per album.
+    
+    Args:
+        client: MPD client or LibraryReader
+        artist (str): Exact artist name
+    
+    Returns:
+        list: Album rows sorted by album name and directory; songs without an
+            album tag are left out
+    """
+    albums = {}
+    for song in client.find('artist', artist):
+        album_name = _first(song.get('album'))
+        if not album_name:
+            continue
+        song_file = song.get('file', '')
+        key = (album_name, os.path.dirname(song_file) if song_file else '')
+        row = albums.get(key)
+        if row is None:
+            row = albums[key] = _album_row(artist, album_name, song)
+        row['track_count'] += 1
+    return [albums[key] for key in sorted(albums)]
+
+
+def perform_search(client, search_tag, query):
+    """
+    Run a search and format the results for search_results.html.
+    
+    Args:
+        client: MPD client or LibraryReader
+        search_tag (str): 'artist', 'album', 'any', 'title' or another MPD tag
+        query (str): Search text
+    
+    Returns:
+        list: Album rows (item_type 'album') or song rows (item_type 'song');
+            [] on error
+    """
+    try:
+        if search_tag == 'artist':
+            albums = artist_albums(client, query)
+            if albums:
+                return albums
+        
+        if search_tag == 'album':
+            return group_by_album(client.search('album', query))
+        
+        if search_tag == 'any':
+            results = client.search('any', query)
+            logger.debug(f"'any' search for '{query}' returned {len(results)} results")
+            if not results:
+                return []
+            # Grouping by album beats guessing whether the query is an artist
+            albums = group_by_album(results)
+            logger.debug(f"Grouped into {len(albums)} albums")
+            return albums
+        
+        # Title searches, or artist searches without an exact match
+        formatted_results = []
+        for song in client.search(search_tag, query):
+            formatted_results.append({
+                'item_type': 'song',
+                'artist': song.get('artist', 'Unknown Artist'),
+                'title': song.get('title', 'Unknown Title'),
+                'album': song.get('album', 'Unknown Album'),
+                'genre': song.get('genre', 'Unknown Genre'),
+                'file': song.get('file', ''),
+                'time': song.get('time', '0'),
+            })
+        return formatted_results
+    except Exception as e:
+        logger.error(f"Error in search: {e}")
+        return []
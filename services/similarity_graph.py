@@ -0,0 +1,437 @@
+"""
+SimilarityGraph - offline artist similarity learned from local listening
+
+Answers "artists similar to X" without Last.fm, from signals already on the
+server:
+- Play history: consecutive plays link the two artists (learned as tracks
+  start, kept across restarts)
+- Saved playlists and the current queue: artists close together in a list
+- Album directories holding several artists (compilations, collaborations)
+- Cached Last.fm artist.getSimilar responses, and every new one fetched
+
+History and Last.fm edges persist (Last.fm answers for the same artist
+merge, keeping each neighbor's best match, so re-fetches never inflate
+weights); derived edges (playlists, queue, directories) are recomputed by
+rebuild(). All are stored on disk as an artist table plus [neighbor index,
+weight] adjacency lists, saved periodically and by flush() at shutdown.
+Queries read a per-artist top-N list cached in memory, so a lookup is a
+dict access.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from services.library_index import norm_key
+
+logger = logging.getLogger(__name__)
+
+# Edge weight per signal
+HISTORY_WEIGHT = 1.0
+PLAYLIST_WEIGHT = 0.5
+DIRECTORY_WEIGHT = 2.0
+LASTFM_WEIGHT = 3.0  # Scaled by Last.fm's 0..1 match score
+
+# Neighbors within this distance in a playlist or the queue are linked
+PLAYLIST_WINDOW = 5
+
+# Directories with more artists than this are too mixed to link them all
+MAX_DIRECTORY_ARTISTS = 12
+
+# Neighbors kept per artist
+MAX_NEIGHBORS = 50
+
+# Seconds between automatic saves of learned edges
+SAVE_INTERVAL = 300
+
+FORMAT_VERSION = 1
+
+
+def _artist_values(value):
+    """Artist names of a tag value (str or multi-value list/tuple)."""
+    if isinstance(value, (list, tuple)):
+        return [v for v in value if v]
+    return [value] if value else []
+
+
+def read_playlist_artists(path, index=None):
+    """
+    Artists of an M3U playlist in order.
+    
+    Files are looked up in the library index; entries the index does not know
+    fall back to the '#EXTINF:secs,Artist - Title' line before them.
+    
+    Args:
+        path (str): Playlist file
+        index (LibraryIndex): Loaded library index (optional)
+    
+    Returns:
+        list: Artist names (one per entry that has one)
+    """
+    artists = []
+    extinf_artist = None
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith('#EXTINF:'):
+                    info = line.split(',', 1)[1] if ',' in line else ''
+                    extinf_artist = info.split(' - ', 1)[0].strip() if ' - ' in info else None
+                    continue
+                if line.startswith('#'):
+                    continue
+                artist = None
+                if index is not None and index.loaded:
+                    track = index.get(line)
+                    if track:
+                        artist = (_artist_values(track.get('artist')) or [None])[0]
+                artist = artist or extinf_artist
+                extinf_artist = None
+                if artist:
+                    artists.append(artist)
+    except OSError as e:
+        logger.warning(f"Could not read playlist {path}: {e}")
+    return artists
+
+
+class SimilarityGraph:
+    """Thread-safe weighted artist graph with cached top-N neighbor lists."""
+    
+    def __init__(self, path=None, max_neighbors=MAX_NEIGHBORS, save_interval=SAVE_INTERVAL,
+                 clock=time.time):
+        """
+        Initialize an empty graph.
+        
+        Args:
+            path (str): JSON file the graph is saved to (None keeps it in memory)
+            max_neighbors (int): Neighbors kept per artist on queries and on disk
+            save_interval (float): Minimum seconds between automatic saves after learning
+            clock (callable): Time source (for tests)
+        """
+        self.path = path
+        self.max_neighbors = max_neighbors
+        self.save_interval = save_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._names = {}
+        self._learned = {}
+        self._lastfm = {}
+        self._lastfm_reverse = {}
+        self._derived = {}
+        self._top = {}
+        self._dirty = False
+        self._last_save = 0.0
+        self._stats = {'queries': 0, 'hits': 0, 'rebuilds': 0, 'learned_edges': 0,
+                       'saves': 0, 'rebuild_seconds': 0.0}
+    
+    # Edges
+    
+    def _node(self, artist):
+        """Graph key for an artist, remembering a display name."""
+        key = norm_key(artist)
+        if key and key not in self._names:
+            self._names[key] = artist
+        return key
+    
+    @staticmethod
+    def _link(edges, a, b, weight):
+        if a and b and a != b and weight > 0:
+            edges.setdefault(a, {})
+            edges[a][b] = edges[a].get(b, 0.0) + weight
+            edges.setdefault(b, {})
+            edges[b][a] = edges[b].get(a, 0.0) + weight
+    
+    def _link_sequence(self, edges, artists, weight):
+        """Link artists within PLAYLIST_WINDOW positions of each other."""
+        keys = [self._node(artist) for artist in artists]
+        for i, a in enumerate(keys):
+            for b in keys[i + 1:i + 1 + PLAYLIST_WINDOW]:
+                self._link(edges, a, b, weight)
+    
+    def _learn(self, a, b, weight):
+        """Add a learned edge; caller holds the lock."""
+        self._link(self._learned, a, b, weight)
+        self._top.pop(a, None)
+        self._top.pop(b, None)
+        self._dirty = True
+        self._stats['learned_edges'] += 1
+    
+    def learn_transition(self, previous_artist, artist):
+        """
+        Learn from two consecutive plays.
+        
+        Args:
+            previous_artist (str): Artist of the track played before
+            artist (str): Artist of the track that started
+        """
+        if not previous_artist or not artist:
+            return
+        with self._lock:
+            a, b = self._node(previous_artist), self._node(artist)
+            if a != b:
+                self._learn(a, b, HISTORY_WEIGHT)
+        self._maybe_save()
+    
+    def learn_similar(self, artist, similar):
+        """
+        Learn from a Last.fm artist.getSimilar answer.
+        
+        Args:
+            artist (str): Seed artist
+            similar (iterable): Similar artist names, or (name, match 0..1) pairs, best first
+        """
+        with self._lock:
+            seed = self._node(artist)
+            if not seed:
+                return
+            edges = dict(self._lastfm.get(seed, {}))
+            for rank, entry in enumerate(similar):
+                name, match = entry if isinstance(entry, tuple) else (entry, None)
+                if match is None:
+                    match = 1.0 / (1 + rank * 0.1)
+                key = self._node(name)
+                if key and key != seed:
+                    edges[key] = max(edges.get(key, 0.0), LASTFM_WEIGHT * float(match))
+            if self._lastfm.get(seed) == edges:
+                return
+            self._set_lastfm(seed, edges)
+            self._dirty = True
+        self._maybe_save()
+    
+    def learn_lastfm_response(self, params, response):
+        """
+        Learn from a raw artist.getSimilar response (as cached by LastfmCache).
+        
+        Args:
+            params (dict): Request parameters ('artist' names the seed)
+            response (dict): Parsed JSON response
+        """
+        artist, similar = self._parse_lastfm(params, response)
+        if artist and similar:
+            self.learn_similar(artist, similar)
+    
+    def _set_lastfm(self, seed, edges):
+        """Replace a seed's Last.fm edges; caller holds the lock."""
+        for neighbor in self._lastfm.pop(seed, {}):
+            self._lastfm_reverse.get(neighbor, {}).pop(seed, None)
+            self._top.pop(neighbor, None)
+        self._lastfm[seed] = edges
+        for neighbor, weight in edges.items():
+            self._lastfm_reverse.setdefault(neighbor, {})[seed] = weight
+            self._top.pop(neighbor, None)
+        self._top.pop(seed, None)
+    
+    def knows_lastfm(self, artist):
+        """True if Last.fm's similar artists for this artist are in the graph."""
+        with self._lock:
+            return norm_key(artist) in self._lastfm
+    
+    # Building
+    
+    def rebuild(self, index=None, playlists=(), queue_artists=(), lastfm_entries=()):
+        """
+        Recompute derived edges and merge cached Last.fm responses.
+        
+        Args:
+            index (LibraryIndex): Loaded library index (directory co-occurrence)
+            playlists (iterable): Artist sequences of saved playlists
+            queue_artists (iterable): Artists of the current queue in order
+            lastfm_entries (iterable): (params, response) pairs from LastfmCache.entries()
+        """
+        started = time.monotonic()
+        derived = {}
+        with self._lock:
+            for artists in playlists:
+                self._link_sequence(derived, artists, PLAYLIST_WEIGHT)
+            self._link_sequence(derived, list(queue_artists), PLAYLIST_WEIGHT)
+            
+            if index is not None and index.loaded:
+                by_directory = {}
+                for album in index.album_table():
+                    names = by_directory.setdefault(album.directory, {})
+                    for track in album.tracks:
+                        for artist in _artist_values(track.artist):
+                            names.setdefault(self._node(artist), None)
+                for names in by_directory.values():
+                    keys = [key for key in names if key]
+                    if 2 <= len(keys) <= MAX_DIRECTORY_ARTISTS:
+                        weight = DIRECTORY_WEIGHT / (len(keys) - 1)
+                        for i, a in enumerate(keys):
+                            for b in keys[i + 1:]:
+                                self._link(derived, a, b, weight)
+            self._derived = derived
+            self._top = {}
+        
+        for params, response in lastfm_entries:
+            self.learn_lastfm_response(params, response)
+        
+        with self._lock:
+            self._stats['rebuilds'] += 1
+            self._stats['rebuild_seconds'] = round(time.monotonic() - started, 3)
+            self._dirty = True
+        self.save()
+    
+    @staticmethod
+    def _parse_lastfm(params, response):
+        """(seed artist, [(name, match)]) from a cached artist.getSimilar response."""
+        block = (response or {}).get('similarartists') or {}
+        artist = (block.get('@attr') or {}).get('artist') or params.get('artist')
+        similar = []
+        for entry in block.get('artist') or []:
+            name = entry.get('name')
+            if not name:
+                continue
+            try:
+                match = float(entry.get('match'))
+            except (TypeError, ValueError):
+                match = None
+            similar.append((name, match))
+        return artist, similar
+    
+    # Queries
+    
+    def _neighbors(self, key):
+        """Top neighbors of a node as (key, weight), cached until its edges change."""
+        top = self._top.get(key)
+        if top is None:
+            merged = dict(self._derived.get(key, {}))
+            for edges in (self._learned, self._lastfm, self._lastfm_reverse):
+                for neighbor, weight in edges.get(key, {}).items():
+                    merged[neighbor] = merged.get(neighbor, 0.0) + weight
+            top = sorted(merged.items(), key=lambda item: (-item[1], item[0]))[:self.max_neighbors]
+            self._top[key] = top
+        return top
+    
+    def similar(self, artist, limit=30):
+        """
+        Artists most similar to an artist.
+        
+        Args:
+            artist (str): Seed artist
+            limit (int): Maximum artists returned
+        
+        Returns:
+            list: Display names, strongest link first ([] for unknown artists)
+        """
+        with self._lock:
+            self._stats['queries'] += 1
+            key = norm_key(artist)
+            if not key:
+                return []
+            names = [self._names.get(neighbor, neighbor) for neighbor, _ in self._neighbors(key)[:limit]]
+            if names:
+                self._stats['hits'] += 1
+            return names
+    
+    # Persistence
+    
+    def _keys(self):
+        """Every artist with an edge; caller holds the lock."""
+        return set(self._learned) | set(self._lastfm) | set(self._lastfm_reverse) | set(self._derived)
+    
+    def _maybe_save(self):
+        with self._lock:
+            due = self._dirty and self._clock() - self._last_save >= self.save_interval
+        if due:
+            self.save()
+    
+    def save(self):
+        """
+        Write the graph to disk (atomically, via a temporary file).
+        
+        Returns:
+            bool: True if written
+        """
+        if not self.path:
+            return False
+        with self._lock:
+            keys = sorted(self._keys())
+            position = {key: i for i, key in enumerate(keys)}
+            
+            def adjacency(edges):
+                return {str(position[key]): [[position[n], round(w, 3)] for n, w in
+                                             sorted(neighbors.items(), key=lambda item: -item[1])[:self.max_neighbors]]
+                        for key, neighbors in edges.items() if neighbors}
+            
+            data = {
+                'version': FORMAT_VERSION,
+                'artists': [[key, self._names.get(key, key)] for key in keys],
+                'learned': adjacency(self._learned),
+                'lastfm': adjacency(self._lastfm),
+                'derived': adjacency(self._derived),
+            }
+            self._dirty = False
+            self._last_save = self._clock()
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Could not save similarity graph to {self.path}: {e}")
+            return False
+        with self._lock:
+            self._stats['saves'] += 1
+        return True
+    
+    def flush(self):
+        """
+        Save if anything changed since the last save (e.g. at shutdown).
+        
+        Returns:
+            bool: True if written
+        """
+        with self._lock:
+            dirty = self._dirty
+        return self.save() if dirty else False
+    
+    def load(self):
+        """
+        Read the graph saved by save().
+        
+        Returns:
+            bool: True if a graph was loaded
+        """
+        if not self.path:
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read similarity graph from {self.path}: {e}")
+            return False
+        if data.get('version') != FORMAT_VERSION:
+            return False
+        keys = [key for key, _ in data.get('artists', [])]
+        
+        def edges(adjacency):
+            return {keys[int(i)]: {keys[n]: float(w) for n, w in neighbors}
+                    for i, neighbors in adjacency.items()}
+        
+        with self._lock:
+            self._names = {key: name for key, name in data.get('artists', [])}
+            self._learned = edges(data.get('learned', {}))
+            self._derived = edges(data.get('derived', {}))
+            self._lastfm = {}
+            self._lastfm_reverse = {}
+            self._top = {}
+            for seed, neighbors in edges(data.get('lastfm', {})).items():
+                self._set_lastfm(seed, neighbors)
+        return True
+    
+    def stats(self):
+        """Get graph size and query counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'artists': len(self._keys()),
+                'lastfm_seeded': len(self._lastfm),
+                'hit_rate': round(stats['hits'] / stats['queries'], 3) if stats['queries'] else None,
+            })
+            return stats
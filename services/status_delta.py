@@ -0,0 +1,152 @@
+"""
+StatusDeltaEncoder - delta encoding for mpd_status socket broadcasts
+
+Instead of pushing the full status dict every second, clients receive:
+- A full snapshot when they subscribe
+- Afterwards only the keys that changed, tagged with base/new versions
+- Elapsed time as an anchor (position, server timestamp, state, duration) that
+  the browser extrapolates locally; a new anchor is sent only when playback
+  drifts from the previous prediction (seek, pause, track change)
+"""
+
+import threading
+import time
+
+from services.mpd_idle import extrapolate_elapsed
+
+# Keys derived from elapsed time; replaced by the anchor in delta messages
+ELAPSED_KEYS = ('elapsed_time', 'raw_elapsed_time')
+
+
+class StatusDeltaEncoder:
+    """Turns successive status dicts into versioned delta messages."""
+    
+    def __init__(self, drift_tolerance=1.5):
+        """
+        Initialize the encoder.
+        
+        Args:
+            drift_tolerance (float): Seconds the real position may differ from the
+                client-side prediction before a new elapsed anchor is sent
+        """
+        self.drift_tolerance = drift_tolerance
+        self._lock = threading.Lock()
+        self._state = None
+        self._anchor = None
+        self._version = 0
+        self._stats = {'deltas': 0, 'suppressed': 0, 'full': 0}
+    
+    @property
+    def version(self):
+        """int: Version of the last state sent to clients."""
+        return self._version
+    
+    @staticmethod
+    def _split(status, timestamp):
+        """Separate the stable fields from the elapsed-time anchor."""
+        state = {k: v for k, v in status.items() if k not in ELAPSED_KEYS}
+        try:
+            position = float(status.get('raw_elapsed_time') or 0.0)
+        except (ValueError, TypeError):
+            position = 0.0
+        try:
+            duration = float(status.get('raw_total_time') or 0.0)
+        except (ValueError, TypeError):
+            duration = 0.0
+        anchor = {
+            'position': position,
+            'timestamp': timestamp,
+            'state': status.get('state'),
+            'duration': duration
+        }
+        return state, anchor
+    
+    def _anchor_drifted(self, anchor):
+        """True if the new anchor disagrees with what clients are predicting."""
+        previous = self._anchor
+        if previous is None or previous['state'] != anchor['state'] or previous['duration'] != anchor['duration']:
+            return True
+        predicted = extrapolate_elapsed(previous['position'], previous['timestamp'], previous['state'],
+                                        duration=previous['duration'], now=anchor['timestamp'])
+        return abs(predicted - anchor['position']) > self.drift_tolerance
+    
+    def encode(self, status, timestamp=None):
+        """
+        Compute the delta message for a new status.
+        
+        Args:
+            status (dict): Full status as built for display
+            timestamp (float): Server time the status describes (defaults to now)
+        
+        Returns:
+            dict: Delta message, or None if clients need no update
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        state, anchor = self._split(status, timestamp)
+        with self._lock:
+            if self._state is None:
+                self._state, self._anchor = state, anchor
+                self._version += 1
+                return self._full_message()
+            
+            changes = {k: v for k, v in state.items() if self._state.get(k) != v}
+            removed = [k for k in self._state if k not in state]
+            send_anchor = self._anchor_drifted(anchor)
+            if not changes and not removed and not send_anchor:
+                self._stats['suppressed'] += 1
+                return None
+            
+            message = {
+                'full': False,
+                'base_version': self._version,
+                'version': self._version + 1,
+                'changes': changes,
+                'removed': removed,
+                'server_time': time.time()
+            }
+            if send_anchor:
+                message['elapsed'] = anchor
+                self._anchor = anchor
+            self._state = state
+            self._version += 1
+            self._stats['deltas'] += 1
+            return message
+    
+    def full(self, status=None, timestamp=None):
+        """
+        Build a full snapshot message for a newly subscribed client.
+        
+        Args:
+            status (dict): Used only if nothing has been encoded yet
+            timestamp (float): Server time of that status
+        
+        Returns:
+            dict: Full message consistent with the current delta version, or None
+                if no status is known
+        """
+        with self._lock:
+            if self._state is None:
+                if status is None:
+                    return None
+                self._state, self._anchor = self._split(status, timestamp or time.time())
+                self._version += 1
+            return self._full_message()
+    
+    def _full_message(self):
+        """Full-state message at the current version (lock must be held)."""
+        self._stats['full'] += 1
+        return {
+            'full': True,
+            'version': self._version,
+            'status': dict(self._state),
+            'elapsed': dict(self._anchor),
+            'server_time': time.time()
+        }
+    
+    def stats(self):
+        """Get counters for sent deltas, suppressed ticks and full snapshots."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['version'] = self._version
+            return stats
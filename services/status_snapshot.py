@@ -0,0 +1,181 @@
+"""
+StatusSnapshot - single authoritative copy of the display status
+
+One producer (the status monitor) publishes the formatted MPD status; every other
+consumer (page renders, auto-fill, socket connects) reads it from memory.
+Features:
+- Monotonic version number bumped only when the status actually changes
+- Read-only accessors (callers get copies, never the shared dict)
+- Subscribe/notify for change events
+- Per-caller max staleness with single-flight refresh
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StatusSnapshot:
+    """Versioned, thread-safe holder for the latest status dict."""
+    
+    def __init__(self, refresher=None, default=None):
+        """
+        Initialize an empty snapshot.
+        
+        Args:
+            refresher (callable): Returns a fresh status dict; used by refresh() and
+                by get() when the snapshot is older than the caller allows
+            default (dict): Returned by get() before anything has been published
+        """
+        self._refresher = refresher
+        self._default = dict(default or {})
+        self._status = None
+        self._version = 0
+        self._updated_at = 0.0
+        self._cond = threading.Condition()
+        self._refresh_lock = threading.Lock()
+        self._subscribers = []
+    
+    @property
+    def version(self):
+        """int: Incremented every time a different status is published."""
+        return self._version
+    
+    @property
+    def updated_at(self):
+        """float: Wall-clock time of the last publish (changed or not)."""
+        return self._updated_at
+    
+    def age(self, now=None):
+        """
+        Seconds since the snapshot was last confirmed current.
+        
+        Args:
+            now (float): Current time (defaults to time.time())
+        
+        Returns:
+            float: Age in seconds (infinite if never published)
+        """
+        if not self._updated_at:
+            return float('inf')
+        return (now if now is not None else time.time()) - self._updated_at
+    
+    def publish(self, status):
+        """
+        Store a new status and notify subscribers if it differs from the current one.
+        
+        Args:
+            status (dict): Freshly built status
+        
+        Returns:
+            bool: True if the status changed
+        """
+        if status is None:
+            return False
+        status = dict(status)
+        with self._cond:
+            self._updated_at = time.time()
+            if status == self._status:
+                return False
+            self._status = status
+            self._version += 1
+            version = self._version
+            subscribers = list(self._subscribers)
+            self._cond.notify_all()
+        for callback in subscribers:
+            try:
+                callback(dict(status), version)
+            except Exception as e:
+                logger.error(f"Status subscriber failed: {e}")
+        return True
+    
+    def refresh(self):
+        """
+        Rebuild the status via the refresher and publish it.
+        
+        Concurrent callers share one refresh: whoever arrives while another thread
+        is refreshing waits for that result instead of hitting MPD again.
+        
+        Returns:
+            bool: True if the status changed
+        """
+        if not self._refresher:
+            return False
+        requested_at = time.time()
+        with self._refresh_lock:
+            if self._updated_at >= requested_at:
+                return False
+            try:
+                status = self._refresher()
+            except Exception as e:
+                logger.error(f"Status refresh failed: {e}")
+                return False
+            return self.publish(status)
+    
+    def get(self, max_staleness=None):
+        """
+        Get a copy of the current status.
+        
+        Args:
+            max_staleness (float): Maximum acceptable age in seconds. If the snapshot
+                is older, it is refreshed first. None accepts any age (refreshing only
+                if nothing was ever published).
+        
+        Returns:
+            dict: Copy of the status (or the default if none is available)
+        """
+        if self._status is None or (max_staleness is not None and self.age() > max_staleness):
+            self.refresh()
+        with self._cond:
+            return dict(self._status if self._status is not None else self._default)
+    
+    def field(self, key, default=None):
+        """
+        Read a single field without copying the whole status.
+        
+        Args:
+            key (str): Status key
+            default: Value returned when the key is missing
+        
+        Returns:
+            The field value or default
+        """
+        with self._cond:
+            return (self._status or self._default).get(key, default)
+    
+    def subscribe(self, callback):
+        """
+        Register a change listener.
+        
+        Args:
+            callback (callable): Called as callback(status, version) after each change,
+                on the publishing thread
+        
+        Returns:
+            callable: Function that removes the subscription
+        """
+        with self._cond:
+            self._subscribers.append(callback)
+        
+        def unsubscribe():
+            with self._cond:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+    
+    def wait_for_change(self, since_version, timeout=None):
+        """
+        Block until the version moves past since_version.
+        
+        Args:
+            since_version (int): Last version the caller has seen
+            timeout (float): Maximum seconds to wait (None waits forever)
+        
+        Returns:
+            int: Current version (unchanged if the wait timed out)
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._version != since_version, timeout)
+            return self._version
@@ -0,0 +1,240 @@
+"""
+SuggestIndex - server-side prefix index for search-box autocomplete
+
+Replaces shipping every artist, album and title to the browser: the names are
+kept in a sorted array of folded keys and each keystroke asks for the top-k
+matches only.
+- Case- and diacritic-insensitive ("bjo" finds "Björk", "sigur" finds "Sigur Rós")
+- Matches the start of any word, whole-name prefix matches rank first
+- Ties are broken by popularity (number of tracks), then alphabetically
+- Top results for short prefixes (the expensive, low-selectivity ones) are
+  precomputed at build time; longer prefixes use bisect on the sorted keys
+
+The index is built off to the side and swapped in atomically; callers rebuild
+it whenever the library index is reloaded.
+"""
+
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+# Suggestion kinds, in the order they are offered for 'any'
+SUGGEST_KINDS = ('artist', 'album', 'title')
+
+# Keys are truncated to this many characters (longer queries are verified against the full name)
+KEY_LENGTH = 32
+
+# Prefixes up to this length get their best matches precomputed
+CACHED_PREFIX_LENGTH = 3
+
+# Matches kept per precomputed prefix (the endpoint limit must not exceed this)
+CACHED_MATCHES = 100
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def fold(text):
+    """
+    Normalize text for matching: strip diacritics and case-fold.
+    
+    Args:
+        text (str): Text to fold
+    
+    Returns:
+        str: Folded text, e.g. 'Sigur Rós' -> 'sigur ros'
+    """
+    text = text or ''
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def _next_prefix(prefix):
+    """Smallest string greater than every string starting with prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class _KindTable:
+    """Sorted word-start keys for one suggestion kind."""
+    
+    __slots__ = ('keys', 'ranks', 'entry_count', 'cache')
+    
+    def __init__(self, postings, entry_count):
+        """
+        Args:
+            postings (list): (key, rank) tuples
+            entry_count (int): Total entries; rank % entry_count identifies the entry
+        """
+        postings.sort()
+        self.keys = [key for key, _ in postings]
+        self.ranks = [rank for _, rank in postings]
+        self.entry_count = entry_count
+        self.cache = {}
+        for length in range(1, CACHED_PREFIX_LENGTH + 1):
+            self._cache_prefixes(length)
+    
+    def _cache_prefixes(self, length):
+        """Store the best matches for every distinct prefix of the given length."""
+        keys = self.keys
+        position = 0
+        while position < len(keys):
+            prefix = keys[position][:length]
+            if len(prefix) < length:
+                position += 1
+                continue
+            end = bisect.bisect_left(keys, _next_prefix(prefix), position)
+            self.cache[prefix] = self._best(position, end, CACHED_MATCHES)
+            position = end
+    
+    def _best(self, start, end, limit):
+        """Best ranks in a key range, one per entry (an entry may have several matching words)."""
+        heap = self.ranks[start:end]
+        heapq.heapify(heap)
+        best = []
+        seen = set()
+        while heap and len(best) < limit:
+            rank = heapq.heappop(heap)
+            entry_rank = rank % self.entry_count
+            if entry_rank not in seen:
+                seen.add(entry_rank)
+                best.append(rank)
+        return tuple(best)
+    
+    def matches(self, needle, limit):
+        """
+        Best ranks whose key starts with needle.
+        
+        Args:
+            needle (str): Folded query
+            limit (int): Maximum results
+        
+        Returns:
+            tuple: Ranks, best first
+        """
+        if len(needle) <= CACHED_PREFIX_LENGTH and limit <= CACHED_MATCHES:
+            return self.cache.get(needle, ())[:limit]
+        key = needle[:KEY_LENGTH]
+        start = bisect.bisect_left(self.keys, key)
+        # The whole key range is ranked: only prefixes longer than CACHED_PREFIX_LENGTH
+        # get here, so the range is already selective and truncating it would drop
+        # popular names that sort late
+        end = bisect.bisect_left(self.keys, _next_prefix(key), start)
+        return self._best(start, end, limit)
+
+
+class SuggestIndex:
+    """Thread-safe sorted-array prefix index over library names."""
+    
+    def __init__(self):
+        """Initialize an empty index (call build() to fill it)."""
+        self._lock = threading.Lock()
+        self._entries = ()
+        self._tables = {}
+        self._version = 0
+        self._stats = {'builds': 0, 'queries': 0, 'build_seconds': 0.0}
+    
+    @property
+    def ready(self):
+        """bool: True once at least one name is indexed."""
+        return bool(self._entries)
+    
+    def __len__(self):
+        """Number of distinct (name, kind) entries."""
+        return len(self._entries)
+    
+    def build(self, names):
+        """
+        Build the index and swap it in.
+        
+        Args:
+            names (dict): {kind: {name: weight}}, e.g. {'artist': {'Björk': 120}}
+        """
+        started = time.time()
+        entries = []
+        for kind, counts in names.items():
+            for name, weight in counts.items():
+                if name and name.strip():
+                    entries.append((name, kind, weight, fold(name)))
+        
+        # Entries are stored in rank order (popularity, then name). A posting's rank is
+        # the entry position, plus len(entries) when it matches a later word rather
+        # than the start of the name, so smaller is always better.
+        entries.sort(key=lambda entry: (-entry[2], entry[3]))
+        count = len(entries)
+        
+        # One posting per word start
+        postings = {}
+        for rank, (_, kind, _, folded) in enumerate(entries):
+            kind_postings = postings.setdefault(kind, [])
+            kind_postings.append((folded[:KEY_LENGTH], rank))
+            for match in _WORD_RE.finditer(folded):
+                if match.start():
+                    kind_postings.append((folded[match.start():match.start() + KEY_LENGTH], rank + count))
+        tables = {kind: _KindTable(kind_postings, count) for kind, kind_postings in postings.items()}
+        
+        with self._lock:
+            self._entries = tuple(entries)
+            self._tables = tables
+            self._version += 1
+            self._stats['builds'] += 1
+            self._stats['build_seconds'] = round(time.time() - started, 3)
+        logger.info(f"Suggest index built: {len(entries)} names in {self._stats['build_seconds']}s")
+    
+    def suggest(self, query, limit=20, kind=None):
+        """
+        Best names starting with the query (at any word).
+        
+        Args:
+            query (str): What the user has typed so far
+            limit (int): Maximum suggestions. Default: 20
+            kind (str): Restrict to one of SUGGEST_KINDS (None or 'any' for all)
+        
+        Returns:
+            list: [{'text': str, 'type': str, 'count': int}], best first
+        """
+        needle = fold(query).strip()
+        if not needle or limit <= 0:
+            return []
+        self._stats['queries'] += 1
+        with self._lock:
+            entries, tables = self._entries, self._tables
+        if kind and kind != 'any':
+            tables = [tables[kind]] if kind in tables else []
+        else:
+            tables = list(tables.values())
+        
+        count = len(entries)
+        best = {}
+        for table in tables:
+            for rank in table.matches(needle, limit):
+                number = rank % count
+                if len(needle) > KEY_LENGTH and needle not in entries[number][3]:
+                    continue
+                if number not in best or rank < best[number]:
+                    best[number] = rank
+        numbers = sorted(best, key=best.get)[:limit]
+        return [self._as_dict(entries[number]) for number in numbers]
+    
+    @staticmethod
+    def _as_dict(entry):
+        """Convert an entry tuple to the API format."""
+        return {'text': entry[0], 'type': entry[1], 'count': entry[2]}
+    
+    def stats(self):
+        """Get build/query counters plus index sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'version': self._version,
+                'names': len(self._entries),
+                'keys': sum(len(table.keys) for table in self._tables.values()),
+                'cached_prefixes': sum(len(table.cache) for table in self._tables.values()),
+            })
+            return stats
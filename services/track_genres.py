@@ -0,0 +1,101 @@
+"""
+TrackGenres - genre of a candidate track without reading the file
+
+Looks a track's genre up in the cheapest place that has it:
+1. The tags of the song dict a search/find already returned
+2. The library index (in memory)
+3. MPD readcomments(), which makes MPD open and parse the file (slow over
+   NFS) - cached by (path, last-modified) so each file version is read once
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# File tag reads remembered (least recently used are dropped)
+MAX_CACHED_FILES = 4096
+
+
+class TrackGenres:
+    """Thread-safe genre lookup with a bounded readcomments() cache."""
+    
+    def __init__(self, index=None, max_entries=MAX_CACHED_FILES):
+        """
+        Initialize the lookup.
+        
+        Args:
+            index (LibraryIndex): Library index consulted before reading files (optional)
+            max_entries (int): Cached file reads. Default: 4096
+        """
+        self._index = index
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._stats = {'from_tags': 0, 'from_index': 0, 'cache_hits': 0, 'file_reads': 0}
+    
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+    
+    def genre(self, client, song):
+        """
+        Get a song's genre.
+        
+        Args:
+            client: Connected MPD client, used only for the readcomments() fallback
+            song (dict): Song from search/find (needs 'file'; 'last-modified' keys the cache)
+        
+        Returns:
+            str, list or None: Genre tag value(s), None if the track has none
+        """
+        genre = song.get('genre')
+        if genre:
+            self._count('from_tags')
+            return genre
+        
+        file_path = song.get('file')
+        if not file_path:
+            return None
+        if self._index is not None and self._index.loaded:
+            indexed = self._index.get(file_path)
+            if indexed is not None:
+                # The index holds every tag MPD has: no genre there means the file has none
+                self._count('from_index')
+                return indexed.get('genre')
+        
+        key = (file_path, song.get('last-modified'))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self._stats['cache_hits'] += 1
+                return self._cache[key]
+        
+        genre = self._read_file_genre(client, file_path)
+        with self._lock:
+            self._stats['file_reads'] += 1
+            self._cache[key] = genre
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return genre
+    
+    @staticmethod
+    def _read_file_genre(client, file_path):
+        """Genre from the file's own comments (keys vary in case by format)."""
+        try:
+            comments = client.readcomments(file_path)
+        except Exception as e:
+            logger.debug(f"readcomments failed for {file_path}: {e}")
+            return None
+        for key, value in comments.items():
+            if key.lower() == 'genre':
+                return value
+        return None
+    
+    def stats(self):
+        """Get lookup counters and the number of cached file reads."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cached_files'] = len(self._cache)
+            return stats
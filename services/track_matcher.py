@@ -0,0 +1,147 @@
+"""
+TrackMatcher - resolve Last.fm (artist, title) suggestions to library files
+
+Replaces one `search artist X title Y` MPD substring scan per suggestion with
+a hash map built once per library load:
+- (norm_key(artist), norm_key(title)) -> tracks, over every Artist and
+  AlbumArtist value, so case and punctuation differences still match
+- Titles are also keyed without trailing "(...)", "[...]" and " - Remaster"
+  style qualifiers, so 'Song (Remastered 2011)' and 'Song' find each other
+- A whole batch of suggestions resolves in one pass of dict lookups
+- Without a loaded index it falls back to the per-pair MPD search
+"""
+
+import logging
+import re
+import threading
+import time
+
+from services.library_index import norm_key
+
+logger = logging.getLogger(__name__)
+
+# Trailing qualifiers dropped for the secondary title key
+_QUALIFIER_RE = re.compile(
+    r'\s*(?:[\(\[][^\)\]]*[\)\]]|\s-\s.*\b(?:remaster\w*|live|version|mix|edit|mono|stereo|demo|single)\b.*)\s*$',
+    re.IGNORECASE)
+
+
+def title_keys(title):
+    """
+    Lookup keys for a title: the full normalized title, then without qualifiers.
+    
+    Args:
+        title (str): Track title
+    
+    Returns:
+        tuple: One or two distinct non-empty keys
+    """
+    full = norm_key(title)
+    base = title or ''
+    stripped = _QUALIFIER_RE.sub('', base)
+    while stripped and stripped != base:
+        base, stripped = stripped, _QUALIFIER_RE.sub('', stripped)
+    base_key = norm_key(base)
+    return tuple(key for key in dict.fromkeys((full, base_key)) if key)
+
+
+class TrackMatcher:
+    """Thread-safe (artist, title) -> tracks map over a LibraryIndex."""
+    
+    def __init__(self, index):
+        """
+        Initialize the matcher (the map is built on first use or refresh()).
+        
+        Args:
+            index (LibraryIndex): Library index the map is built from
+        """
+        self._index = index
+        self._lock = threading.Lock()
+        self._version = None
+        self._map = {}
+        self._stats = {'rebuilds': 0, 'batches': 0, 'suggestions': 0, 'matched': 0,
+                       'mpd_searches': 0, 'build_seconds': 0.0}
+    
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+    
+    def refresh(self):
+        """
+        Rebuild the map if the library index reloaded since the last build.
+        
+        Returns:
+            bool: True if the map was rebuilt
+        """
+        with self._lock:
+            version = self._index.version
+            if version == self._version:
+                return False
+            started = time.monotonic()
+            pairs = {}
+            for tag in ('artist', 'albumartist'):
+                for value in self._index.tag_counts(tag):
+                    artist_key = norm_key(value)
+                    if not artist_key:
+                        continue
+                    for track in self._index.tag_tracks(tag, value):
+                        titles = track.title if isinstance(track.title, tuple) else (track.title,)
+                        for title in titles:
+                            for title_key in title_keys(title):
+                                # Keyed by file: a track reached through both tags is listed once
+                                pairs.setdefault((artist_key, title_key), {})[track.file] = track
+            self._map = {key: list(tracks.values()) for key, tracks in pairs.items()}
+            self._version = version
+            self._stats['rebuilds'] += 1
+            self._stats['build_seconds'] = round(time.monotonic() - started, 3)
+            return True
+    
+    def _lookup(self, artist, title):
+        artist_key = norm_key(artist)
+        for title_key in title_keys(title):
+            tracks = self._map.get((artist_key, title_key))
+            if tracks:
+                return [track.as_dict() for track in tracks]
+        return []
+    
+    def match(self, suggestions, client=None):
+        """
+        Resolve suggestions to library songs.
+        
+        Args:
+            suggestions (iterable): (artist, title) pairs
+            client: MPD client for the per-pair search when the index is not loaded
+        
+        Returns:
+            dict: {(artist, title): [song dicts]} for every distinct pair ([] if not in the library)
+        """
+        pairs = list(dict.fromkeys(suggestions))
+        results = {}
+        if self._index.loaded:
+            self.refresh()
+            with self._lock:
+                for artist, title in pairs:
+                    results[(artist, title)] = self._lookup(artist, title)
+        else:
+            for artist, title in pairs:
+                if client is None:
+                    results[(artist, title)] = []
+                    continue
+                try:
+                    results[(artist, title)] = client.search('artist', artist, 'title', title)
+                except Exception as e:
+                    logger.warning(f"Search for {artist} - {title} failed: {e}")
+                    results[(artist, title)] = []
+                self._count('mpd_searches')
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['suggestions'] += len(pairs)
+            self._stats['matched'] += sum(1 for songs in results.values() if songs)
+        return results
+    
+    def stats(self):
+        """Get match counters and the map size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['keys'] = len(self._map)
+            return stats
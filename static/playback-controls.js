@@ -96,3 +96,164 @@ function adjustVolume(change) {
             console.error('Volume error:', error);
         });
 }
+
+/**
+ * Delta-encoded MPD status
+ * Subscribes a page's Socket.IO connection to 'mpd_status_delta' updates, keeps the
+ * merged status locally and ticks elapsed time in the browser. Existing
+ * socket.on('mpd_status', ...) handlers keep receiving the full status object.
+ */
+const MaestroStatus = (function () {
+    let state = null;
+    let version = null;
+    let anchor = null;
+    let clockOffset = 0;  // server clock minus browser clock, in seconds
+
+    function formatTime(seconds) {
+        const total = Math.floor(seconds);
+        const minutes = Math.floor(total / 60);
+        const secs = total % 60;
+        return `${String(minutes).padStart(2, '0')}:${String(secs).padStart(2, '0')}`;
+    }
+
+    function currentElapsed() {
+        if (!anchor) {
+            return 0;
+        }
+        let position = anchor.position;
+        if (anchor.state === 'play') {
+            const serverNow = Date.now() / 1000 + clockOffset;
+            position += Math.max(0, serverNow - anchor.timestamp);
+            if (anchor.duration > 0) {
+                position = Math.min(position, anchor.duration);
+            }
+        }
+        return position;
+    }
+
+    function dispatch(socket) {
+        if (!state) {
+            return;
+        }
+        const elapsed = currentElapsed();
+        const snapshot = Object.assign({}, state, {
+            raw_elapsed_time: elapsed,
+            elapsed_time: formatTime(elapsed)
+        });
+        socket.listeners('mpd_status').forEach(handler => {
+            try {
+                handler(snapshot);
+            } catch (error) {
+                console.error('mpd_status handler error:', error);
+            }
+        });
+    }
+
+    function attach(socket) {
+        if (!socket || socket.__maestroStatusAttached) {
+            return;
+        }
+        socket.__maestroStatusAttached = true;
+
+        const subscribe = () => socket.emit('status_subscribe', { delta: true });
+        socket.on('connect', subscribe);
+        if (socket.connected) {
+            subscribe();
+        }
+
+        socket.on('mpd_status_delta', message => {
+            if (message.full) {
+                state = Object.assign({}, message.status);
+            } else if (state === null || message.base_version !== version) {
+                // Missed an update - ask the server for a fresh full snapshot
+                subscribe();
+                return;
+            } else {
+                Object.assign(state, message.changes);
+                (message.removed || []).forEach(key => delete state[key]);
+            }
+            version = message.version;
+            if (message.server_time) {
+                clockOffset = message.server_time - Date.now() / 1000;
+            }
+            if (message.elapsed) {
+                anchor = message.elapsed;
+            }
+            dispatch(socket);
+        });
+
+        // Local clock: no network traffic while a track simply plays on
+        setInterval(() => {
+            if (anchor && anchor.state === 'play') {
+                dispatch(socket);
+            }
+        }, 1000);
+    }
+
+    return {
+        attach: attach,
+        getState: () => (state ? Object.assign({}, state) : null)
+    };
+})();
+
+/**
+ * Server-side autocomplete
+ * Fetches the top matches for what has been typed from /api/suggest instead of
+ * preloading every artist, album and title. A newer keystroke aborts the
+ * previous request; recent answers are cached for backspacing.
+ */
+const MaestroSuggest = (function () {
+    const CACHE_SIZE = 50;
+    const cache = new Map();
+    let controller = null;
+
+    function remember(key, value) {
+        cache.set(key, value);
+        if (cache.size > CACHE_SIZE) {
+            cache.delete(cache.keys().next().value);
+        }
+    }
+
+    // Resolves with unique suggestion strings, or null if superseded by a newer call
+    function get(query, type, limit) {
+        const q = (query || '').trim();
+        if (controller) {
+            controller.abort();
+            controller = null;
+        }
+        if (!q) {
+            return Promise.resolve([]);
+        }
+        const params = new URLSearchParams({ q: q, type: type || 'any', limit: limit || 20 });
+        const key = params.toString();
+        if (cache.has(key)) {
+            return Promise.resolve(cache.get(key));
+        }
+
+        const current = new AbortController();
+        controller = current;
+        return fetch(`/api/suggest?${key}`, { signal: current.signal })
+            .then(response => response.json())
+            .then(data => {
+                if (controller === current) {
+                    controller = null;
+                }
+                if (data.status !== 'success') {
+                    console.error('Suggest error:', data.message);
+                    return current.signal.aborted ? null : [];
+                }
+                const texts = [...new Set(data.suggestions.map(s => s.text))];
+                remember(key, texts);
+                return current.signal.aborted ? null : texts;
+            })
+            .catch(error => {
+                if (error.name === 'AbortError') {
+                    return null;
+                }
+                console.error('Error fetching suggestions:', error);
+                return [];
+            });
+    }
+
+    return { get: get };
+})();
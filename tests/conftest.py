@@ -5,6 +5,7 @@ Provides:
 - Mock fixtures for external API calls
 - Common test data
 - Database/filesystem isolation
+- Fake clock and background-job capture for services that take clock/spawn
 """
 
 import pytest
@@ -12,6 +13,28 @@ from unittest.mock import Mock, MagicMock, patch
 import json
 
 
+class FakeClock:
+    """Time source that only moves when a test sets or advances `now`."""
+    
+    def __init__(self, now=1000.0):
+        self.now = now
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Fake clock for services' clock= argument (advance with clock.now += seconds)."""
+    return FakeClock()
+
+
+@pytest.fixture
+def spawned():
+    """Background jobs captured via spawn=spawned.append (run one with spawned.pop()())."""
+    return []
+
+
 @pytest.fixture
 def mock_lastfm_api():
     """Mock Last.fm API responses."""
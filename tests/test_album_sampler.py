@@ -0,0 +1,98 @@
+"""Unit tests for the random album sampler."""
+
+import random
+import pytest
+from services.library_index import LibraryIndex
+from services.album_sampler import AlbumSampler
+
+
+def make_songs():
+    songs = []
+    for n in range(40):
+        genre = 'Jazz' if n % 2 else 'Rock'
+        year = 1960 + n
+        songs.append({'file': f'lib/a{n}/01.flac', 'albumartist': f'Artist {n}', 'album': f'Album {n}',
+                      'genre': genre, 'date': f'{year}-01-01'})
+        songs.append({'file': f'lib/a{n}/02.flac', 'albumartist': f'Artist {n}', 'album': f'Album {n}',
+                      'genre': genre, 'date': str(year)})
+    # Same album name by two different artists
+    songs.append({'file': 'dup/x/01.flac', 'artist': 'X', 'album': 'Greatest Hits', 'genre': 'Pop'})
+    songs.append({'file': 'dup/y/01.flac', 'artist': 'Y', 'album': 'Greatest Hits', 'genre': 'Pop'})
+    return songs
+
+
+@pytest.fixture
+def index():
+    idx = LibraryIndex()
+    idx.load(make_songs())
+    return idx
+
+
+@pytest.fixture
+def sampler(index):
+    return AlbumSampler(index, window=10, rng=random.Random(7))
+
+
+class TestAlbumTable:
+    """Test the album records built by the library index."""
+    
+    def test_albums_keep_artist_identity(self, index):
+        """Same-named albums by different artists stay separate."""
+        hits = [a for a in index.album_table() if a.album == 'Greatest Hits']
+        
+        assert sorted(a.artist for a in hits) == ['X', 'Y']
+        assert len(index.album_table()) == 42
+    
+    def test_album_record_fields(self, index):
+        """Records carry track count, year, genre and a sample file."""
+        album = next(a for a in index.album_table() if a.album == 'Album 3')
+        
+        assert album.as_dict() == {'artist': 'Artist 3', 'album': 'Album 3', 'directory': 'lib/a3',
+                                   'genre': 'Jazz', 'year': 1963, 'track_count': 2,
+                                   'sample_file': 'lib/a3/01.flac'}
+
+
+class TestAlbumSampler:
+    """Test sampling, filters and the no-repeat window."""
+    
+    def test_sample_count_and_uniqueness(self, sampler):
+        """A shelf has distinct albums."""
+        shelf = sampler.sample(25)
+        
+        assert len(shelf) == 25
+        assert len({(a['artist'], a['album'], a['directory']) for a in shelf}) == 25
+    
+    def test_genre_and_decade_filters(self, sampler):
+        """Filters restrict the pool; decades accept any year inside them."""
+        assert {a['genre'] for a in sampler.sample(10, genre='jazz')} == {'Jazz'}
+        
+        seventies = sampler.sample(50, decade=1975)
+        assert len(seventies) == 10
+        assert all(1970 <= a['year'] < 1980 for a in seventies)
+        
+        both = sampler.sample(50, genre='Rock', decade=1970)
+        assert sorted(a['year'] for a in both) == [1970, 1972, 1974, 1976, 1978]
+        assert sampler.sample(5, genre='Polka') == []
+    
+    def test_no_repeat_window_per_session(self, sampler):
+        """Consecutive shelves in one session do not overlap within the window."""
+        first = {a['artist'] for a in sampler.sample(5, session_id='s1')}
+        second = {a['artist'] for a in sampler.sample(5, session_id='s1')}
+        
+        assert not first & second
+        assert sampler.stats()['sessions'] == 1
+    
+    def test_small_pool_falls_back_to_repeats(self, sampler):
+        """When the filter leaves too few fresh albums, repeats fill the shelf."""
+        sampler.sample(10, decade=1970, session_id='s1')
+        
+        assert len(sampler.sample(10, decade=1970, session_id='s1')) == 10
+    
+    def test_rebuilds_after_index_reload(self, index, sampler):
+        """A new index version replaces the table and forgets session history."""
+        sampler.sample(3, session_id='s1')
+        index.load([{'file': 'new/01.flac', 'artist': 'New', 'album': 'Only', 'date': '2001'}])
+        
+        assert [a['album'] for a in sampler.sample(5)] == ['Only']
+        assert sampler.decades() == [2000]
+        assert sampler.stats()['sessions'] == 0
@@ -0,0 +1,95 @@
+"""Unit tests for artist page album lists."""
+
+import pytest
+from unittest.mock import MagicMock
+from services.artist_albums import ArtistAlbumsCache, fetch_artist_albums, group_artist_albums
+from services.library_index import LibraryIndex
+
+
+SONGS = [
+    {'file': 'Band/Debut/01.flac', 'artist': 'Band', 'albumartist': 'Band', 'album': 'Debut',
+     'genre': 'Rock', 'date': '1990'},
+    {'file': 'Band/Debut/02.flac', 'artist': 'Band', 'albumartist': 'Band', 'album': 'Debut',
+     'genre': 'Pop', 'date': '1990'},
+    {'file': 'Band/Debut (Remaster)/01.flac', 'artist': 'Band', 'albumartist': 'Band', 'album': 'Debut',
+     'genre': 'Rock', 'date': '2010'},
+    {'file': 'Comp/Hits/05.flac', 'artist': 'Band', 'albumartist': 'Various Artists', 'album': 'Hits',
+     'genre': 'Pop'},
+    {'file': 'Comp/Hits/06.flac', 'artist': 'Other', 'albumartist': 'Various Artists', 'album': 'Hits',
+     'genre': 'Pop'},
+    {'file': 'Band/Jazz Side/01.flac', 'artist': 'Band', 'album': 'another', 'genre': ['Jazz', 'Rock']},
+]
+
+
+@pytest.fixture
+def reader():
+    index = LibraryIndex()
+    index.load(SONGS, db_update='42')
+    return index.reader()
+
+
+def rows(albums):
+    return [(a['album'], a['sample_file'], a['track_count']) for a in albums]
+
+
+class TestGroupArtistAlbums:
+    """Test grouping an artist's songs into album rows."""
+    
+    def test_rows_per_album_and_directory(self, reader):
+        """Copies in different directories get separate rows, sorted case-insensitively."""
+        albums = fetch_artist_albums(reader, 'Band')
+        
+        assert rows(albums) == [
+            ('another', 'Band/Jazz Side/01.flac', 1),
+            ('Debut', 'Band/Debut/01.flac', 2),
+            ('Debut', 'Band/Debut (Remaster)/01.flac', 1),
+            ('Hits', 'Comp/Hits/05.flac', 1),
+        ]
+        assert albums[1] == {'album': 'Debut', 'artist': 'Band', 'track_count': 2, 'date': '1990',
+                             'sample_file': 'Band/Debut/01.flac'}
+    
+    def test_genre_selects_albums_but_keeps_full_counts(self, reader):
+        """An album qualifies through any song in the genre; its count covers all songs."""
+        assert rows(fetch_artist_albums(reader, 'Band', 'Pop')) == [
+            ('Debut', 'Band/Debut/01.flac', 2),
+            ('Debut', 'Band/Debut (Remaster)/01.flac', 1),
+            ('Hits', 'Comp/Hits/05.flac', 1),
+        ]
+        assert [a['album'] for a in fetch_artist_albums(reader, 'Band', 'Jazz')] == ['another']
+    
+    def test_albumartist_songs_win(self):
+        """When AlbumArtist matches an album, Artist-only songs of it are not added."""
+        albums = group_artist_albums('X', [{'file': 'a/1.flac', 'album': 'A'}],
+                                     [{'file': 'a/1.flac', 'album': 'A'}, {'file': 'b/2.flac', 'album': 'A'}])
+        
+        assert rows(albums) == [('A', 'a/1.flac', 1)]
+
+
+class TestArtistAlbumsCache:
+    """Test memoization per database version."""
+    
+    def test_two_queries_then_cached(self):
+        """A miss costs two finds; a hit costs none until the version changes."""
+        client = MagicMock()
+        client.find.side_effect = lambda tag, value: [s for s in SONGS if s.get(tag) == value]
+        cache = ArtistAlbumsCache()
+        
+        first = cache.get(client, 'Band', '', 'v1')
+        assert client.find.call_count == 2
+        assert cache.get(client, 'Band', None, 'v1') is first
+        assert client.find.call_count == 2
+        
+        cache.get(client, 'Band', '', 'v2')
+        assert client.find.call_count == 4
+        assert cache.stats() == {'hits': 1, 'misses': 2, 'entries': 2}
+    
+    def test_unknown_version_bypasses_and_lru_evicts(self, reader):
+        """No version means no caching; the oldest page is dropped past the limit."""
+        cache = ArtistAlbumsCache(max_entries=1)
+        
+        cache.get(reader, 'Band', '', None)
+        assert cache.stats()['entries'] == 0
+        
+        cache.get(reader, 'Band', '', reader.stats()['db_update'])
+        cache.get(reader, 'Other', '', '42')
+        assert cache.stats()['entries'] == 1
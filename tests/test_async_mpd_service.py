@@ -0,0 +1,180 @@
+"""Unit tests for the asyncio MPD service."""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+from mpd import CommandError, ConnectionError as MPDConnectionError
+from services.async_mpd_service import AsyncMPDService, AsyncMPDFacade
+from tests.test_mpd_service import FakeCommandListClient
+
+
+class FakeAsyncClient:
+    """Stand-in for mpd.asyncio.MPDClient with a scripted library."""
+    
+    instances = []
+    fail_next = []
+    
+    def __init__(self):
+        self.connected = False
+        self.queue = []
+        FakeAsyncClient.instances.append(self)
+    
+    async def connect(self, host, port=6600):
+        self.connected = True
+    
+    def disconnect(self):
+        self.connected = False
+    
+    async def status(self):
+        if FakeAsyncClient.fail_next:
+            raise FakeAsyncClient.fail_next.pop(0)
+        return {'state': 'play', 'playlistlength': str(len(self.queue))}
+    
+    async def find(self, tag, value):
+        await asyncio.sleep(0.01)
+        return [{'file': f'{value}/{i}.flac'} for i in range(2)]
+    
+    async def add(self, uri):
+        if FakeAsyncClient.fail_next:
+            raise FakeAsyncClient.fail_next.pop(0)
+        if uri.startswith('missing'):
+            raise CommandError('[50@0] {add} No such directory')
+        self.queue.append(uri)
+
+
+@pytest.fixture
+def service():
+    """Running service backed by FakeAsyncClient."""
+    FakeAsyncClient.instances = []
+    FakeAsyncClient.fail_next = []
+    with patch('services.async_mpd_service.AsyncMPDClient', FakeAsyncClient):
+        svc = AsyncMPDService(timeout=5)
+        assert svc.start() is True
+        yield svc
+        svc.stop()
+
+
+class TestAsyncMPDService:
+    """Test command execution and scheduling on the loop thread."""
+    
+    def test_call_connects_once_and_reuses(self, service):
+        """Synchronous calls share one lazily opened connection."""
+        assert service.call('status')['state'] == 'play'
+        service.call('status')
+        
+        assert len(FakeAsyncClient.instances) == 1
+        stats = service.stats()
+        assert stats['connects'] == 1
+        assert stats['commands'] == 2
+        assert stats['connected'] is True
+    
+    def test_reconnects_after_connection_loss(self, service):
+        """A dropped connection is replaced and the command retried."""
+        service.call('status')
+        FakeAsyncClient.fail_next = [MPDConnectionError('Connection lost')]
+        
+        assert service.call('status')['state'] == 'play'
+        assert len(FakeAsyncClient.instances) == 2
+        assert service.stats()['reconnects'] == 1
+    
+    def test_concurrent_coroutines_share_the_loop(self, service):
+        """Many finds run as coroutines without extra threads."""
+        threads_before = threading.active_count()
+        
+        async def fan_out():
+            return await asyncio.gather(*(service.execute('find', 'genre', f'g{i}') for i in range(20)))
+        
+        results = service.run(fan_out())
+        
+        assert len(results) == 20
+        assert results[3][0]['file'] == 'g3/0.flac'
+        assert threading.active_count() == threads_before
+    
+    def test_queue_changes_are_not_resent(self, service):
+        """An add whose reply was lost is not repeated on the new connection."""
+        service.call('status')
+        FakeAsyncClient.fail_next = [MPDConnectionError('Connection lost')]
+        
+        with pytest.raises(MPDConnectionError):
+            service.call('add', 'a')
+        service.call('add', 'b')
+        
+        assert [client.queue for client in FakeAsyncClient.instances] == [[], ['b']]
+    
+    def test_add_many_batches_on_pooled_client(self, service):
+        """Bulk adds go out as command lists on a checked-out client and report failures per URI."""
+        client = FakeCommandListClient(missing={'missing-b'})
+        client.disconnect = lambda: setattr(client, 'returned', True)
+        
+        result = service.run(service.add_many(['a', 'missing-b', 'c', None], lambda: client))
+        
+        assert result['added'] == 2
+        assert [uri for uri, _ in result['failed']] == ['missing-b']
+        assert client.queue == ['a', 'c'] and client.returned
+        assert not FakeAsyncClient.instances
+    
+    def test_spawn_logs_and_counts_failures(self, service):
+        """Background coroutine errors are counted instead of lost."""
+        async def boom():
+            raise ValueError('nope')
+        
+        future = service.spawn(boom())
+        with pytest.raises(ValueError):
+            future.result(2)
+        
+        assert service.stats()['tasks_failed'] == 1
+    
+    def test_run_blocking_uses_executor(self, service):
+        """Blocking callables run off the loop thread."""
+        async def job():
+            return await service.run_blocking(lambda: threading.current_thread().name)
+        
+        assert service.run(job()).startswith('mpd-async-blocking')
+    
+    def test_signal_wakes_waiter(self, service):
+        """signal() from another thread wakes wait_signal()."""
+        future = service.submit(service.wait_signal('status', timeout=2))
+        threading.Timer(0.05, service.signal, args=('status',)).start()
+        
+        assert future.result(3) is True
+        assert service.run(service.wait_signal('status', timeout=0.01)) is False
+    
+    def test_run_rejected_on_loop_thread(self, service):
+        """Blocking on the loop from inside it would deadlock, so it is refused."""
+        async def nested():
+            coro = service.wait_signal('x', timeout=0)
+            with pytest.raises(RuntimeError):
+                service.run(coro)
+            return True
+        
+        assert service.run(nested()) is True
+    
+    def test_stop_cancels_running_tasks(self, service):
+        """stop() cancels outstanding background coroutines."""
+        future = service.spawn(asyncio.sleep(60))
+        
+        service.stop()
+        
+        assert future.cancelled() or isinstance(future.exception(1), asyncio.CancelledError)
+        assert service.running is False
+
+
+class TestAsyncMPDFacade:
+    """Test the blocking client view."""
+    
+    def test_facade_forwards_commands(self, service):
+        """Attribute calls map to MPD commands on the shared connection."""
+        client = service.facade()
+        
+        assert isinstance(client, AsyncMPDFacade)
+        client.add('song.flac')
+        assert client.status()['playlistlength'] == '1'
+        assert client.disconnect() is None
+    
+    def test_not_running_raises(self):
+        """Calls fail fast when the loop was never started."""
+        svc = AsyncMPDService()
+        
+        with pytest.raises(RuntimeError):
+            svc.call('status')
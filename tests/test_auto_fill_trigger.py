@@ -0,0 +1,84 @@
+"""Unit tests for the event-driven auto-fill trigger."""
+
+import threading
+import pytest
+from services.auto_fill_trigger import AutoFillTrigger
+from services.status_snapshot import StatusSnapshot
+
+
+def status(queue_length=3, song_id='7', state='play', elapsed=10):
+    return {'state': state, 'queue_length': queue_length, 'song_id': song_id, 'elapsed': elapsed}
+
+
+@pytest.fixture
+def trigger(clock):
+    return AutoFillTrigger(job_timeout=60, clock=clock)
+
+
+class TestChangeFilter:
+    """Test which snapshot updates wake auto-fill."""
+    
+    def test_only_queue_song_and_state_changes_wake(self, trigger):
+        """The elapsed tick is ignored; queue length, song and state changes wake."""
+        calls = []
+        trigger._on_change = lambda: calls.append(1)
+        
+        trigger.on_status(status())
+        trigger.on_status(status(elapsed=11))
+        trigger.on_status(status(elapsed=12))
+        assert trigger.consume() is True
+        assert trigger.consume() is False
+        
+        trigger.on_status(status(queue_length=2))
+        trigger.on_status(status(queue_length=2, song_id='8'))
+        trigger.on_status(status(queue_length=2, song_id='8', state='pause'))
+        
+        assert len(calls) == 4
+        assert trigger.stats()['ignored_updates'] == 2
+    
+    def test_wait_wakes_on_published_change(self, trigger):
+        """A monitor blocked in wait() wakes when the snapshot publishes a relevant change."""
+        snapshot = StatusSnapshot()
+        snapshot.subscribe(trigger.on_status)
+        woke = []
+        waiter = threading.Thread(target=lambda: woke.append(trigger.wait(2)))
+        waiter.start()
+        
+        snapshot.publish(status(queue_length=1))
+        waiter.join(2)
+        
+        assert woke == [True]
+        assert trigger.wait(0.01) is False
+    
+    def test_poke_forces_evaluation(self, trigger):
+        """Switching auto-fill on wakes the monitor without a status change."""
+        trigger.poke()
+        assert trigger.wait(0) is True
+
+
+class TestJobToken:
+    """Test the single in-flight job token."""
+    
+    def test_overlapping_triggers_are_skipped(self, trigger):
+        """Only one fill runs at a time; finishing frees the token."""
+        token = trigger.begin()
+        
+        assert token is not None
+        assert trigger.begin() is None
+        assert trigger.busy
+        
+        trigger.finish(token)
+        assert not trigger.busy
+        assert trigger.begin() is not None
+        assert trigger.stats()['jobs_skipped'] == 1
+    
+    def test_abandoned_token_expires(self, trigger, clock):
+        """A job that never finishes stops blocking after job_timeout; its late finish is ignored."""
+        stale = trigger.begin()
+        clock.now += 61
+        
+        fresh = trigger.begin()
+        trigger.finish(stale)
+        
+        assert fresh is not None and trigger.busy
+        assert trigger.stats()['jobs_expired'] == 1
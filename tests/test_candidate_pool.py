@@ -0,0 +1,70 @@
+"""Unit tests for the prefetched auto-fill candidate pool."""
+
+import random
+import pytest
+from services.candidate_pool import CandidatePool
+
+
+@pytest.fixture
+def pool(spawned):
+    return CandidatePool(max_size=10, refill_below=4, spawn=spawned.append, rng=random.Random(1))
+
+
+def uris(prefix, count):
+    return [f'{prefix}/{n:02d}.flac' for n in range(count)]
+
+
+class TestCandidatePool:
+    """Test prefetching, taking, seed changes and counters."""
+    
+    def test_prefetch_then_take(self, pool, spawned):
+        """A refill runs in the background and later takes are served from memory."""
+        assert pool.prefetch(('artist', 'A', None), lambda: uris('a', 30))
+        assert not pool.prefetch(('artist', 'A', None), lambda: uris('a', 30))  # already refilling
+        assert pool.take(('artist', 'A', None), 3) == []
+        
+        spawned.pop()()
+        picked = pool.take(('artist', 'A', None), 3)
+        
+        assert len(set(picked)) == 3
+        stats = pool.stats()
+        assert (stats['size'], stats['hits'], stats['misses'], stats['hit_rate']) == (7, 1, 1, 0.5)
+        assert stats['refills'] == 1 and stats['last_refill_seconds'] is not None
+    
+    def test_excluded_and_other_seeds_miss(self, pool, spawned):
+        """Queued files are dropped and another seed never gets this seed's tracks."""
+        pool.prefetch('seed', lambda: uris('a', 5))
+        spawned.pop()()
+        
+        assert pool.take('other', 1) == []
+        assert pool.take('seed', 3, exclude=set(uris('a', 3))) == []
+        assert sorted(pool.take('seed', 2)) == uris('a', 5)[3:]
+    
+    def test_refills_only_when_low_or_seed_changes(self, pool, spawned):
+        """A healthy pool for the same seed is left alone; a low one is topped up."""
+        pool.prefetch('seed', lambda: uris('a', 6))
+        spawned.pop()()
+        assert not pool.prefetch('seed', lambda: uris('b', 6))
+        
+        kept = pool.take('seed', 3)
+        assert pool.prefetch('seed', lambda: uris('b', 20))
+        spawned.pop()()
+        assert pool.stats()['size'] == 10
+        assert not set(kept) & set(pool.take('seed', 10))
+    
+    def test_newer_seed_wins_and_errors_are_counted(self, pool, spawned):
+        """A refill finishing after the seed changed is discarded; failures leave the pool usable."""
+        pool.prefetch('old', lambda: uris('old', 5))
+        pool.prefetch('new', lambda: uris('new', 5))
+        old_refill, new_refill = spawned
+        new_refill()
+        old_refill()
+        assert pool.stats()['seed'] == 'new'
+        
+        def broken():
+            raise ConnectionError('MPD gone')
+        pool.invalidate()
+        pool.prefetch('new', broken)
+        spawned[-1]()
+        assert pool.stats()['refill_errors'] == 1
+        assert pool.prefetch('new', lambda: uris('new', 5))
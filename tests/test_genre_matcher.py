@@ -0,0 +1,65 @@
+"""Unit tests for the precomputed genre matcher."""
+
+import json
+import pytest
+from services.genre_matcher import GenreMatcher, load_aliases, normalize
+
+
+LIBRARY_GENRES = ['Rock', 'Classic Rock', 'Jazz', 'Jazz (Bebop)', 'Hip-Hop', 'Rap', 'Pop', 'Bebop']
+
+
+@pytest.fixture
+def matcher():
+    m = GenreMatcher()
+    m.build(LIBRARY_GENRES)
+    return m
+
+
+class TestGenreMatcher:
+    """Test normalization, the old matching rules and aliases."""
+    
+    def test_normalize(self):
+        """Case and separators fold together."""
+        assert normalize('Hip-Hop') == normalize('hip_hop') == normalize(' HIP  hop ') == 'hip hop'
+        assert normalize(None) == ''
+    
+    def test_substring_and_base_genre_rules(self, matcher):
+        """Containment either way and equal base genres match, as before."""
+        assert matcher.matches('rock', 'Classic Rock')
+        assert matcher.matches('Classic Rock', 'Rock')
+        assert matcher.matches('Jazz (Cool)', 'Jazz (Bebop)')
+        assert not matcher.matches('Rock', 'Pop')
+        assert not matcher.matches('', 'Rock')
+    
+    def test_compatibility_set_is_cached(self, matcher):
+        """A target's compatible library genres are computed once."""
+        assert matcher.compatible('Jazz') == {'Jazz', 'Jazz (Bebop)'}
+        matcher.compatible('Jazz')
+        
+        assert matcher.stats()['compatibility_sets'] == 1
+    
+    def test_aliases(self, matcher):
+        """Built-in aliases join Hip-Hop, hip hop and Rap."""
+        assert matcher.compatible('hip hop') == {'Hip-Hop', 'Rap'}
+        assert matcher.matches('Rap', 'HipHop')
+    
+    def test_multi_value_and_unknown_candidates(self, matcher):
+        """Any value of a list matches; genres outside the library are compared directly."""
+        assert matcher.matches('Bebop', ['Pop', 'Bebop'])
+        assert matcher.matches('Rock', 'Rock & Roll')
+        assert not matcher.matches('Rock', 'Swing & Roll')
+    
+    def test_alias_file(self, tmp_path):
+        """Alias rules load from JSON; missing or bad files give no rules."""
+        path = tmp_path / 'genre_aliases.json'
+        path.write_text(json.dumps({'Classical': ['Klassik'], 'bad': 'not a list'}))
+        
+        rules = load_aliases(str(path))
+        matcher = GenreMatcher(rules)
+        matcher.build(['Klassik', 'Classical'])
+        
+        assert rules == {'Classical': ['Klassik']}
+        assert matcher.compatible('classical') == {'Klassik', 'Classical'}
+        assert load_aliases(str(tmp_path / 'missing.json')) == {}
+        path.write_text('{broken')
+        assert load_aliases(str(path)) == {}
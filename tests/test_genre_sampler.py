@@ -0,0 +1,60 @@
+"""Unit tests for genre station sampling."""
+
+import random
+import pytest
+from services.library_index import LibraryIndex
+from services.genre_sampler import GenreSampler
+
+
+def make_songs():
+    songs = [{'file': f'rock/{n:03d}.flac', 'genre': 'Rock'} for n in range(300)]
+    songs += [{'file': f'jazz/{n:03d}.flac', 'genre': 'Jazz'} for n in range(100)]
+    songs += [{'file': f'both/{n}.flac', 'genre': ['Rock', 'Jazz']} for n in range(5)]
+    songs += [{'file': 'folk/only.flac', 'genre': 'Folk'}]
+    return songs
+
+
+@pytest.fixture
+def index():
+    idx = LibraryIndex()
+    idx.load(make_songs())
+    return idx
+
+
+@pytest.fixture
+def sampler(index):
+    return GenreSampler(index, rng=random.Random(3))
+
+
+class TestGenreSampler:
+    """Test weighted sampling, exclusion and fallbacks."""
+    
+    def test_genre_sizes(self, sampler):
+        """Sizes come from the index's genre lists."""
+        assert sampler.genre_sizes(['Rock', 'Jazz', 'Polka']) == {'Rock': 305, 'Jazz': 105, 'Polka': 0}
+    
+    def test_distinct_tracks_weighted_by_genre_size(self, sampler):
+        """Every genre contributes, roughly in proportion to its size."""
+        picks = sampler.sample(['Folk', 'Jazz', 'Rock'], 200)
+        
+        assert len(picks) == len(set(picks)) == 200
+        rock = sum(p.startswith('rock/') for p in picks)
+        jazz = sum(p.startswith('jazz/') for p in picks)
+        assert 110 < rock < 170
+        assert 25 < jazz < 70
+    
+    def test_excluded_files_are_never_picked(self, sampler):
+        """Recently played files are skipped."""
+        exclude = {f'jazz/{n:03d}.flac' for n in range(90)}
+        
+        picks = sampler.sample(['Jazz'], 50, exclude=exclude)
+        
+        assert not exclude & set(picks)
+        assert len(picks) == 15  # 10 jazz-only + 5 shared tracks left
+    
+    def test_small_or_unknown_genres(self, sampler):
+        """Asking for more than exists returns what there is; unknown genres give nothing."""
+        assert sampler.sample(['Folk'], 10) == ['folk/only.flac']
+        assert sampler.sample(['Polka'], 10) == []
+        assert sampler.sample(['Rock'], 0) == []
+        assert sampler.stats()['fallback_scans'] == 1
@@ -0,0 +1,124 @@
+"""Unit tests for the persistent Last.fm response cache."""
+
+import threading
+import pytest
+from services.lastfm_cache import LastfmCache, DAY, cache_key
+
+
+@pytest.fixture
+def cache(clock, spawned):
+    return LastfmCache(':memory:', clock=clock, spawn=spawned.append)
+
+
+def fetcher(*payloads):
+    calls = []
+    
+    def fetch():
+        calls.append(1)
+        payload = payloads[min(len(calls), len(payloads)) - 1]
+        if isinstance(payload, Exception):
+            raise payload
+        return payload
+    fetch.calls = calls
+    return fetch
+
+
+class TestLastfmCache:
+    """Test TTLs, stale-while-revalidate, eviction and persistence."""
+    
+    def test_repeat_lookups_skip_the_network(self, cache):
+        """A fresh entry is served without fetching; artist case does not matter."""
+        fetch = fetcher({'similarartists': {'artist': [{'name': 'B'}]}})
+        
+        first = cache.get('artist.getsimilar', {'artist': 'Band', 'limit': 30}, fetch)
+        second = cache.get('artist.getSimilar', {'artist': ' band', 'limit': 30}, fetch)
+        
+        assert first == second == {'similarartists': {'artist': [{'name': 'B'}]}}
+        assert len(fetch.calls) == 1
+        assert cache.stats()['hits'] == 1
+        assert cache_key('a', {'limit': 5}) != cache_key('a', {'limit': 30})
+    
+    def test_per_method_ttls(self, cache, clock):
+        """Top tracks expire sooner than similar artists."""
+        similar, tracks = fetcher('s1'), fetcher('t1')
+        cache.get('artist.getsimilar', {'artist': 'A'}, similar)
+        cache.get('artist.gettoptracks', {'artist': 'A'}, tracks)
+        
+        clock.now += 5 * DAY
+        cache.get('artist.getsimilar', {'artist': 'A'}, similar)
+        cache.get('artist.gettoptracks', {'artist': 'A'}, tracks)
+        
+        assert (len(similar.calls), len(tracks.calls)) == (1, 1)
+        assert cache.stats()['stale_hits'] == 1
+    
+    def test_stale_entries_served_while_refreshing(self, cache, clock, spawned):
+        """An expired entry is returned at once and refreshed once in the background."""
+        fetch = fetcher('old', 'new')
+        cache.get('artist.gettopalbums', {'artist': 'A'}, fetch)
+        clock.now += 4 * DAY
+        
+        assert cache.get('artist.gettopalbums', {'artist': 'A'}, fetch) == 'old'
+        assert cache.get('artist.gettopalbums', {'artist': 'A'}, fetch) == 'old'
+        assert len(spawned) == 1
+        
+        spawned[0]()
+        assert cache.get('artist.gettopalbums', {'artist': 'A'}, fetch) == 'new'
+        assert cache.stats()['refreshes'] == 1
+    
+    def test_failed_fetch_falls_back_to_expired_entry(self, cache, clock):
+        """Past the stale window the fetch runs inline, but an error still serves old data."""
+        fetch = fetcher('old', ConnectionError('offline'))
+        cache.get('artist.getsimilar', {'artist': 'A'}, fetch)
+        clock.now += 60 * DAY
+        
+        assert cache.get('artist.getsimilar', {'artist': 'A'}, fetch) == 'old'
+        with pytest.raises(ConnectionError):
+            cache.get('artist.getsimilar', {'artist': 'Unseen'}, fetch)
+    
+    def test_least_recently_used_evicted(self, clock):
+        """The entry not read for the longest is dropped past max_entries."""
+        cache = LastfmCache(':memory:', max_entries=2, clock=clock)
+        for artist in ('A', 'B'):
+            clock.now += 1
+            cache.get('artist.getsimilar', {'artist': artist}, fetcher(artist))
+        clock.now += 1
+        cache.get('artist.getsimilar', {'artist': 'A'}, fetcher('unused'))
+        clock.now += 1
+        cache.get('artist.getsimilar', {'artist': 'C'}, fetcher('C'))
+        
+        fetch = fetcher('B again')
+        assert cache.get('artist.getsimilar', {'artist': 'A'}, fetch) == 'A'
+        assert cache.get('artist.getsimilar', {'artist': 'B'}, fetch) == 'B again'
+        assert cache.stats()['evictions'] == 2
+    
+    def test_survives_reopen(self, tmp_path, clock):
+        """Entries are read back from disk by a new cache instance."""
+        path = str(tmp_path / 'lastfm.db')
+        LastfmCache(path, clock=clock).get('artist.getsimilar', {'artist': 'A'}, fetcher('saved'))
+        
+        fetch = fetcher('refetched')
+        assert LastfmCache(path, clock=clock).get('artist.getsimilar', {'artist': 'A'}, fetch) == 'saved'
+        assert not fetch.calls
+    
+    def test_entries_lists_one_method(self, cache, clock):
+        """Cached responses are listed per method with their request parameters, expired ones included."""
+        cache.get('artist.getSimilar', {'artist': 'A', 'limit': 30}, fetcher({'similar': 1}))
+        cache.get('artist.gettoptracks', {'artist': 'A'}, fetcher({'tracks': 1}))
+        clock.now += 100 * DAY
+        
+        assert cache.entries('artist.getsimilar') == [({'artist': 'a', 'limit': 30}, {'similar': 1})]
+    
+    def test_counters_exact_under_concurrent_lookups(self, cache):
+        """Fan-out threads hitting the cache at once do not lose counter updates."""
+        cache.get('artist.gettoptracks', {'artist': 'A'}, fetcher('tracks'))
+        
+        def lookups():
+            for _ in range(200):
+                cache.get('artist.gettoptracks', {'artist': 'A'}, fetcher('unused'))
+        threads = [threading.Thread(target=lookups) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert (cache.stats()['hits'], cache.stats()['misses']) == (1600, 1)
@@ -0,0 +1,68 @@
+"""Unit tests for the concurrent Last.fm fan-out."""
+
+import threading
+import time
+import pytest
+from services.lastfm_fanout import LastfmFanout
+
+
+@pytest.fixture
+def fanout():
+    return LastfmFanout(max_workers=4, deadline=5)
+
+
+class TestLastfmFanout:
+    """Test concurrency, completion order, deadlines and errors."""
+    
+    def test_lookups_run_concurrently(self, fanout):
+        """Four 0.2 s lookups on four workers finish in about 0.2 s."""
+        started = time.monotonic()
+        
+        results = dict(fanout.map(lambda a: (time.sleep(0.2), a.lower())[1], ['A', 'B', 'C', 'D', 'A']))
+        
+        assert results == {'A': 'a', 'B': 'b', 'C': 'c', 'D': 'd'}
+        assert time.monotonic() - started < 0.6
+    
+    def test_results_stream_in_completion_order(self, fanout):
+        """The fast lookup is yielded before the slow one it was submitted after."""
+        release = threading.Event()
+        
+        def fetch(artist):
+            if artist == 'slow':
+                release.wait(2)
+            return artist
+        
+        results = fanout.map(fetch, ['slow', 'fast'])
+        assert next(results) == ('fast', 'fast')
+        release.set()
+        assert list(results) == [('slow', 'slow')]
+    
+    def test_deadline_yields_partial_results(self):
+        """Lookups pending at the deadline come back with the default."""
+        fanout = LastfmFanout(max_workers=2, deadline=0.2)
+        release = threading.Event()
+        
+        def fetch(artist):
+            if artist != 'quick':
+                release.wait(2)
+            return [artist]
+        
+        started = time.monotonic()
+        results = list(fanout.map(fetch, ['quick', 'hung', 'queued'], default=[]))
+        release.set()
+        
+        assert results == [('quick', ['quick']), ('hung', []), ('queued', [])]
+        assert time.monotonic() - started < 1
+        assert fanout.stats()['deadline_hits'] == 1
+        assert fanout.stats()['timed_out'] == 2
+    
+    def test_errors_become_defaults(self, fanout):
+        """A failing lookup is counted and does not stop the others."""
+        def fetch(artist):
+            if artist == 'bad':
+                raise ValueError('broken JSON')
+            return artist
+        
+        assert sorted(fanout.map(fetch, ['bad', 'good'], default=[]), key=str) == [('bad', []), ('good', 'good')]
+        assert fanout.stats()['errors'] == 1
+        assert list(fanout.map(fetch, [])) == []
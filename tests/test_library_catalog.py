@@ -0,0 +1,128 @@
+"""Unit tests for the SQLite library catalog."""
+
+import pytest
+from services.library_catalog import LibraryCatalog
+
+
+def song(file, artist, album, title, genre='Rock', modified='2024-01-01T00:00:00Z', **extra):
+    data = {'file': file, 'artist': artist, 'album': album, 'title': title, 'genre': genre,
+            'last-modified': modified}
+    data.update(extra)
+    return data
+
+
+LIBRARY = [
+    song('Beatles/Abbey Road/01.flac', 'The Beatles', 'Abbey Road', 'Come Together', track='1'),
+    song('Beatles/Abbey Road/02.flac', 'The Beatles', 'Abbey Road', 'Something', track='2'),
+    song('Beach Boys/Pet Sounds/01.flac', 'The Beach Boys', 'Pet Sounds', "Wouldn't It Be Nice"),
+    song('Coltrane/Blue Train/01.flac', 'John Coltrane', 'Blue Train', 'Blue Train', genre=['Jazz', 'Hard Bop']),
+    song('Motörhead/Ace/01.flac', 'Motörhead', 'Ace of Spades', 'Ace of Spades', genre='Metal'),
+]
+
+
+@pytest.fixture
+def catalog():
+    cat = LibraryCatalog(':memory:')
+    cat.sync(LIBRARY)
+    yield cat
+    cat.close()
+
+
+class TestLibraryCatalogSync:
+    """Test incremental syncing against last-modified."""
+    
+    def test_initial_sync_adds_everything(self):
+        """The first sync inserts every song."""
+        cat = LibraryCatalog(':memory:')
+        
+        result = cat.sync(LIBRARY + [{'directory': 'Beatles'}])
+        
+        assert result['added'] == 5
+        assert cat.count() == 5
+        assert cat.ready is True
+    
+    def test_not_ready_while_syncing(self, catalog):
+        """Searches are sent elsewhere while a sync holds the database."""
+        seen_ready = []
+        
+        def songs():
+            seen_ready.append(catalog.ready)
+            yield from LIBRARY[:3]
+        
+        catalog.sync(songs())
+        
+        assert seen_ready == [False]
+        assert catalog.ready is True
+        assert catalog.count() == 3
+    
+    def test_unchanged_songs_are_skipped(self, catalog):
+        """A second sync with the same timestamps writes nothing."""
+        result = catalog.sync(LIBRARY)
+        
+        assert (result['added'], result['updated'], result['removed']) == (0, 0, 0)
+    
+    def test_modified_and_removed_songs(self, catalog):
+        """Changed timestamps rewrite the song; missing songs are deleted."""
+        changed = [dict(s) for s in LIBRARY[:4]]
+        changed[1].update({'title': 'Here Comes The Sun', 'last-modified': '2024-02-01T00:00:00Z'})
+        
+        result = catalog.sync(changed)
+        
+        assert (result['added'], result['updated'], result['removed']) == (0, 1, 1)
+        assert catalog.search('here comes')[0]['file'] == 'Beatles/Abbey Road/02.flac'
+        assert catalog.search('something') == []
+        assert catalog.search('motorhead') == []
+    
+    def test_catalog_persists_on_disk(self, tmp_path):
+        """A reopened catalog still answers searches."""
+        path = str(tmp_path / 'library_catalog.db')
+        first = LibraryCatalog(path)
+        first.sync(LIBRARY)
+        first.close()
+        
+        reopened = LibraryCatalog(path)
+        assert reopened.count() == 5
+        assert reopened.search('abbey')[0]['album'] == 'Abbey Road'
+        reopened.close()
+
+
+class TestLibraryCatalogSearch:
+    """Test ranked, prefix-aware full-text search."""
+    
+    def test_prefix_terms(self, catalog):
+        """Partial words match as prefixes."""
+        files = {s['file'] for s in catalog.search('bea')}
+        assert files == {'Beatles/Abbey Road/01.flac', 'Beatles/Abbey Road/02.flac', 'Beach Boys/Pet Sounds/01.flac'}
+    
+    def test_all_terms_must_match(self, catalog):
+        """Multiple words narrow the result."""
+        assert [s['title'] for s in catalog.search('beatles some')] == ['Something']
+    
+    def test_tag_restricts_columns(self, catalog):
+        """A tag limits matching to its columns."""
+        assert {s['file'] for s in catalog.search('blue', tag='album')} == {'Coltrane/Blue Train/01.flac'}
+        assert catalog.search('blue', tag='artist') == []
+    
+    def test_artist_hits_rank_above_title_hits(self, catalog):
+        """bm25 weights rank artist matches first."""
+        catalog.sync(LIBRARY + [song('Misc/Covers/01.flac', 'Someone', 'Covers', 'Coltrane Tribute')])
+        
+        results = catalog.search('coltrane')
+        
+        assert results[0]['artist'] == 'John Coltrane'
+        assert results[-1]['title'] == 'Coltrane Tribute'
+    
+    def test_diacritics_and_multi_value_tags(self, catalog):
+        """Accents are folded and multi-value tags are searchable."""
+        assert catalog.search('motorhead')[0]['artist'] == 'Motörhead'
+        assert catalog.search('bop', tag='genre')[0]['genre'] == 'Jazz; Hard Bop'
+    
+    def test_empty_query(self, catalog):
+        """Queries without words return nothing."""
+        assert catalog.search('  ?! ') == []
+    
+    def test_like_fallback(self, catalog):
+        """Without FTS5 the catalog still answers substring searches."""
+        catalog.fts_available = False
+        
+        assert [s['title'] for s in catalog.search('together')] == ['Come Together']
@@ -0,0 +1,235 @@
+"""Unit tests for the in-memory library index."""
+
+import pytest
+from unittest.mock import MagicMock
+from mpd import CommandError
+from services.library_index import LibraryIndex, LibraryReader, norm_key
+
+
+SONGS = [
+    {'directory': 'Rock'},
+    {'file': 'Rock/Band/Album A/01.flac', 'artist': 'Band', 'albumartist': 'Band', 'album': 'Album A',
+     'title': 'Opening', 'genre': 'Rock', 'track': '1', 'time': '200', 'duration': '200.1'},
+    {'file': 'Rock/Band/Album A/02.flac', 'artist': 'Band feat. Guest', 'albumartist': 'Band', 'album': 'Album A',
+     'title': 'Second Song', 'genre': 'Rock', 'track': '2', 'time': '180'},
+    {'file': 'Jazz/Trio/Blue/01.flac', 'artist': 'Trio', 'album': 'Blue', 'title': 'Blue Opening',
+     'genre': ['Jazz', 'Bebop'], 'track': '1'},
+    {'file': 'Comp/VA/01.flac', 'artist': 'Solo', 'albumartist': 'Various Artists', 'album': 'Hits',
+     'title': 'Hit', 'genre': 'Rock'},
+    {'playlist': 'favourites.m3u'},
+]
+
+
+@pytest.fixture
+def index():
+    idx = LibraryIndex()
+    idx.load(SONGS)
+    return idx
+
+
+class TestLibraryIndexLoad:
+    """Test loading and refreshing the index."""
+    
+    def test_load_skips_non_songs(self, index):
+        """Directories and playlists are not indexed."""
+        assert len(index) == 4
+        assert index.loaded is True
+        assert index.version == 1
+    
+    def test_refresh_uses_listallinfo(self):
+        """refresh() reads the whole database in one command."""
+        client = MagicMock()
+        client.listallinfo.return_value = SONGS
+        idx = LibraryIndex()
+        
+        assert idx.refresh(client) is True
+        assert len(idx) == 4
+        client.listallinfo.assert_called_once_with()
+    
+    def test_refresh_falls_back_per_directory(self):
+        """An oversized listallinfo is retried per top-level directory."""
+        client = MagicMock()
+        client.listallinfo.side_effect = [CommandError('Output buffer is full'), SONGS[1:3], SONGS[3:4]]
+        client.lsinfo.return_value = [{'directory': 'Rock'}, {'directory': 'Jazz'}]
+        idx = LibraryIndex()
+        
+        assert idx.refresh(client) is True
+        assert len(idx) == 3
+    
+    def test_refresh_skipped_while_db_update_unchanged(self):
+        """An unchanged db_update stamp means nothing is re-read."""
+        client = MagicMock()
+        client.stats.return_value = {'db_update': '1700000000'}
+        client.listallinfo.return_value = SONGS
+        idx = LibraryIndex()
+        
+        assert idx.refresh(client) is True
+        assert idx.refresh(client) is True
+        assert client.listallinfo.call_count == 1
+        assert idx.version == 1
+        assert idx.db_update == '1700000000'
+        
+        client.stats.return_value = {'db_update': '1700000500'}
+        assert idx.refresh(client) is True
+        assert client.listallinfo.call_count == 2
+        assert idx.stats()['skipped_refreshes'] == 1
+    
+    def test_failed_refresh_keeps_previous_index(self, index):
+        """A failed reload leaves the old data in place."""
+        client = MagicMock()
+        client.listallinfo.side_effect = OSError('down')
+        
+        assert index.refresh(client) is False
+        assert len(index) == 4
+        assert index.stats()['failed_refreshes'] == 1
+
+
+class TestLibraryIndexQueries:
+    """Test MPD-compatible find/search/list semantics."""
+    
+    def test_find_is_exact(self, index):
+        """find matches whole, case-sensitive values."""
+        assert [s['title'] for s in index.find('albumartist', 'Band', 'album', 'Album A')] == ['Opening', 'Second Song']
+        assert index.find('album', 'album a') == []
+    
+    def test_find_matches_any_value_of_multi_tags(self, index):
+        """Multi-value tags match on each value and come back as lists."""
+        songs = index.find('genre', 'Bebop')
+        assert len(songs) == 1
+        assert songs[0]['genre'] == ['Jazz', 'Bebop']
+    
+    def test_search_is_case_insensitive_substring(self, index):
+        """search matches substrings regardless of case, including 'any'."""
+        assert len(index.search('title', 'opening')) == 2
+        assert [s['file'] for s in index.search('any', 'GUEST')] == ['Rock/Band/Album A/02.flac']
+    
+    def test_list_with_filter(self, index):
+        """list returns unique sorted values in python-mpd2's dict format."""
+        assert index.list('album', 'artist', 'Band') == [{'album': 'Album A'}]
+        assert index.list('genre') == [{'genre': 'Bebop'}, {'genre': 'Jazz'}, {'genre': 'Rock'}]
+    
+    def test_tag_counts(self, index):
+        """tag_counts reports the number of tracks per value."""
+        assert index.tag_counts('albumartist') == {'Band': 2, 'Various Artists': 1}
+        assert index.tag_counts('Genre')['Rock'] == 3
+    
+    def test_odd_filter_arguments_rejected(self, index):
+        """Unpaired filter arguments raise like MPD does."""
+        with pytest.raises(CommandError):
+            index.find('artist')
+    
+    def test_song_dict_round_trip(self, index):
+        """Records convert back to MPD-style dicts."""
+        song = index.get('Rock/Band/Album A/01.flac')
+        assert song['duration'] == '200.1'
+        assert song['track'] == '1'
+        assert index.get('missing.flac') is None
+    
+    def test_listallinfo_under_directory(self, index):
+        """base filtering limits results to a directory subtree."""
+        assert len(index.listallinfo('Rock')) == 2
+        assert len(index.listallinfo()) == 4
+        assert len(index.directory('Rock/Band/Album A')) == 2
+
+
+class TestLibraryIndexBrowse:
+    """Test the genre -> artist -> album -> directory tree."""
+    
+    def test_genres_and_artists(self, index):
+        """Artists are grouped by AlbumArtist, falling back to Artist."""
+        assert index.genres() == ['Bebop', 'Jazz', 'Rock']
+        assert index.artists('Rock') == {'Band': {'Album A'}, 'Various Artists': {'Hits'}}
+        assert index.artists('Jazz') == {'Trio': {'Blue'}}
+    
+    def test_genre_stats(self, index):
+        """Counts and playtime per genre are computed at load time."""
+        stats = index.genre_stats()
+        
+        assert stats['Rock'] == {'artist_count': 2, 'album_count': 2, 'track_count': 3, 'playtime': 380}
+        assert stats['Bebop']['track_count'] == 1
+        assert stats['Bebop']['playtime'] == 0
+    
+    def test_albums_by_directory(self, index):
+        """Each album lists its tracks per directory."""
+        albums = index.albums('Rock', 'Band')
+        assert list(albums) == ['Album A']
+        assert len(albums['Album A']['Rock/Band/Album A']) == 2
+
+
+class TestAlbumResolver:
+    """Test normalized album lookups."""
+    
+    DISCS = [
+        {'file': 'Box/Set/Disc 2/01.flac', 'albumartist': 'AC/DC', 'artist': 'AC/DC', 'album': 'Live!', 'track': '1'},
+        {'file': 'Box/Set/Disc 1/02.flac', 'albumartist': 'AC/DC', 'artist': 'AC/DC', 'album': 'Live!', 'track': '2/9'},
+        {'file': 'Box/Set/Disc 1/01.flac', 'albumartist': 'AC/DC', 'artist': 'AC/DC', 'album': 'Live!', 'track': '1/9'},
+        {'file': 'Other/Live/01.flac', 'artist': 'Someone', 'album': 'Live!', 'track': '1'},
+    ]
+    
+    def files(self, songs):
+        return [song['file'] for song in songs]
+    
+    def test_norm_key(self):
+        """Case and punctuation are ignored, non-ASCII letters are kept."""
+        assert norm_key('AC/DC') == norm_key('ac-dc') == 'acdc'
+        assert norm_key('Sigur Rós') == 'sigurrós'
+        assert norm_key(None) == ''
+    
+    def test_resolves_normalized_names_in_disc_order(self, index):
+        """Directories and track numbers order the tracks; names need not match exactly."""
+        index.load(self.DISCS)
+        
+        assert self.files(index.resolve_album('ac dc', 'LIVE')) == [
+            'Box/Set/Disc 1/01.flac', 'Box/Set/Disc 1/02.flac', 'Box/Set/Disc 2/01.flac']
+        assert self.files(index.resolve_album('AC/DC', 'Live!', album_dir='Box/Set/Disc 2')) == [
+            'Box/Set/Disc 2/01.flac']
+    
+    def test_track_artist_and_partial_names(self, index):
+        """Guest artists find their tracks; close album names still resolve."""
+        assert self.files(index.resolve_album('Solo', 'Hits')) == ['Comp/VA/01.flac']
+        assert self.files(index.resolve_album('band feat guest', 'album a')) == ['Rock/Band/Album A/02.flac']
+        assert len(index.resolve_album('Band', 'Album A (Remastered)')) == 2
+        assert len(index.resolve_album('Various Artists', 'Hits')) == 1
+    
+    def test_album_only_and_misses(self, index):
+        """Without an artist the album name alone is used; unknown albums give []."""
+        index.load(self.DISCS)
+        
+        assert len(index.resolve_album('', 'live')) == 4
+        assert index.resolve_album('Nobody', 'No Such Album') == []
+        assert index.resolve_album('AC/DC', 'Live!', album_dir='Nowhere') == []
+    
+    def test_unmatched_artist_falls_back_to_album_name(self, index):
+        """A display artist matching no tag (joined names) still finds the album, within album_dir."""
+        index.load(self.DISCS)
+        
+        assert len(index.resolve_album('AC/DC, Guest', 'Live!')) == 4
+        assert self.files(index.resolve_album('AC/DC, Guest', 'Live!', album_dir='Box/Set/Disc 2')) == [
+            'Box/Set/Disc 2/01.flac']
+
+
+class TestLibraryReader:
+    """Test the client-like reader."""
+    
+    def test_reader_answers_without_mpd(self, index):
+        """The reader exposes the query subset of the MPD client."""
+        reader = index.reader()
+        
+        assert isinstance(reader, LibraryReader)
+        assert len(reader.find('artist', 'Trio')) == 1
+        assert len(reader.search('album', 'hit')) == 1
+        assert reader.list('album') == [{'album': 'Album A'}, {'album': 'Blue'}, {'album': 'Hits'}]
+        assert reader.disconnect() is None
+    
+    def test_reader_delegates_search(self, index):
+        """A searcher replaces the scan for single-tag searches."""
+        calls = []
+        
+        def searcher(query, tag='any'):
+            calls.append((query, tag))
+            return [{'file': 'ranked.flac'}]
+        reader = index.reader(searcher=searcher)
+        
+        assert reader.search('Album', 'hit') == [{'file': 'ranked.flac'}]
+        assert calls == [('hit', 'album')]
+        assert len(reader.search('album', 'hit', 'artist', 'solo')) == 1
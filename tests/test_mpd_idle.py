@@ -0,0 +1,196 @@
+"""Unit tests for the MPD idle watcher and state cache."""
+
+import threading
+import pytest
+from unittest.mock import patch, MagicMock
+from services.mpd_idle import MPDIdleWatcher, MPDStateCache, extrapolate_elapsed
+
+
+def make_client(song='0', playlistlength='3'):
+    """Build a mock MPD client with a small queue."""
+    client = MagicMock()
+    client.status.return_value = {
+        'state': 'play', 'song': song, 'playlistlength': playlistlength,
+        'elapsed': '10.0', 'duration': '200.0', 'volume': '50'
+    }
+    client.currentsong.return_value = {'id': '1', 'title': 'Current', 'time': '200'}
+    client.playlistinfo.return_value = [{'title': 'Next', 'artist': 'Artist'}]
+    return client
+
+
+class TestMPDStateCache:
+    """Test selective refreshes of the cached player state."""
+    
+    def test_first_refresh_reads_everything(self):
+        """The first refresh loads status, current song and next song."""
+        cache = MPDStateCache()
+        client = make_client()
+        
+        parts = cache.refresh(client, {'mixer'})
+        
+        assert parts == {'status', 'currentsong', 'nextsong'}
+        client.playlistinfo.assert_called_once_with(1)
+        status, current, next_song, _ = cache.snapshot()
+        assert current['title'] == 'Current'
+        assert next_song['title'] == 'Next'
+    
+    def test_mixer_change_only_reads_status(self):
+        """Volume changes do not re-read the current song or queue."""
+        cache = MPDStateCache()
+        client = make_client()
+        cache.refresh(client)
+        client.reset_mock()
+        
+        cache.refresh(client, {'mixer'})
+        
+        client.status.assert_called_once()
+        client.currentsong.assert_not_called()
+        client.playlistinfo.assert_not_called()
+    
+    def test_unknown_subsystem_is_ignored(self):
+        """Subsystems without display impact trigger no commands."""
+        cache = MPDStateCache()
+        client = make_client()
+        cache.refresh(client)
+        client.reset_mock()
+        
+        assert cache.refresh(client, {'sticker'}) == set()
+        client.status.assert_not_called()
+    
+    def test_last_song_has_no_next(self):
+        """No next-song lookup when the current song is last in the queue."""
+        cache = MPDStateCache()
+        client = make_client(song='2', playlistlength='3')
+        
+        cache.refresh(client)
+        
+        client.playlistinfo.assert_not_called()
+        assert cache.snapshot()[2] == {}
+    
+    def test_invalidate_forces_full_refresh(self):
+        """After invalidate() the next refresh reads everything again."""
+        cache = MPDStateCache()
+        client = make_client()
+        cache.refresh(client)
+        cache.invalidate()
+        client.reset_mock()
+        
+        cache.refresh(client, {'mixer'})
+        
+        client.currentsong.assert_called_once()
+    
+    def test_next_song_from_queue_mirror(self):
+        """With a queue mirror the next song comes from the mirror, not playlistinfo."""
+        queue = MagicMock()
+        queue.get.return_value = {'title': 'Mirrored'}
+        cache = MPDStateCache(queue=queue)
+        client = make_client()
+        
+        cache.refresh(client)
+        
+        queue.sync.assert_called_once_with(client, client.status.return_value)
+        queue.get.assert_called_once_with(1)
+        client.playlistinfo.assert_not_called()
+        assert cache.snapshot()[2]['title'] == 'Mirrored'
+    
+    @patch('services.mpd_idle.time')
+    def test_elapsed_is_extrapolated(self, mock_time):
+        """Elapsed time advances locally while playing."""
+        mock_time.time.return_value = 1000.0
+        cache = MPDStateCache()
+        cache.refresh(make_client())
+        
+        assert cache.elapsed(now=1005.0) == pytest.approx(15.0)
+
+
+class TestExtrapolateElapsed:
+    """Test elapsed time extrapolation."""
+    
+    def test_paused_does_not_advance(self):
+        """Paused playback keeps the reported position."""
+        assert extrapolate_elapsed('42.5', 100.0, 'pause', now=200.0) == 42.5
+    
+    def test_clamped_to_duration(self):
+        """Extrapolation never runs past the end of the song."""
+        assert extrapolate_elapsed('190', 100.0, 'play', duration='200', now=150.0) == 200.0
+    
+    def test_invalid_elapsed(self):
+        """Missing or malformed elapsed values are treated as zero."""
+        assert extrapolate_elapsed(None, 0, 'stop') == 0.0
+        assert extrapolate_elapsed('bad', 0, 'stop') == 0.0
+
+
+class TestMPDIdleWatcher:
+    """Test the idle loop."""
+    
+    @patch('services.mpd_idle.MPDClient')
+    def test_reports_initial_and_idle_changes(self, mock_mpd):
+        """Callback fires once after connecting and again for each idle wakeup."""
+        calls = []
+        done = threading.Event()
+        watcher = None
+        
+        def on_change(client, subsystems):
+            calls.append(subsystems)
+            if len(calls) == 2:
+                done.set()
+        
+        def idle(*subsystems):
+            if done.is_set():
+                watcher._stop_event.wait(5)
+                raise ConnectionError('closed')
+            return ['player']
+        
+        mock_mpd.return_value.idle.side_effect = idle
+        watcher = MPDIdleWatcher(host='localhost', port=6600, on_change=on_change)
+        watcher.start()
+        assert done.wait(5)
+        watcher.stop()
+        
+        assert calls[0] is None
+        assert calls[1] == {'player'}
+        mock_mpd.return_value.connect.assert_called_with('localhost', 6600)
+        mock_mpd.return_value.idle.assert_called_with(
+            'player', 'mixer', 'options', 'playlist', 'database', 'update'
+        )
+    
+    @patch('services.mpd_idle.MPDClient')
+    def test_disconnect_callback_and_reconnect(self, mock_mpd):
+        """Connection failures are reported and retried."""
+        errors = []
+        retried = threading.Event()
+        
+        def connect(host, port):
+            if errors:
+                retried.set()
+            raise ConnectionRefusedError('down')
+        
+        mock_mpd.return_value.connect.side_effect = connect
+        watcher = MPDIdleWatcher(on_disconnect=errors.append, reconnect_delay=0.01)
+        watcher.start()
+        assert retried.wait(5)
+        watcher.stop()
+        
+        assert isinstance(errors[0], ConnectionRefusedError)
+        assert watcher.connected is False
+        assert watcher.stats()['disconnects'] >= 1
+    
+    @patch('services.mpd_idle.MPDClient')
+    def test_callback_errors_do_not_stop_loop(self, mock_mpd):
+        """A failing change handler does not drop the idle connection."""
+        wakeups = threading.Event()
+        count = {'n': 0}
+        
+        def on_change(client, subsystems):
+            count['n'] += 1
+            if count['n'] >= 3:
+                wakeups.set()
+            raise ValueError('handler bug')
+        
+        mock_mpd.return_value.idle.return_value = ['mixer']
+        watcher = MPDIdleWatcher(on_change=on_change)
+        watcher.start()
+        assert wakeups.wait(5)
+        watcher.stop()
+        
+        assert watcher.stats()['connects'] == 1
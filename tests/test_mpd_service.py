@@ -2,7 +2,7 @@
 
 import pytest
 from unittest.mock import patch, MagicMock, call
-from services.mpd_service import MPDService
+from services.mpd_service import MPDService, MPDConnectionPool, PooledMPDClient, add_uris_batched
 
 
 class TestMPDServiceInit:
@@ -567,3 +567,210 @@ class TestConnectionManagement:
         # Should not raise
         service.close()
         assert service.client is None
+
+
+class TestMPDConnectionPool:
+    """Test the pooled connection manager."""
+    
+    @patch('services.mpd_service.MPDClient')
+    def test_acquire_opens_connection_lazily(self, mock_mpd):
+        """No connection is opened until the first checkout."""
+        pool = MPDConnectionPool(host='localhost', port=6600, max_size=2)
+        assert mock_mpd.call_count == 0
+        
+        client = pool.acquire()
+        
+        assert isinstance(client, PooledMPDClient)
+        mock_mpd.return_value.connect.assert_called_once_with('localhost', 6600)
+        assert pool.stats()['connects'] == 1
+    
+    @patch('services.mpd_service.MPDClient')
+    def test_disconnect_returns_connection_for_reuse(self, mock_mpd):
+        """disconnect() on a lease returns it to the pool instead of closing."""
+        pool = MPDConnectionPool(max_size=2)
+        
+        first = pool.acquire()
+        first.status()
+        first.disconnect()
+        second = pool.acquire()
+        second.disconnect()
+        
+        assert mock_mpd.call_count == 1
+        mock_mpd.return_value.disconnect.assert_not_called()
+        stats = pool.stats()
+        assert stats['connects'] == 1
+        assert stats['reuses'] == 1
+        assert stats['idle'] == 1
+        assert stats['in_use'] == 0
+    
+    @patch('services.mpd_service.MPDClient')
+    def test_context_manager_checkin(self, mock_mpd):
+        """connection() checks the client back in on exit."""
+        pool = MPDConnectionPool(max_size=1)
+        
+        with pool.connection() as client:
+            client.play()
+            assert pool.stats()['in_use'] == 1
+        
+        assert pool.stats()['in_use'] == 0
+        mock_mpd.return_value.play.assert_called_once()
+    
+    @patch('services.mpd_service.MPDClient')
+    def test_broken_connection_is_discarded(self, mock_mpd):
+        """A socket-level error drops the connection so the next checkout reconnects."""
+        from mpd import ConnectionError as MPDConnectionError
+        broken = MagicMock()
+        broken.status.side_effect = MPDConnectionError('Connection lost')
+        healthy = MagicMock()
+        mock_mpd.side_effect = [broken, healthy]
+        pool = MPDConnectionPool(max_size=1)
+        
+        client = pool.acquire()
+        with pytest.raises(MPDConnectionError):
+            client.status()
+        client.disconnect()
+        
+        client = pool.acquire()
+        assert client.raw_client is healthy
+        assert pool.stats()['discards'] == 1
+        broken.disconnect.assert_called_once()
+    
+    @patch('services.mpd_service.MPDClient')
+    def test_stale_idle_connection_is_health_checked(self, mock_mpd):
+        """Connections idle past the check interval are pinged before reuse."""
+        pool = MPDConnectionPool(max_size=1, health_check_interval=0)
+        
+        pool.acquire().disconnect()
+        pool.acquire().disconnect()
+        
+        mock_mpd.return_value.ping.assert_called()
+    
+    @patch('services.mpd_service.MPDClient')
+    def test_exhausted_pool_times_out(self, mock_mpd):
+        """When every connection is checked out, acquire() gives up after the timeout."""
+        pool = MPDConnectionPool(max_size=1)
+        held = pool.acquire()
+        
+        assert pool.acquire(timeout=0.01) is None
+        assert pool.stats()['timeouts'] == 1
+        held.disconnect()
+    
+    @patch('services.mpd_service.MPDClient')
+    def test_connect_failure_returns_none(self, mock_mpd):
+        """An unreachable MPD yields None, like connect_mpd_client() always has."""
+        mock_mpd.return_value.connect.side_effect = ConnectionRefusedError()
+        pool = MPDConnectionPool(max_size=1)
+        
+        assert pool.acquire() is None
+        stats = pool.stats()
+        assert stats['connect_failures'] == 1
+        assert stats['in_use'] == 0
+    
+    @patch('services.mpd_service.MPDClient')
+    def test_released_lease_rejects_commands(self, mock_mpd):
+        """A lease cannot be used after it has been returned."""
+        from mpd import ConnectionError as MPDConnectionError
+        pool = MPDConnectionPool(max_size=1)
+        client = pool.acquire()
+        client.disconnect()
+        client.disconnect()  # idempotent
+        
+        with pytest.raises(MPDConnectionError):
+            client.status()
+        assert pool.stats()['idle'] == 1
+
+
+class FakeCommandListClient:
+    """Minimal client that mimics MPD command list semantics for add."""
+    
+    def __init__(self, missing=(), offsets=True):
+        self.missing = set(missing)
+        self.offsets = offsets
+        self.queue = []
+        self.round_trips = 0
+        self._pending = None
+    
+    def ping(self):
+        pass
+    
+    def command_list_ok_begin(self):
+        self._pending = []
+    
+    def add(self, uri):
+        from mpd import CommandError
+        if self._pending is not None:
+            self._pending.append(uri)
+            return None
+        self.round_trips += 1
+        if uri in self.missing:
+            raise CommandError(f'[50@0] {{add}} No such directory')
+        self.queue.append(uri)
+    
+    def command_list_end(self):
+        from mpd import CommandError
+        pending, self._pending = self._pending, None
+        self.round_trips += 1
+        for index, uri in enumerate(pending):
+            if uri in self.missing:
+                error = CommandError(f'[50@{index}] {{add}} No such directory')
+                if not self.offsets:
+                    error.offset = None
+                raise error
+            self.queue.append(uri)
+        return [None] * len(pending)
+
+
+class TestAddUrisBatched:
+    """Test bulk queue additions over command lists."""
+    
+    def test_chunks_into_round_trips(self):
+        """1200 URIs with chunk=500 take three command lists."""
+        client = FakeCommandListClient()
+        uris = [f'Music/song{i}.flac' for i in range(1200)]
+        
+        result = add_uris_batched(client, uris, chunk=500)
+        
+        assert result == {'added': 1200, 'failed': [], 'round_trips': 3}
+        assert client.queue == uris
+        assert client.round_trips == 3
+    
+    def test_failed_uri_is_reported_and_rest_resent(self):
+        """A bad URI is recorded and the songs after it are still added."""
+        client = FakeCommandListClient(missing={'b', 'e'})
+        
+        result = add_uris_batched(client, ['a', 'b', 'c', 'd', 'e', 'f'], chunk=10)
+        
+        assert client.queue == ['a', 'c', 'd', 'f']
+        assert result['added'] == 4
+        assert [uri for uri, _ in result['failed']] == ['b', 'e']
+        assert result['round_trips'] == 3
+    
+    def test_chunk_reported_failed_without_offset(self):
+        """Without an error offset the chunk is reported failed instead of resent."""
+        client = FakeCommandListClient(missing={'b'}, offsets=False)
+        
+        result = add_uris_batched(client, ['a', 'b', 'c'], chunk=10)
+        
+        assert client.queue == ['a']
+        assert result['added'] == 0
+        assert [uri for uri, _ in result['failed']] == ['a', 'b', 'c']
+        assert result['round_trips'] == 1
+    
+    def test_empty_input(self):
+        """Nothing is sent when there is nothing to add."""
+        client = FakeCommandListClient()
+        
+        assert add_uris_batched(client, [None, '']) == {'added': 0, 'failed': [], 'round_trips': 0}
+        assert client.round_trips == 0
+    
+    @patch('services.mpd_service.MPDClient')
+    def test_service_add_many(self, mock_mpd):
+        """MPDService.add_many batches on its own connection."""
+        service = MPDService()
+        service.client = FakeCommandListClient(missing={'x'})
+        
+        result = service.add_many(['a', 'x', 'b'])
+        
+        assert result['added'] == 2
+        assert result['failed'][0][0] == 'x'
+        assert service.client.queue == ['a', 'b']
@@ -0,0 +1,180 @@
+"""Unit tests for QueueMirror."""
+
+import pytest
+from unittest.mock import MagicMock
+from mpd import CommandError
+from services.queue_mirror import QueueMirror
+
+
+class FakeQueueServer:
+    """Minimal MPD queue model that answers plchanges like the real server."""
+    
+    def __init__(self, files):
+        self.next_id = 1
+        self.queue = []
+        self.history = {}
+        self.version = 1
+        for f in files:
+            self._append(f)
+        self._commit()
+        self.calls = []
+    
+    def _append(self, f):
+        self.queue.append({'file': f, 'id': str(self.next_id), 'title': f.upper()})
+        self.next_id += 1
+    
+    def _commit(self):
+        self.version += 1
+        self.history[self.version] = [s['id'] for s in self.queue]
+    
+    def add(self, f):
+        self._append(f)
+        self._commit()
+    
+    def delete(self, pos):
+        del self.queue[pos]
+        self._commit()
+    
+    def move(self, src, dst):
+        self.queue.insert(dst, self.queue.pop(src))
+        self._commit()
+    
+    def status(self):
+        self.calls.append('status')
+        return {'playlist': str(self.version), 'playlistlength': str(len(self.queue))}
+    
+    def playlistinfo(self):
+        self.calls.append('playlistinfo')
+        return [dict(s, pos=str(i)) for i, s in enumerate(self.queue)]
+    
+    def _changed(self, version):
+        old = self.history.get(int(version), [])
+        return [i for i, s in enumerate(self.queue) if i >= len(old) or old[i] != s['id']]
+    
+    def plchanges(self, version):
+        self.calls.append('plchanges')
+        return [dict(self.queue[i], pos=str(i)) for i in self._changed(version)]
+    
+    def plchangesposid(self, version):
+        self.calls.append('plchangesposid')
+        return [{'cpos': str(i), 'id': self.queue[i]['id']} for i in self._changed(version)]
+
+
+def files(mirror):
+    return [s['file'] for s in mirror.playlist()]
+
+
+class TestQueueMirrorSync:
+    """Test incremental synchronisation."""
+    
+    def test_first_sync_loads_full_queue(self):
+        """The initial sync fetches the whole queue once."""
+        server = FakeQueueServer(['a', 'b', 'c'])
+        mirror = QueueMirror()
+        
+        assert mirror.sync(server) == -1
+        
+        assert files(mirror) == ['a', 'b', 'c']
+        assert [s['pos'] for s in mirror.playlist()] == [0, 1, 2]
+        assert mirror.version == server.version
+    
+    def test_unchanged_queue_costs_one_status(self):
+        """No queue commands are sent when the version has not moved."""
+        server = FakeQueueServer(['a', 'b'])
+        mirror = QueueMirror()
+        mirror.sync(server)
+        server.calls.clear()
+        
+        assert mirror.sync(server) == 0
+        assert server.calls == ['status']
+    
+    def test_status_passed_in_saves_round_trip(self):
+        """A caller-supplied status avoids any MPD command when nothing changed."""
+        server = FakeQueueServer(['a'])
+        mirror = QueueMirror()
+        mirror.sync(server)
+        status = server.status()
+        server.calls.clear()
+        
+        mirror.sync(server, status)
+        
+        assert server.calls == []
+    
+    def test_append_fetches_only_new_song(self):
+        """Appending fetches tags for the new song only."""
+        server = FakeQueueServer(['a', 'b'])
+        mirror = QueueMirror()
+        mirror.sync(server)
+        server.add('c')
+        server.calls.clear()
+        
+        assert mirror.sync(server) == 1
+        
+        assert files(mirror) == ['a', 'b', 'c']
+        assert 'playlistinfo' not in server.calls
+    
+    def test_delete_head_uses_positions_only(self):
+        """Consume-style deletes are applied from plchangesposid without re-reading tags."""
+        server = FakeQueueServer(['a', 'b', 'c', 'd'])
+        mirror = QueueMirror()
+        mirror.sync(server)
+        server.delete(0)
+        server.calls.clear()
+        
+        mirror.sync(server)
+        
+        assert files(mirror) == ['b', 'c', 'd']
+        assert server.calls == ['status', 'plchangesposid']
+        assert mirror.get(0)['title'] == 'B'
+    
+    def test_move_and_truncate(self):
+        """Moves and deletions at the tail produce the server's order."""
+        server = FakeQueueServer(['a', 'b', 'c', 'd'])
+        mirror = QueueMirror()
+        mirror.sync(server)
+        server.move(3, 0)
+        server.delete(3)
+        
+        mirror.sync(server)
+        
+        assert files(mirror) == ['d', 'a', 'b']
+        assert [s['pos'] for s in mirror.playlist()] == [0, 1, 2]
+    
+    def test_version_going_backwards_reloads(self):
+        """A lower version (MPD restarted) triggers a full reload."""
+        server = FakeQueueServer(['a'])
+        mirror = QueueMirror()
+        mirror.sync(server)
+        server.version = 1
+        server.calls.clear()
+        
+        assert mirror.sync(server) == -1
+        assert 'playlistinfo' in server.calls
+    
+    def test_command_error_falls_back_to_full_load(self):
+        """A failing plchangesposid falls back to playlistinfo."""
+        server = FakeQueueServer(['a'])
+        mirror = QueueMirror()
+        mirror.sync(server)
+        server.add('b')
+        server.plchangesposid = MagicMock(side_effect=CommandError('nope'))
+        
+        assert mirror.sync(server) == -1
+        assert files(mirror) == ['a', 'b']
+    
+    def test_invalidate(self):
+        """invalidate() forces the next sync to reload everything."""
+        server = FakeQueueServer(['a'])
+        mirror = QueueMirror()
+        mirror.sync(server)
+        mirror.invalidate()
+        
+        assert len(mirror) == 0
+        assert mirror.sync(server) == -1
+        assert mirror.stats()['full_loads'] == 2
+    
+    def test_get_out_of_range(self):
+        """get() returns None outside the queue."""
+        mirror = QueueMirror()
+        
+        assert mirror.get(0) is None
@@ -0,0 +1,73 @@
+"""Unit tests for the recent albums index."""
+
+import pytest
+from services.library_index import LibraryIndex
+from services.recent_albums import RecentAlbumsIndex
+
+
+def song(file, album, modified, artist='Band', **extra):
+    data = {'file': file, 'artist': artist, 'album': album, 'last-modified': modified, 'time': '100'}
+    data.update(extra)
+    return data
+
+
+SONGS = [
+    song('ripped/Band/Old/01.flac', 'Old', '2023-01-01T00:00:00Z', genre='Rock'),
+    song('ripped/Band/Old/02.flac', 'Old', '2023-01-02T00:00:00Z'),
+    song('ripped/Box/Disc 1/01.flac', 'Box', '2024-05-01T00:00:00Z', albumartist='Band', disc='1'),
+    song('ripped/Box/Disc 2/01.flac', 'Box', '2024-05-02T00:00:00Z', albumartist='Band', disc='2/2', time='4000'),
+    song('ripped/Other/Hits/01.flac', 'Hits', '2024-01-01T00:00:00Z', artist=['A', 'B']),
+    song('vinyl/New/01.flac', 'New', '2025-01-01T00:00:00Z'),
+    song('archive/Ancient/01.flac', 'Ancient', '2026-01-01T00:00:00Z'),
+]
+
+
+@pytest.fixture
+def index():
+    idx = LibraryIndex()
+    idx.load(SONGS)
+    return idx
+
+
+@pytest.fixture
+def recent(index):
+    return RecentAlbumsIndex(index)
+
+
+class TestRecentAlbumsIndex:
+    """Test summaries, ordering and rebuilds."""
+    
+    def test_newest_first_within_directories(self, recent):
+        """Only configured directories count, newest last-modified first."""
+        albums = recent.recent(10, ['ripped', '/vinyl/'])
+        
+        assert [a['album'] for a in albums] == ['New', 'Box', 'Hits', 'Old']
+        assert [a['album'] for a in recent.recent(2, ['ripped'])] == ['Box', 'Hits']
+    
+    def test_compact_summary(self, recent):
+        """Summaries carry counts, duration and disc layout but no song lists."""
+        box, hits, old = recent.recent(10, ['ripped'])
+        
+        assert box == {
+            'album': 'Box', 'artist': 'Band [ripped]', 'original_artist': 'Band', 'genre': 'Unknown Genre',
+            'date': '2024-05-02T00:00:00Z', 'file_count': 2, 'duration': 4100,
+            'duration_formatted': '1:08:20', 'sample_file': 'ripped/Box/Disc 1/01.flac',
+            'disc_structure': {1: 1, 2: 1}, 'is_multi_disc': True,
+        }
+        assert (hits['artist'], hits['original_artist']) == ('A, B [ripped]', 'A')
+        assert (old['file_count'], old['duration_formatted'], old['disc_structure']) == (2, '3:20', None)
+    
+    def test_rebuilds_only_on_reload_or_new_directories(self, index, recent):
+        """Queries reuse the summaries until the index version or directories change."""
+        recent.recent(5, ['ripped'])
+        recent.recent(5, ['ripped'])
+        assert recent.stats()['rebuilds'] == 1
+        
+        assert [a['album'] for a in recent.recent(5, ['archive'])] == ['Ancient']
+        index.load(SONGS + [song('archive/Fresh/01.flac', 'Fresh', '2026-06-01T00:00:00Z')])
+        assert [a['album'] for a in recent.recent(5, ['archive'])] == ['Fresh', 'Ancient']
+        assert recent.stats()['rebuilds'] == 3
+        
+        recent.invalidate()
+        recent.recent(5, ['archive'])
+        assert recent.stats()['rebuilds'] == 4
@@ -0,0 +1,71 @@
+"""Unit tests for the built-in search."""
+
+import pytest
+from unittest.mock import MagicMock
+from services.search_service import perform_search, group_by_album
+
+
+SONGS = [
+    {'file': 'Davis/Kind of Blue/01.flac', 'artist': 'Miles Davis', 'album': 'Kind of Blue', 'genre': 'Jazz'},
+    {'file': 'Davis/Kind of Blue/02.flac', 'artist': 'Miles Davis', 'album': 'Kind of Blue', 'genre': 'Jazz'},
+    {'file': 'Davis/Bitches Brew/01.flac', 'artist': 'Miles Davis', 'album': 'Bitches Brew', 'genre': 'Fusion'},
+    {'file': 'Remasters/Kind of Blue/01.flac', 'artist': 'Miles Davis', 'album': 'Kind of Blue', 'genre': 'Jazz'},
+    {'file': 'Loose/untagged.flac', 'artist': 'Miles Davis'},
+]
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.find.return_value = SONGS
+    client.search.return_value = SONGS[:2]
+    return client
+
+
+class TestArtistSearch:
+    """Test the artist branch."""
+    
+    def test_single_find_grouped_by_album_and_directory(self, client):
+        """One find() builds every album row; no per-album queries."""
+        results = perform_search(client, 'artist', 'Miles Davis')
+        
+        client.find.assert_called_once_with('artist', 'Miles Davis')
+        client.list.assert_not_called()
+        assert [(r['album'], r['sample_file'], r['track_count']) for r in results] == [
+            ('Bitches Brew', 'Davis/Bitches Brew/01.flac', 1),
+            ('Kind of Blue', 'Davis/Kind of Blue/01.flac', 2),
+            ('Kind of Blue', 'Remasters/Kind of Blue/01.flac', 1),
+        ]
+        assert results[0] == {'item_type': 'album', 'artist': 'Miles Davis', 'album': 'Bitches Brew',
+                              'genre': 'Fusion', 'track_count': 1, 'sample_file': 'Davis/Bitches Brew/01.flac'}
+    
+    def test_no_exact_artist_falls_back_to_song_search(self, client):
+        """Without an exact artist match the substring search returns songs."""
+        client.find.return_value = []
+        
+        results = perform_search(client, 'artist', 'miles')
+        
+        client.search.assert_called_once_with('artist', 'miles')
+        assert [r['item_type'] for r in results] == ['song', 'song']
+
+
+class TestOtherSearches:
+    """Test album, any and title searches."""
+    
+    def test_album_and_any_group_songs(self, client):
+        """Album and any searches return album rows."""
+        assert perform_search(client, 'album', 'kind')[0]['track_count'] == 2
+        assert perform_search(client, 'any', 'kind')[0]['item_type'] == 'album'
+    
+    def test_group_by_album_keeps_directories_apart(self):
+        """Same album name in two directories gives two rows."""
+        rows = group_by_album(SONGS[:4])
+        
+        assert [(r['album'], r['track_count']) for r in rows] == [
+            ('Kind of Blue', 2), ('Bitches Brew', 1), ('Kind of Blue', 1)]
+    
+    def test_errors_return_empty(self, client):
+        """Client errors produce no results instead of raising."""
+        client.search.side_effect = ConnectionError('gone')
+        
+        assert perform_search(client, 'title', 'so what') == []
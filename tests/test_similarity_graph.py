@@ -0,0 +1,142 @@
+"""Unit tests for the offline artist similarity graph."""
+
+import pytest
+from services.library_index import LibraryIndex
+from services.similarity_graph import SimilarityGraph, read_playlist_artists
+
+
+SONGS = [
+    {'file': 'comp/01.flac', 'artist': 'Alpha', 'albumartist': 'Various', 'album': 'Comp'},
+    {'file': 'comp/02.flac', 'artist': 'Beta', 'albumartist': 'Various', 'album': 'Comp'},
+    {'file': 'comp/03.flac', 'artist': ['Gamma', 'Delta'], 'albumartist': 'Various', 'album': 'Comp'},
+    {'file': 'solo/01.flac', 'artist': 'Epsilon', 'album': 'Solo'},
+]
+
+
+def similar_response(artist, *names):
+    return {'similarartists': {
+        '@attr': {'artist': artist},
+        'artist': [{'name': name, 'match': str(match)} for name, match in names],
+    }}
+
+
+@pytest.fixture
+def index():
+    idx = LibraryIndex()
+    idx.load(SONGS)
+    return idx
+
+
+@pytest.fixture
+def graph():
+    return SimilarityGraph()
+
+
+class TestLearning:
+    """Test history and Last.fm edges."""
+    
+    def test_transitions_accumulate(self, graph):
+        """Repeated consecutive plays strengthen a link in both directions."""
+        graph.learn_transition('Alpha', 'Beta')
+        graph.learn_transition('Alpha', 'Gamma')
+        graph.learn_transition('Gamma', 'Alpha')
+        graph.learn_transition('Alpha', 'alpha')
+        
+        assert graph.similar('ALPHA') == ['Gamma', 'Beta']
+        assert graph.similar('Beta') == ['Alpha']
+        assert graph.similar('Nobody') == []
+    
+    def test_lastfm_answers_merge_without_inflating(self, graph):
+        """Fetching the same artist again keeps each neighbor's best match instead of adding up."""
+        graph.learn_lastfm_response({'artist': 'Alpha'}, similar_response('Alpha', ('Beta', 0.2), ('Gamma', 1)))
+        graph.learn_lastfm_response({'artist': 'Alpha'}, similar_response('Alpha', ('Beta', 0.2), ('Gamma', 1)))
+        graph.learn_similar('Alpha', ['Beta', 'Delta'])
+        graph.learn_transition('Beta', 'Gamma')
+        
+        assert graph.knows_lastfm('alpha') and not graph.knows_lastfm('Beta')
+        assert graph.similar('Alpha') == ['Beta', 'Gamma', 'Delta']
+        assert graph.similar('Gamma') == ['Alpha', 'Beta']
+
+
+class TestRebuild:
+    """Test rebuilding derived edges from local sources."""
+    
+    def test_directories_playlists_queue_and_cache(self, graph, index):
+        """Shared directories, list neighbors and cached Last.fm answers all become edges."""
+        graph.rebuild(index,
+                      playlists=[['Epsilon', 'Zeta']],
+                      queue_artists=['Zeta', 'Eta'],
+                      lastfm_entries=[({'artist': 'eta', 'limit': 30},
+                                       similar_response('Eta', ('Theta', 0.5)))])
+        
+        assert set(graph.similar('Alpha')) == {'Beta', 'Gamma', 'Delta'}
+        assert graph.similar('Epsilon') == ['Zeta']
+        assert graph.similar('Eta') == ['Theta', 'Zeta']
+        assert graph.stats()['rebuilds'] == 1
+    
+    def test_rebuild_replaces_derived_but_keeps_learned(self, graph, index):
+        """Playlist edges go away with the playlist; play history survives."""
+        graph.rebuild(index, playlists=[['Epsilon', 'Zeta']])
+        graph.learn_transition('Epsilon', 'Beta')
+        graph.rebuild(index)
+        
+        assert graph.similar('Epsilon') == ['Beta']
+
+
+class TestPersistence:
+    """Test the on-disk format and playlist parsing."""
+    
+    def test_round_trip(self, tmp_path, index):
+        """Learned, Last.fm and derived edges survive a restart with display names intact."""
+        path = str(tmp_path / 'graph.json')
+        graph = SimilarityGraph(path)
+        graph.learn_transition('Epsilon', 'Beta')
+        graph.learn_similar('Epsilon', [('Zeta', 0.9)])
+        graph.rebuild(index)
+        
+        reloaded = SimilarityGraph(path)
+        
+        assert reloaded.load()
+        assert reloaded.similar('epsilon') == graph.similar('Epsilon') == ['Zeta', 'Beta']
+        assert reloaded.similar('Zeta') == ['Epsilon']
+        assert reloaded.knows_lastfm('Epsilon')
+        assert set(reloaded.similar('Alpha')) == {'Beta', 'Gamma', 'Delta'}
+        assert not SimilarityGraph(str(tmp_path / 'missing.json')).load()
+    
+    def test_learning_saves_after_interval(self, tmp_path, clock):
+        """Learned edges are written at most once per save interval."""
+        graph = SimilarityGraph(str(tmp_path / 'graph.json'), save_interval=60, clock=clock)
+        graph.learn_transition('Alpha', 'Beta')
+        graph.learn_transition('Beta', 'Gamma')
+        assert graph.stats()['saves'] == 1
+        
+        clock.now += 61
+        graph.learn_transition('Gamma', 'Delta')
+        assert graph.stats()['saves'] == 2
+    
+    def test_flush_writes_pending_edges(self, tmp_path, clock):
+        """Edges learned since the last periodic save reach disk on flush()."""
+        path = str(tmp_path / 'graph.json')
+        graph = SimilarityGraph(path, save_interval=60, clock=clock)
+        graph.learn_transition('Alpha', 'Beta')
+        graph.learn_transition('Beta', 'Gamma')
+        
+        assert graph.flush() is True
+        assert graph.flush() is False
+        reloaded = SimilarityGraph(path)
+        reloaded.load()
+        assert reloaded.similar('Gamma') == ['Beta']
+    
+    def test_read_playlist_artists(self, tmp_path, index):
+        """Indexed files use their tags; unknown files fall back to the EXTINF line."""
+        path = tmp_path / 'mix.m3u'
+        path.write_text('#EXTM3U\n'
+                        '#EXTINF:200,Wrong - Song\n'
+                        'comp/03.flac\n'
+                        '#EXTINF:180,Zeta - Other Song\n'
+                        'gone/01.flac\n'
+                        'gone/02.flac\n', encoding='utf-8')
+        
+        assert read_playlist_artists(str(path), index) == ['Gamma', 'Zeta']
+        assert read_playlist_artists(str(path)) == ['Wrong', 'Zeta']
+        assert read_playlist_artists(str(tmp_path / 'missing.m3u')) == []
@@ -0,0 +1,107 @@
+"""Unit tests for StatusDeltaEncoder."""
+
+import pytest
+from services.status_delta import StatusDeltaEncoder
+
+
+def make_status(elapsed=10.0, **overrides):
+    """Build a display status dict like build_mpd_status_for_display()."""
+    status = {
+        'state': 'play',
+        'song_title': 'Song',
+        'artist': 'Artist',
+        'volume': 50,
+        'queue_length': 10,
+        'raw_elapsed_time': elapsed,
+        'elapsed_time': f"00:{int(elapsed):02d}",
+        'raw_total_time': 200.0,
+        'total_time': '03:20'
+    }
+    status.update(overrides)
+    return status
+
+
+class TestStatusDeltaEncoder:
+    """Test delta encoding of status broadcasts."""
+    
+    def test_first_encode_is_full(self):
+        """The first message carries the whole status and an elapsed anchor."""
+        encoder = StatusDeltaEncoder()
+        
+        message = encoder.encode(make_status(), timestamp=100.0)
+        
+        assert message['full'] is True
+        assert message['version'] == 1
+        assert 'elapsed_time' not in message['status']
+        assert message['elapsed'] == {'position': 10.0, 'timestamp': 100.0, 'state': 'play', 'duration': 200.0}
+    
+    def test_elapsed_tick_is_suppressed(self):
+        """Steady playback produces no messages."""
+        encoder = StatusDeltaEncoder()
+        encoder.encode(make_status(10.0), timestamp=100.0)
+        
+        assert encoder.encode(make_status(11.0), timestamp=101.0) is None
+        assert encoder.encode(make_status(15.0), timestamp=105.0) is None
+        assert encoder.version == 1
+    
+    def test_only_changed_keys_sent(self):
+        """A volume change sends just the volume."""
+        encoder = StatusDeltaEncoder()
+        encoder.encode(make_status(10.0), timestamp=100.0)
+        
+        message = encoder.encode(make_status(11.0, volume=70), timestamp=101.0)
+        
+        assert message['full'] is False
+        assert message['changes'] == {'volume': 70}
+        assert message['base_version'] == 1
+        assert message['version'] == 2
+        assert 'elapsed' not in message
+    
+    def test_seek_sends_new_anchor(self):
+        """A jump in position beyond the tolerance re-anchors the client clock."""
+        encoder = StatusDeltaEncoder()
+        encoder.encode(make_status(10.0), timestamp=100.0)
+        
+        message = encoder.encode(make_status(90.0), timestamp=101.0)
+        
+        assert message['changes'] == {}
+        assert message['elapsed']['position'] == 90.0
+    
+    def test_pause_sends_state_and_anchor(self):
+        """Pausing changes the state and freezes the anchor."""
+        encoder = StatusDeltaEncoder()
+        encoder.encode(make_status(10.0), timestamp=100.0)
+        
+        message = encoder.encode(make_status(12.0, state='pause'), timestamp=102.0)
+        
+        assert message['changes'] == {'state': 'pause'}
+        assert message['elapsed']['state'] == 'pause'
+    
+    def test_removed_keys_listed(self):
+        """Keys missing from the new status are reported as removed."""
+        encoder = StatusDeltaEncoder()
+        encoder.encode(make_status(), timestamp=100.0)
+        status = make_status()
+        del status['song_title']
+        
+        message = encoder.encode(status, timestamp=100.0)
+        
+        assert message['removed'] == ['song_title']
+    
+    def test_full_matches_current_version(self):
+        """A late subscriber's snapshot lines up with the delta stream."""
+        encoder = StatusDeltaEncoder()
+        encoder.encode(make_status(10.0), timestamp=100.0)
+        encoder.encode(make_status(11.0, volume=70), timestamp=101.0)
+        
+        message = encoder.full()
+        
+        assert message['version'] == 2
+        assert message['status']['volume'] == 70
+    
+    def test_full_without_state(self):
+        """full() seeds the encoder from the given status, or returns None."""
+        encoder = StatusDeltaEncoder()
+        
+        assert encoder.full() is None
+        assert encoder.full(make_status(), timestamp=5.0)['version'] == 1
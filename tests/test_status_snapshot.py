@@ -0,0 +1,138 @@
+"""Unit tests for StatusSnapshot."""
+
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+from services.status_snapshot import StatusSnapshot
+
+
+class TestStatusSnapshotPublish:
+    """Test versioning and notification."""
+    
+    def test_version_bumps_only_on_change(self):
+        """Publishing an identical status does not create a new version."""
+        snapshot = StatusSnapshot()
+        
+        assert snapshot.publish({'state': 'play'}) is True
+        assert snapshot.publish({'state': 'play'}) is False
+        assert snapshot.version == 1
+        assert snapshot.publish({'state': 'pause'}) is True
+        assert snapshot.version == 2
+    
+    def test_subscribers_notified_on_change(self):
+        """Subscribers receive the new status and version."""
+        snapshot = StatusSnapshot()
+        callback = MagicMock()
+        snapshot.subscribe(callback)
+        
+        snapshot.publish({'state': 'play'})
+        snapshot.publish({'state': 'play'})
+        
+        callback.assert_called_once_with({'state': 'play'}, 1)
+    
+    def test_unsubscribe(self):
+        """Unsubscribed callbacks are not called."""
+        snapshot = StatusSnapshot()
+        callback = MagicMock()
+        unsubscribe = snapshot.subscribe(callback)
+        unsubscribe()
+        
+        snapshot.publish({'state': 'play'})
+        
+        callback.assert_not_called()
+    
+    def test_failing_subscriber_isolated(self):
+        """One failing subscriber does not block the others."""
+        snapshot = StatusSnapshot()
+        good = MagicMock()
+        snapshot.subscribe(MagicMock(side_effect=RuntimeError('boom')))
+        snapshot.subscribe(good)
+        
+        snapshot.publish({'state': 'stop'})
+        
+        good.assert_called_once()
+
+
+class TestStatusSnapshotGet:
+    """Test read accessors and staleness handling."""
+    
+    def test_returns_copy(self):
+        """Callers cannot mutate the shared status."""
+        snapshot = StatusSnapshot()
+        snapshot.publish({'state': 'play'})
+        
+        status = snapshot.get()
+        status['state'] = 'hacked'
+        
+        assert snapshot.field('state') == 'play'
+    
+    def test_default_before_publish(self):
+        """The default is returned until something is published."""
+        snapshot = StatusSnapshot(default={'state': 'unknown'})
+        
+        assert snapshot.get() == {'state': 'unknown'}
+        assert snapshot.field('missing', 'x') == 'x'
+    
+    def test_first_get_refreshes(self):
+        """An empty snapshot is populated by the refresher on first read."""
+        refresher = MagicMock(return_value={'state': 'play'})
+        snapshot = StatusSnapshot(refresher=refresher)
+        
+        assert snapshot.get()['state'] == 'play'
+        assert snapshot.get()['state'] == 'play'
+        refresher.assert_called_once()
+    
+    def test_max_staleness_triggers_refresh(self):
+        """Snapshots older than the caller's limit are rebuilt."""
+        refresher = MagicMock(return_value={'state': 'play'})
+        snapshot = StatusSnapshot(refresher=refresher)
+        snapshot.publish({'state': 'stop'})
+        snapshot._updated_at = time.time() - 10
+        
+        assert snapshot.get(max_staleness=60)['state'] == 'stop'
+        assert snapshot.get(max_staleness=5)['state'] == 'play'
+        refresher.assert_called_once()
+    
+    def test_refresh_error_keeps_previous(self):
+        """A failing refresher leaves the last good status in place."""
+        snapshot = StatusSnapshot(refresher=MagicMock(side_effect=OSError('down')))
+        snapshot.publish({'state': 'pause'})
+        
+        assert snapshot.refresh() is False
+        assert snapshot.get()['state'] == 'pause'
+    
+    def test_concurrent_refreshes_share_work(self):
+        """Callers that queue behind an in-flight refresh reuse its result."""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        
+        def refresher():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {'state': 'play'}
+        
+        snapshot = StatusSnapshot(refresher=refresher)
+        first = threading.Thread(target=snapshot.refresh)
+        first.start()
+        started.wait(5)
+        time.sleep(0.01)
+        waiter = threading.Thread(target=snapshot.refresh)
+        waiter.start()
+        time.sleep(0.01)
+        release.set()
+        first.join(5)
+        waiter.join(5)
+        
+        assert len(calls) == 1
+    
+    def test_wait_for_change(self):
+        """wait_for_change returns the new version after a publish."""
+        snapshot = StatusSnapshot()
+        timer = threading.Timer(0.01, snapshot.publish, args=({'state': 'play'},))
+        timer.start()
+        
+        assert snapshot.wait_for_change(0, timeout=5) == 1
+        assert snapshot.wait_for_change(1, timeout=0.01) == 1
@@ -0,0 +1,103 @@
+"""Unit tests for the autocomplete prefix index."""
+
+import pytest
+from services.suggest_index import SuggestIndex, fold, KEY_LENGTH
+
+
+NAMES = {
+    'artist': {'Björk': 40, 'Sigur Rós': 25, 'The Beatles': 120, 'Beach House': 30, 'Bebel Gilberto': 5},
+    'album': {'Homogenic': 10, 'Abbey Road': 17, 'Beach House': 9, 'Ágætis byrjun': 8},
+    'title': {'Hyperballad': 1, 'Here Comes the Sun': 1, 'Bachelorette': 1, 'Be Here Now': 1},
+}
+
+
+@pytest.fixture
+def index():
+    idx = SuggestIndex()
+    idx.build(NAMES)
+    return idx
+
+
+def texts(results):
+    return [result['text'] for result in results]
+
+
+class TestFold:
+    """Test case and diacritic folding."""
+    
+    def test_fold_strips_accents_and_case(self):
+        """Accents and case do not affect matching."""
+        assert fold('Sigur Rós') == 'sigur ros'
+        assert fold('ÁGÆTIS') == 'agætis'
+        assert fold(None) == ''
+
+
+class TestSuggestIndex:
+    """Test prefix matching and ranking."""
+    
+    def test_diacritic_and_case_insensitive(self, index):
+        """'bjo' finds Björk and 'agae' finds Ágætis byrjun."""
+        assert texts(index.suggest('BJO')) == ['Björk']
+        assert texts(index.suggest('ágæ')) == ['Ágætis byrjun']
+    
+    def test_matches_word_starts_not_substrings(self, index):
+        """Later words match, mid-word substrings do not."""
+        assert texts(index.suggest('ros')) == ['Sigur Rós']
+        assert texts(index.suggest('eatles')) == []
+    
+    def test_whole_name_prefix_ranks_first(self, index):
+        """Names starting with the query beat later-word matches, then popularity."""
+        results = texts(index.suggest('be'))
+        
+        assert results == ['Beach House', 'Beach House', 'Bebel Gilberto', 'Be Here Now', 'The Beatles']
+    
+    def test_popularity_breaks_ties(self, index):
+        """Among whole-name matches the name on the most tracks comes first."""
+        assert index.suggest('bea')[0] == {'text': 'Beach House', 'type': 'artist', 'count': 30}
+    
+    def test_kind_filter_and_limit(self, index):
+        """type restricts the kind and limit caps the result."""
+        assert texts(index.suggest('beach', kind='album')) == ['Beach House']
+        assert [r['type'] for r in index.suggest('beach', kind='any')] == ['artist', 'album']
+        assert len(index.suggest('b', limit=2)) == 2
+        assert index.suggest('b', kind='composer') == []
+    
+    def test_long_queries_use_sorted_keys(self, index):
+        """Prefixes beyond the cached length go through bisect."""
+        assert texts(index.suggest('here comes')) == ['Here Comes the Sun']
+        assert texts(index.suggest('the sun')) == ['Here Comes the Sun']
+    
+    def test_repeated_words_do_not_crowd_out_entries(self):
+        """An entry matching at many words still counts once toward the limit."""
+        idx = SuggestIndex()
+        idx.build({'title': {'Hey Nana Nana Nana Nana': 9, 'Off Nanaimo': 1, 'Two Nanami': 1}})
+        
+        assert texts(idx.suggest('nana', limit=2)) == ['Hey Nana Nana Nana Nana', 'Off Nanaimo']
+    
+    def test_long_prefix_ranks_the_whole_key_range(self):
+        """The most popular match wins even when thousands of keys sort before it."""
+        names = {f'love song {number:05d}': 1 for number in range(6000)}
+        names['love song zz top hit'] = 500
+        idx = SuggestIndex()
+        idx.build({'title': names})
+        
+        assert idx.suggest('love song', limit=1)[0]['text'] == 'love song zz top hit'
+    
+    def test_queries_longer_than_key_are_verified(self):
+        """Queries past KEY_LENGTH still have to match the full name."""
+        name = 'x' * KEY_LENGTH + ' tail'
+        idx = SuggestIndex()
+        idx.build({'title': {name: 1}})
+        
+        assert texts(idx.suggest(name)) == [name]
+        assert idx.suggest('x' * KEY_LENGTH + ' other') == []
+    
+    def test_empty_query_and_rebuild(self, index):
+        """Blank queries return nothing; build() swaps in new names."""
+        assert index.suggest('  ') == []
+        
+        index.build({'artist': {'Low': 3}})
+        
+        assert texts(index.suggest('l')) == ['Low']
+        assert index.suggest('bjo') == []
+        assert index.stats()['version'] == 2
@@ -0,0 +1,58 @@
+"""Unit tests for candidate genre lookups."""
+
+from unittest.mock import MagicMock
+import pytest
+from services.library_index import LibraryIndex
+from services.track_genres import TrackGenres
+
+
+@pytest.fixture
+def client():
+    mock = MagicMock()
+    mock.readcomments.return_value = {'GENRE': 'Folk', 'TITLE': 'Song'}
+    return mock
+
+
+class TestTrackGenres:
+    """Test the lookup order and the file read cache."""
+    
+    def test_search_tags_win(self, client):
+        """A genre already in the search result needs no further lookup."""
+        genres = TrackGenres()
+        
+        assert genres.genre(client, {'file': 'a.flac', 'genre': ['Rock', 'Pop']}) == ['Rock', 'Pop']
+        client.readcomments.assert_not_called()
+    
+    def test_index_before_file(self, client):
+        """A loaded index answers, including for tracks that have no genre."""
+        index = LibraryIndex()
+        index.load([{'file': 'a.flac', 'genre': 'Jazz'}, {'file': 'b.flac'}])
+        genres = TrackGenres(index)
+        
+        assert genres.genre(client, {'file': 'a.flac'}) == 'Jazz'
+        assert genres.genre(client, {'file': 'b.flac'}) is None
+        client.readcomments.assert_not_called()
+        assert genres.stats()['from_index'] == 2
+    
+    def test_file_reads_cached_by_path_and_mtime(self, client):
+        """readcomments() runs once per file version."""
+        genres = TrackGenres(LibraryIndex())
+        song = {'file': 'c.flac', 'last-modified': '2024-01-01T00:00:00Z'}
+        
+        assert genres.genre(client, song) == 'Folk'
+        assert genres.genre(client, dict(song)) == 'Folk'
+        assert client.readcomments.call_count == 1
+        
+        genres.genre(client, dict(song, **{'last-modified': '2025-01-01T00:00:00Z'}))
+        assert client.readcomments.call_count == 2
+        assert genres.stats() == {'from_tags': 0, 'from_index': 0, 'cache_hits': 1,
+                                  'file_reads': 2, 'cached_files': 2}
+    
+    def test_failed_reads_and_bounded_cache(self, client):
+        """Read errors give None and the cache drops the oldest entries."""
+        genres = TrackGenres(max_entries=2)
+        client.readcomments.side_effect = Exception('No such file')
+        
+        for name in ('x', 'y', 'z'):
+            assert genres.genre(client, {'file': f'{name}.flac'}) is None
+        assert genres.stats()['cached_files'] == 2
@@ -0,0 +1,90 @@
+"""Unit tests for matching Last.fm suggestions against the library."""
+
+from unittest.mock import MagicMock
+import pytest
+from services.library_index import LibraryIndex
+from services.track_matcher import TrackMatcher, title_keys
+
+
+SONGS = [
+    {'file': 'acdc/01.flac', 'artist': 'AC/DC', 'title': 'Back in Black'},
+    {'file': 'acdc/live.flac', 'artist': 'AC/DC', 'title': 'Back In Black (Live)'},
+    {'file': 'comp/07.flac', 'artist': 'Guest', 'albumartist': 'Various', 'title': 'Song'},
+    {'file': 'duo/01.flac', 'artist': ['Simon', 'Garfunkel'], 'title': 'The Boxer - 2001 Remaster'},
+    {'file': 'hey/01.flac', 'artist': 'Band', 'title': 'Hey'},
+]
+
+
+@pytest.fixture
+def index():
+    idx = LibraryIndex()
+    idx.load(SONGS)
+    return idx
+
+
+@pytest.fixture
+def matcher(index):
+    return TrackMatcher(index)
+
+
+def files(results, pair):
+    return sorted(song['file'] for song in results[pair])
+
+
+class TestTitleKeys:
+    """Test title normalization."""
+    
+    def test_qualifiers_give_a_second_key(self):
+        """Bracketed and ' - Remaster' style suffixes are dropped for the second key."""
+        assert title_keys('Song (Remastered 2011)') == ('songremastered2011', 'song')
+        assert title_keys('Song - Live at Leeds') == ('songliveatleeds', 'song')
+        assert title_keys('Hey - You') == ('heyyou',)
+        assert title_keys(None) == ()
+
+
+class TestTrackMatcher:
+    """Test batch matching, rebuilds and the MPD fallback."""
+    
+    def test_batch_resolves_normalized_pairs(self, matcher):
+        """Case, punctuation, multi-value artists and qualifiers all match in one batch."""
+        results = matcher.match([
+            ('ac-dc', 'back in black'),
+            ('Simon', 'The Boxer'),
+            ('Various', 'Song'),
+            ('Band', 'Hey - You'),
+            ('Nobody', 'Nothing'),
+        ])
+        
+        assert files(results, ('ac-dc', 'back in black')) == ['acdc/01.flac', 'acdc/live.flac']
+        assert files(results, ('Simon', 'The Boxer')) == ['duo/01.flac']
+        assert files(results, ('Various', 'Song')) == ['comp/07.flac']
+        assert results[('Band', 'Hey - You')] == []
+        assert results[('Nobody', 'Nothing')] == []
+        assert matcher.stats()['matched'] == 3
+    
+    def test_exact_title_preferred_over_base_title(self, matcher):
+        """A suggestion with a qualifier matches that version when the library has it."""
+        results = matcher.match([('AC/DC', 'Back in Black (Live)')])
+        
+        assert files(results, ('AC/DC', 'Back in Black (Live)')) == ['acdc/live.flac']
+    
+    def test_rebuilt_when_index_reloads(self, index, matcher):
+        """The map follows the index version."""
+        matcher.match([('Band', 'Hey')])
+        matcher.match([('Band', 'Hey')])
+        assert matcher.stats()['rebuilds'] == 1
+        
+        index.load(SONGS + [{'file': 'new/01.flac', 'artist': 'New', 'title': 'Fresh'}])
+        assert files(matcher.match([('new', 'fresh')]), ('new', 'fresh')) == ['new/01.flac']
+        assert matcher.stats()['rebuilds'] == 2
+    
+    def test_mpd_search_without_index(self):
+        """An unloaded index falls back to one MPD search per distinct pair."""
+        client = MagicMock()
+        client.search.return_value = [{'file': 'x.flac'}]
+        matcher = TrackMatcher(LibraryIndex())
+        
+        results = matcher.match([('A', 'T'), ('A', 'T')], client=client)
+        
+        assert results == {('A', 'T'): [{'file': 'x.flac'}]}
+        client.search.assert_called_once_with('artist', 'A', 'title', 'T')